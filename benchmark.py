@@ -0,0 +1,56 @@
+# --- Python Standard Libraries ---
+import argparse
+import json
+import sys
+
+# --- Project Modules ---
+from core import benchmark
+
+
+def parse_args():
+    """
+    Parses the benchmark command line options.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the engine, controller and renderer hot paths.")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text, e.g. a_star or tick[rows=33")
+    parser.add_argument("--min-time", type=float, default=benchmark.MIN_TIME, help="Seconds spent timing each case")
+    parser.add_argument("--save", help="Write the results to this JSON baseline file")
+    parser.add_argument("--compare", help="Compare the results with this JSON baseline and exit with status 1 on a regression")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown counted as a regression when comparing (default: 0.1, i.e. 10%%)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    cases = [case for case in benchmark.cases() if args.filter in case.key]
+    if not benchmark.render_available():
+        print("pygame is not installed; skipping the render cases")
+
+    baseline_results = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline_results = json.load(f)["results"]
+
+    width = max((len(case.key) for case in cases), default=0)
+
+    def report(key, ops):
+        line = f"{key:<{width}}  {ops:>14,.0f} ops/s"
+        base = baseline_results.get(key)
+        if base:
+            line += f"  {ops / base - 1:+7.1%} vs {base:,.0f}"
+        print(line, flush=True)
+
+    results = benchmark.run_cases(cases, args.min_time, report)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(benchmark.baseline(results), f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        regressions = [row for row in benchmark.compare(results, baseline_results, args.threshold) if row[4]]
+        for key, ops, base, ratio, _ in regressions:
+            print(f"Regression: {key} runs at {ratio:.0%} of the baseline ({ops:,.0f} vs {base:,.0f} ops/s)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%}")
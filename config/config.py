@@ -22,9 +22,23 @@ PRE_SUDDEN_DEATH_MESSAGE_DURATION = 10 * 1000
 CONTROLLER_TIMEOUT_MS = 50
 CONTROLLER_TIMEOUT_SECONDS = CONTROLLER_TIMEOUT_MS / 1000.0
 
+# A controller stuck on one request for this long is killed and restarted
+CONTROLLER_RESTART_MS = 1000
+CONTROLLER_RESTART_SECONDS = CONTROLLER_RESTART_MS / 1000.0
+
+# Environment variable through which a tournament tells each controller how many cores it may use for extra
+# processes (e.g. the MCTS controller's search helpers); unset outside a tournament
+SPARE_CORES_VARIABLE = "BOTA_SPARE_CORES"
+
 # AI Update Interval
 AI_UPDATE_INTERVAL_MS = PLAYER_SPEED_MS 
 
+# Directory the GUI saves the replay of every finished game to
+REPLAY_DIRECTORY = "replays"
+
+# GUI Playback Speeds, selected with the 1-4 keys (multiples of real time; None runs ticks as fast as the controllers answer)
+PLAYBACK_SPEEDS = (1, 4, 16, None)
+
 # UI Positioning Constants
 TITLE_POS_X = SCREEN_WIDTH / 2 - 165
 TITLE_POS_Y = 50
@@ -0,0 +1 @@
+# Puts the repository root on sys.path, so `pytest` finds the core and controllers packages like `python -m pytest`
@@ -1,78 +1,219 @@
-from collections import defaultdict
-class Node():
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.neighbours = set()
-
-    def add_neighbour(self, neighbour):
-        self.neighbours.add(neighbour)
-
-
-
-def reconstruct_path(cameFrom, current):
-    total_path = [current]
-
-    directions = [(-1, 0), (1, 0), (0, 1), (0, -1)]
-
-    while current in cameFrom.keys():
-        current = cameFrom[current]
-        total_path.insert(0, current)
-
-    return total_path
+from heapq import heappush, heappop
+from itertools import chain
+
+# Grid offsets (row, col) of the four moves
+DIRECTIONS = [(-1, 0), (1, 0), (0, 1), (0, -1)]
+
+# Maps a byte grid value to 1 if walkable, 0 otherwise
+WALKABLE = bytes(1 if value == 1 else 0 for value in range(256))
+
+class SearchBuffers:
+    """
+    Per-cell scratch arrays shared by every search, indexed by the flat cell index row * cols + col.
+    A search only trusts entries stamped with its own generation number, so the arrays are allocated
+    once per board size and never cleared between calls.
+    """
+    def __init__(self):
+        self.size = 0
+        self.generation = 0
+        self.stamp = []
+        self.g_score = []
+        self.came_from = []
+        self.closed = []
+
+    def prepare(self, size):
+        """
+        Starts a new search over `size` cells, reallocating only when the board size changed.
+        Returns the generation number of the search.
+        """
+        if size != self.size:
+            self.size = size
+            self.generation = 0
+            self.stamp = [0] * size
+            self.g_score = [0] * size
+            self.came_from = [-1] * size
+            self.closed = [0] * size
+        self.generation += 1
+        return self.generation
+
+buffers = SearchBuffers()
 
 def get_neighbours(current, grid):
-    directions = [(-1, 0), (1, 0), (0, 1), (0, -1)]
-
-    neighbours = []
+    """
+    Returns the walkable (row, col) cells next to `current`.
+    """
     rows = len(grid)
     cols = len(grid[0])
-    for d in directions:
-        r, c = current[0] + d[0], current[1] + d[1]
+    neighbours = []
+    for d_row, d_col in DIRECTIONS:
+        r, c = current[0] + d_row, current[1] + d_col
         if 0 <= r < rows and 0 <= c < cols and grid[r][c] == 1:
             neighbours.append((r, c))
-    
     return neighbours
 
 def heuristic(node, goal):
     # Manhattan distance
     return abs(node[0] - goal[0]) + abs(node[1] - goal[1])
 
-def d(a, b):
-    return 1
-
-def a_star(start, goal, grid):
-    
-    openSet = {start}
-
-    cameFrom = {}
-
-    gScore = defaultdict(lambda: float("inf"))
-    gScore[start] = 0
-
-    fScore = defaultdict(lambda: float("inf"))
-    fScore[start] = heuristic(start, goal)
-
-    while openSet:
-        current = min(openSet, key=lambda x: fScore[x])
-        
-        if current == goal:
-            return reconstruct_path(cameFrom, current)
-
-        openSet.remove(current)
-
-        #print(get_neighbours(current, grid))
-        for neighbour in get_neighbours(current, grid):
-
-            #print(neighbour)
-            tentative_gScore = gScore[current] + d(current, neighbour)
-
-            #print(tentative_gScore, gScore[neighbour])
-            if tentative_gScore < gScore[neighbour]:
-                cameFrom[neighbour] = current
-                gScore[neighbour] = tentative_gScore
-                fScore[neighbour] = tentative_gScore + heuristic(neighbour, goal)
-                if neighbour not in openSet:
-                    openSet.add(neighbour)
-
-    return None  # No path found
\ No newline at end of file
+def flatten(grid):
+    """
+    Returns the grid as a flat bytes object with 1 for walkable cells and 0 otherwise.
+    """
+    try:
+        return bytes(chain.from_iterable(grid)).translate(WALKABLE)
+    except (TypeError, ValueError):
+        # Values that do not fit in a byte
+        return bytes(1 if value == 1 else 0 for value in chain.from_iterable(grid))
+
+def reconstruct_path(came_from, current, cols):
+    """
+    Follows the parent links back from `current` and returns the (row, col) path from the start.
+    Parents may be several cells away in a straight line (jump points); the cells in between are filled in.
+    """
+    path = [divmod(current, cols)]
+    parent = came_from[current]
+    while parent != -1:
+        row, col = path[-1]
+        parent_row, parent_col = divmod(parent, cols)
+        step_row = (parent_row > row) - (parent_row < row)
+        step_col = (parent_col > col) - (parent_col < col)
+        while (row, col) != (parent_row, parent_col):
+            row += step_row
+            col += step_col
+            path.append((row, col))
+        parent = came_from[parent]
+    path.reverse()
+    return path
+
+def _walkable(walkable, rows, cols, row, col):
+    return 0 <= row < rows and 0 <= col < cols and walkable[row * cols + col]
+
+def _jump_horizontal(walkable, rows, cols, row, col, d_col, goal):
+    """
+    Moves from (row, col) along the row until reaching the goal or a cell where a turn up or down
+    becomes possible around an obstacle. Returns that jump point or None if a wall is hit first.
+    """
+    while True:
+        col += d_col
+        if not _walkable(walkable, rows, cols, row, col):
+            return None
+        if (row, col) == goal:
+            return row, col
+        for d_row in (-1, 1):
+            if _walkable(walkable, rows, cols, row + d_row, col) and not _walkable(walkable, rows, cols, row + d_row, col - d_col):
+                return row, col
+
+def _jump_vertical(walkable, rows, cols, row, col, d_row, goal):
+    """
+    Moves from (row, col) along the column until reaching the goal, a cell with a forced neighbour
+    or a cell from which a horizontal jump finds a jump point. Returns that jump point or None.
+    """
+    while True:
+        row += d_row
+        if not _walkable(walkable, rows, cols, row, col):
+            return None
+        if (row, col) == goal:
+            return row, col
+        for d_col in (-1, 1):
+            if _walkable(walkable, rows, cols, row, col + d_col) and not _walkable(walkable, rows, cols, row - d_row, col + d_col):
+                return row, col
+        for d_col in (-1, 1):
+            if _jump_horizontal(walkable, rows, cols, row, col, d_col, goal) is not None:
+                return row, col
+
+def _successors(walkable, rows, cols, index, parent, goal, jump_points):
+    """
+    Returns (neighbour index, step cost) pairs for the expansion of `index`.
+    With jump_points, neighbours are pruned by the direction of travel and replaced by the jump point
+    found in each remaining direction.
+    """
+    row, col = divmod(index, cols)
+    successors = []
+
+    if not jump_points:
+        if row > 0 and walkable[index - cols]:
+            successors.append((index - cols, 1))
+        if row < rows - 1 and walkable[index + cols]:
+            successors.append((index + cols, 1))
+        if col < cols - 1 and walkable[index + 1]:
+            successors.append((index + 1, 1))
+        if col > 0 and walkable[index - 1]:
+            successors.append((index - 1, 1))
+        return successors
+
+    if parent == -1:
+        directions = DIRECTIONS
+    else:
+        parent_row, parent_col = divmod(parent, cols)
+        d_row = (row > parent_row) - (row < parent_row)
+        d_col = (col > parent_col) - (col < parent_col)
+        if d_col:
+            directions = [(-1, 0), (1, 0), (0, d_col)]
+        else:
+            directions = [(0, -1), (0, 1), (d_row, 0)]
+
+    for d_row, d_col in directions:
+        if d_col:
+            jump = _jump_horizontal(walkable, rows, cols, row, col, d_col, goal)
+        else:
+            jump = _jump_vertical(walkable, rows, cols, row, col, d_row, goal)
+        if jump is not None:
+            successors.append((jump[0] * cols + jump[1], abs(jump[0] - row) + abs(jump[1] - col)))
+    return successors
+
+def a_star(start, goal, grid, jump_points=False):
+    """
+    Returns the shortest path from `start` to `goal` as a list of (row, col) cells, both included,
+    or None if the goal cannot be reached. Cells with grid[row][col] == 1 are walkable; the start cell
+    itself does not have to be.
+
+    The open set is a binary heap over flat cell indices and the per-cell scores live in buffers reused
+    across calls. With jump_points=True the search uses Jump Point Search, which finds a path of the same
+    length while only expanding the cells where the path can turn. Its straight-line scans are plain Python,
+    so on small or cluttered boards the default search is usually the faster of the two.
+    """
+    rows = len(grid)
+    cols = len(grid[0])
+    walkable = flatten(grid)
+    start_index = start[0] * cols + start[1]
+    goal_index = goal[0] * cols + goal[1]
+    goal = (goal[0], goal[1])
+
+    if not (0 <= start[0] < rows and 0 <= start[1] < cols and 0 <= goal[0] < rows and 0 <= goal[1] < cols):
+        return None
+    if start_index == goal_index:
+        return [goal]
+    if not walkable[goal_index]:
+        return None
+
+    generation = buffers.prepare(rows * cols)
+    stamp, g_score, came_from, closed = buffers.stamp, buffers.g_score, buffers.came_from, buffers.closed
+    goal_row, goal_col = goal
+
+    stamp[start_index] = generation
+    g_score[start_index] = 0
+    came_from[start_index] = -1
+    # Ties on f are broken towards the larger g (the cell closer to the goal)
+    open_heap = [(heuristic(start, goal), 0, start_index)]
+
+    while open_heap:
+        _, negative_g, current = heappop(open_heap)
+        if closed[current] == generation or -negative_g != g_score[current]:
+            continue
+        if current == goal_index:
+            return reconstruct_path(came_from, current, cols)
+        closed[current] = generation
+
+        current_g = g_score[current]
+        for neighbour, cost in _successors(walkable, rows, cols, current, came_from[current], goal, jump_points):
+            if closed[neighbour] == generation:
+                continue
+            tentative_g = current_g + cost
+            if stamp[neighbour] != generation or tentative_g < g_score[neighbour]:
+                stamp[neighbour] = generation
+                g_score[neighbour] = tentative_g
+                came_from[neighbour] = current
+                row, col = divmod(neighbour, cols)
+                heappush(open_heap, (tentative_g + abs(row - goal_row) + abs(col - goal_col), -tentative_g, neighbour))
+
+    return None  # No path found
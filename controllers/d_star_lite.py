@@ -0,0 +1,226 @@
+from heapq import heappush, heappop, heapify
+from .a_star import flatten
+
+INF = float("inf")
+
+class DStarLite:
+    """
+    Incremental shortest-path planner (D* Lite) that keeps its search between calls.
+
+    The search runs backwards from the goal, so when the snake moves and a few cells become blocked
+    or free, only the part of the search those cells affect is repaired instead of searching again
+    from scratch. A new goal or board size starts a fresh search.
+
+    `plan(start, goal, grid)` takes and returns the same values as a_star.a_star: cells with
+    grid[row][col] == 1 are walkable, the start cell itself does not have to be, and the result is the
+    list of (row, col) cells from start to goal or None if the goal cannot be reached.
+    """
+    def __init__(self):
+        self.goal = None
+        self.rows = 0
+        self.cols = 0
+        self.walkable = b""
+        # Number of cells expanded by the last call, for profiling
+        self.expanded = 0
+
+    def reset(self, goal, rows, cols, walkable):
+        """
+        Starts a fresh search towards `goal`.
+        """
+        size = rows * cols
+        if (rows, cols) != (self.rows, self.cols):
+            self.rows = rows
+            self.cols = cols
+            self.row_of = [index // cols for index in range(size)]
+            self.col_of = [index % cols for index in range(size)]
+            self.adjacent = [self.neighbours(index) for index in range(size)]
+        self.goal = goal
+        self.walkable = walkable
+        self.g = [INF] * size
+        self.rhs = [INF] * size
+        self.queued = [None] * size
+        self.queue = []
+        self.km = 0
+        self.last_start = None
+
+        goal_index = goal[0] * cols + goal[1]
+        self.rhs[goal_index] = 0
+        self.goal_index = goal_index
+        self.push(goal_index, (0, 0))
+
+    def heuristic(self, a, b):
+        # Manhattan distance between flat indices
+        return abs(self.row_of[a] - self.row_of[b]) + abs(self.col_of[a] - self.col_of[b])
+
+    def neighbours(self, index):
+        """
+        Returns the flat indices of the cells next to `index`.
+        Computed once per board size; searches use the `adjacent` table.
+        """
+        cols = self.cols
+        row, col = divmod(index, cols)
+        result = []
+        if row > 0:
+            result.append(index - cols)
+        if row < self.rows - 1:
+            result.append(index + cols)
+        if col < cols - 1:
+            result.append(index + 1)
+        if col > 0:
+            result.append(index - 1)
+        return result
+
+    def calculate_key(self, index, start):
+        g, rhs = self.g[index], self.rhs[index]
+        best = g if g < rhs else rhs
+        return (best + abs(self.row_of[start] - self.row_of[index]) + abs(self.col_of[start] - self.col_of[index]) + self.km, best)
+
+    def push(self, index, key):
+        self.queued[index] = key
+        heappush(self.queue, (key[0], key[1], index))
+
+    def top(self):
+        """
+        Returns (key, index) of the queued cell with the smallest key, dropping stale heap entries.
+        """
+        queue = self.queue
+        while queue:
+            k1, k2, index = queue[0]
+            if self.queued[index] == (k1, k2):
+                return (k1, k2), index
+            heappop(queue)
+        return (INF, INF), None
+
+    def compute_rhs(self, index):
+        """
+        Returns the cost of the cheapest step from `index` into a walkable neighbour plus that neighbour's g.
+        """
+        walkable = self.walkable
+        best = INF
+        for neighbour in self.adjacent[index]:
+            if walkable[neighbour]:
+                cost = 1 + self.g[neighbour]
+                if cost < best:
+                    best = cost
+        return best
+
+    def update_vertex(self, index, start):
+        if self.g[index] != self.rhs[index]:
+            self.push(index, self.calculate_key(index, start))
+        else:
+            self.queued[index] = None
+
+    def compute_shortest_path(self, start):
+        g, rhs, walkable = self.g, self.rhs, self.walkable
+        expanded = 0
+
+        while True:
+            key, index = self.top()
+            if index is None or (key >= self.calculate_key(start, start) and rhs[start] <= g[start]):
+                break
+
+            new_key = self.calculate_key(index, start)
+            if key < new_key:
+                self.push(index, new_key)
+                continue
+
+            heappop(self.queue)
+            self.queued[index] = None
+            expanded += 1
+
+            if g[index] > rhs[index]:
+                g[index] = rhs[index]
+                # Only a walkable cell can be stepped into from its neighbours
+                if walkable[index]:
+                    cost = 1 + g[index]
+                    for neighbour in self.adjacent[index]:
+                        if neighbour != self.goal_index and cost < rhs[neighbour]:
+                            rhs[neighbour] = cost
+                            self.update_vertex(neighbour, start)
+            else:
+                old_cost = 1 + g[index]
+                g[index] = INF
+                if walkable[index]:
+                    for neighbour in self.adjacent[index]:
+                        if neighbour != self.goal_index and rhs[neighbour] == old_cost:
+                            rhs[neighbour] = self.compute_rhs(neighbour)
+                            self.update_vertex(neighbour, start)
+                self.update_vertex(index, start)
+
+        # Keep the heap from filling up with stale entries over a long game
+        if len(self.queue) > 4 * len(g):
+            self.queue = [(key[0], key[1], index) for index, key in enumerate(self.queued) if key is not None]
+            heapify(self.queue)
+
+        self.expanded = expanded
+
+    def update_cells(self, walkable, start):
+        """
+        Repairs the search for every cell whose walkability changed since the last call.
+        """
+        old = self.walkable
+        self.walkable = walkable
+        cols = self.cols
+
+        # Compare whole rows first so unchanged rows are skipped without a Python-level loop
+        changed = []
+        for offset in range(0, len(walkable), cols):
+            if old[offset:offset + cols] != walkable[offset:offset + cols]:
+                changed.extend(index for index in range(offset, offset + cols) if old[index] != walkable[index])
+
+        for index in changed:
+            # Entering the changed cell got cheaper or more expensive for each of its neighbours
+            for neighbour in self.adjacent[index]:
+                if neighbour != self.goal_index:
+                    self.rhs[neighbour] = self.compute_rhs(neighbour)
+                    self.update_vertex(neighbour, start)
+
+    def extract_path(self, start):
+        """
+        Follows the cheapest neighbours from the start down to the goal.
+        """
+        g, walkable = self.g, self.walkable
+        # The search may stop with the start itself overconsistent, so its cost is read from rhs
+        if self.rhs[start] == INF:
+            return None
+
+        path = [divmod(start, self.cols)]
+        current = start
+        while current != self.goal_index:
+            best, best_cost = None, INF
+            for neighbour in self.adjacent[current]:
+                if walkable[neighbour] and 1 + g[neighbour] < best_cost:
+                    best, best_cost = neighbour, 1 + g[neighbour]
+            if best is None or len(path) > len(g):
+                return None
+            current = best
+            path.append(divmod(current, self.cols))
+        return path
+
+    def plan(self, start, goal, grid):
+        """
+        Returns the shortest path from `start` to `goal`, reusing the previous search when the goal is unchanged.
+        """
+        rows = len(grid)
+        cols = len(grid[0])
+        goal = (goal[0], goal[1])
+        if not (0 <= start[0] < rows and 0 <= start[1] < cols and 0 <= goal[0] < rows and 0 <= goal[1] < cols):
+            return None
+
+        walkable = flatten(grid)
+        start_index = start[0] * cols + start[1]
+
+        if goal != self.goal or (rows, cols) != (self.rows, self.cols):
+            self.reset(goal, rows, cols, walkable)
+        else:
+            self.km += self.heuristic(self.last_start, start_index)
+            self.update_cells(walkable, start_index)
+        self.last_start = start_index
+
+        if start_index == self.goal_index:
+            return [goal]
+        if not walkable[self.goal_index]:
+            return None
+
+        self.compute_shortest_path(start_index)
+        return self.extract_path(start_index)
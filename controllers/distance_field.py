@@ -0,0 +1,140 @@
+from collections import deque
+
+# NumPy is optional: without it the distance fields come from a plain BFS per source group
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Distance of cells no source can reach
+UNREACHABLE = -1
+
+def walkable_array(grid):
+    """
+    Returns a (rows, cols) boolean array from a list-of-lists grid where 1 marks a walkable cell,
+    or a list of lists of booleans without NumPy.
+    """
+    if np is None:
+        return [[cell == 1 for cell in row] for row in grid]
+    return np.asarray(grid) == 1
+
+def grid_shape(walkable):
+    return len(walkable), len(walkable[0])
+
+def in_bounds(shape, cell):
+    return 0 <= cell[0] < shape[0] and 0 <= cell[1] < shape[1]
+
+def _python_distance_fields(walkable, source_groups):
+    """
+    distance_fields without NumPy: one BFS per group over a flat list, returned as lists of rows.
+    """
+    rows, cols = grid_shape(walkable)
+    open_cells = [cell for row in walkable for cell in row]
+    fields = []
+    for sources in source_groups:
+        distances = [UNREACHABLE] * (rows * cols)
+        queue = deque()
+        for cell in sources:
+            if in_bounds((rows, cols), cell):
+                index = cell[0] * cols + cell[1]
+                if distances[index] == UNREACHABLE:
+                    distances[index] = 0
+                    queue.append(index)
+
+        while queue:
+            index = queue.popleft()
+            step = distances[index] + 1
+            row, col = divmod(index, cols)
+            for neighbour, inside in ((index - cols, row > 0), (index + cols, row < rows - 1),
+                                      (index - 1, col > 0), (index + 1, col < cols - 1)):
+                if inside and open_cells[neighbour] and distances[neighbour] == UNREACHABLE:
+                    distances[neighbour] = step
+                    queue.append(neighbour)
+        fields.append([distances[row * cols:(row + 1) * cols] for row in range(rows)])
+    return fields
+
+def distance_fields(walkable, source_groups):
+    """
+    Returns a (len(source_groups), rows, cols) int32 array: for each group of (row, col) sources,
+    the shortest-path distance from the nearest source in the group to every cell, or UNREACHABLE.
+    Sources are at distance 0 even if they are not walkable themselves (e.g. a snake head);
+    every other cell on a path has to be walkable, as in a_star. Without NumPy, a list of lists of rows.
+
+    Every group is expanded in the same pass, one BFS layer per iteration. A layer is computed with
+    whole-array shifts of the frontier over the grid, padded by one cell on each side and flattened,
+    so a step in any direction is a single offset and nothing is visited cell by cell.
+    """
+    if np is None:
+        return _python_distance_fields(walkable, source_groups)
+
+    rows, cols = walkable.shape
+    width = cols + 2
+    size = (rows + 2) * width
+
+    padded = np.zeros((rows + 2, width), dtype=bool)
+    padded[1:-1, 1:-1] = walkable
+    unvisited = np.tile(padded.ravel(), (len(source_groups), 1))
+
+    frontier = np.zeros((len(source_groups), size), dtype=bool)
+    for group, sources in enumerate(source_groups):
+        for cell in sources:
+            if in_bounds((rows, cols), cell):
+                frontier[group, (cell[0] + 1) * width + cell[1] + 1] = True
+
+    distances = np.full((len(source_groups), size), UNREACHABLE, dtype=np.int32)
+    distances[frontier] = 0
+    unvisited &= ~frontier
+    grown = np.empty_like(frontier)
+    step = 0
+
+    while frontier.any():
+        step += 1
+        grown[:] = False
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        grown[:, width:] |= frontier[:, :-width]
+        grown[:, :-width] |= frontier[:, width:]
+        np.logical_and(grown, unvisited, out=frontier)
+        distances[frontier] = step
+        unvisited &= ~frontier
+
+    return distances.reshape(len(source_groups), rows + 2, width)[:, 1:-1, 1:-1]
+
+def distance_field(walkable, sources):
+    """
+    Returns a (rows, cols) int32 array (lists of rows without NumPy) with the shortest-path distance
+    from the nearest of `sources` to every cell, or UNREACHABLE. See distance_fields.
+    """
+    return distance_fields(walkable, [sources])[0]
+
+def food_distances(walkable, head, opponent_head, food_locations):
+    """
+    Returns (food cell, my distance, opponent distance) for every food item.
+    Both heads' distance fields come from a single pass; distances are UNREACHABLE where a head cannot reach the food.
+    """
+    mine, theirs = distance_fields(walkable, [[head], [opponent_head]])
+
+    shape = grid_shape(walkable)
+    result = []
+    for cell in food_locations:
+        cell = (cell[0], cell[1])
+        if in_bounds(shape, cell):
+            result.append((cell, int(mine[cell[0]][cell[1]]), int(theirs[cell[0]][cell[1]])))
+        else:
+            result.append((cell, UNREACHABLE, UNREACHABLE))
+    return result
+
+def closest_food(walkable, head, opponent_head, food_locations):
+    """
+    Returns the reachable food cell to aim for, or None if no food can be reached.
+    Food the opponent cannot reach first is preferred; among those, the nearest wins.
+    """
+    best_key, best = None, None
+    for cell, mine, theirs in food_distances(walkable, head, opponent_head, food_locations):
+        if mine == UNREACHABLE:
+            continue
+        contested = theirs != UNREACHABLE and theirs <= mine
+        key = (contested, mine)
+        if best_key is None or key < best_key:
+            best_key, best = key, cell
+    return best
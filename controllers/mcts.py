@@ -0,0 +1,312 @@
+import math
+import multiprocessing
+import random
+import time
+from core.forward_model import ForwardModel, OPEN
+
+DIRECTIONS = ("left", "right", "up", "down")
+
+# UCB1 exploration constant for values in [0, 1]
+EXPLORATION = 1.4
+# Plies played by the rollout policy before the position is scored
+ROLLOUT_DEPTH = 16
+# Share of rollout moves picked at random instead of towards food
+ROLLOUT_RANDOMNESS = 0.3
+
+def safe_moves(model, player):
+    """
+    Returns the moves that do not step into a wall, an obstacle or a body cell; a tail cell counts as free
+    since it moves away. A player with no safe move keeps its direction.
+    """
+    head = model.bodies[player][0]
+    static, counts1, counts2 = model.static, model.counts[1], model.counts[2]
+    tails = (model.bodies[1][-1], model.bodies[2][-1])
+    moves = []
+    for move in DIRECTIONS:
+        index = head + model.deltas[move]
+        if static[index] == OPEN and ((not counts1[index] and not counts2[index]) or index in tails):
+            moves.append(move)
+    return moves or [model.directions[player]]
+
+def rollout_move(model, player, rng):
+    """
+    Fast rollout policy: usually the safe move that gets closest to the nearest food (by Manhattan
+    distance), otherwise (ROLLOUT_RANDOMNESS of the time) a random safe move.
+    """
+    moves = safe_moves(model, player)
+    if len(moves) == 1 or not model.food or rng.random() < ROLLOUT_RANDOMNESS:
+        return moves[rng.randrange(len(moves))]
+
+    head, deltas, stride = model.bodies[player][0], model.deltas, model.stride
+    best, best_distance = moves[0], None
+    for move in moves:
+        row, col = divmod(head + deltas[move], stride)
+        distance = min(abs(row - index // stride) + abs(col - index % stride) for index in model.food)
+        if best_distance is None or distance < best_distance:
+            best, best_distance = move, distance
+    return best
+
+def food_distance(model, player):
+    """
+    Returns the Manhattan distance from the player's head to the nearest food, or 0 if there is none.
+    """
+    if not model.food:
+        return 0
+    row, col = divmod(model.bodies[player][0], model.stride)
+    stride = model.stride
+    return min(abs(row - index // stride) + abs(col - index % stride) for index in model.food)
+
+def evaluate(model, start_scores):
+    """
+    Returns the value of a position for player 1 in [0, 1]: 1, 0 or 0.5 once the game is decided,
+    otherwise 0.5 shifted by the food each player has eaten since the root and, less, by who is closer
+    to the nearest food, capped short of a win or loss.
+    """
+    if model.game_over:
+        return 1.0 if model.winner == 1 else 0.0 if model.winner == 2 else 0.5
+    gain = (model.scores[1] - start_scores[1]) - (model.scores[2] - start_scores[2])
+    closer = food_distance(model, 2) - food_distance(model, 1)
+    return 0.5 + max(-0.4, min(0.4, 0.1 * gain + 0.005 * closer))
+
+class Node:
+    """
+    A position in the search tree. Both snakes move at once, so each player keeps its own visit count and
+    total value per move (decoupled UCT) and children are keyed by the (move1, move2) pair played.
+    Values are stored from the point of view of the player making the move.
+    """
+    __slots__ = ("hash", "moves", "visits", "counts", "totals", "children")
+
+    def __init__(self, model):
+        self.hash = model.get_hash()
+        self.visits = 0
+        self.children = {}
+        if model.game_over:
+            self.moves = None
+            return
+        self.moves = [None, safe_moves(model, 1), safe_moves(model, 2)]
+        self.counts = [None, [0] * len(self.moves[1]), [0] * len(self.moves[2])]
+        self.totals = [None, [0.0] * len(self.moves[1]), [0.0] * len(self.moves[2])]
+
+    def select(self, player, exploration):
+        """
+        Returns the index of the player's move with the highest UCB1 score; unvisited moves go first.
+        """
+        counts, totals = self.counts[player], self.totals[player]
+        log_visits = math.log(self.visits) if self.visits else 0.0
+        best, best_score = 0, -1.0
+        for i, count in enumerate(counts):
+            if not count:
+                return i
+            score = totals[i] / count + exploration * math.sqrt(log_visits / count)
+            if score > best_score:
+                best, best_score = i, score
+        return best
+
+class MCTS:
+    """
+    Monte Carlo Tree Search over a ForwardModel for simultaneous moves.
+
+    `set_root(model)` starts a search from a position. If the position is the root of the last search or
+    one of its children (found by Zobrist hash), that subtree and its statistics are kept, so work from the
+    previous tick carries over. Food respawns are random in the game and not modelled, so after food is
+    eaten the position does not match and the tree starts fresh.
+
+    `search(deadline)` runs iterations until the time.perf_counter deadline passes and can be stopped at any
+    point; `root_stats` and `best_move` read the result.
+    """
+    def __init__(self, exploration=EXPLORATION, rollout_depth=ROLLOUT_DEPTH, seed=None):
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.rng = random.Random(seed)
+        self.root = None
+        self.root_model = None
+        self.start_scores = None
+        # Iterations run by the last search and whether its tree was reused, for profiling
+        self.iterations = 0
+        self.reused = False
+
+    def set_root(self, model):
+        """
+        Makes the model's position the root of the next search, reusing the matching subtree if there is one.
+        """
+        position_hash = model.get_hash()
+        root = None
+        if self.root is not None:
+            if self.root.hash == position_hash:
+                root = self.root
+            else:
+                for child in self.root.children.values():
+                    if child.hash == position_hash:
+                        root = child
+                        break
+
+        self.reused = root is not None
+        self.root = root if root is not None else Node(model)
+        self.root_model = model
+        self.start_scores = model.scores[:]
+
+    def iterate(self):
+        """
+        Runs one iteration: selection and expansion of one new node, a rollout and backpropagation.
+        """
+        exploration = self.exploration
+        model = self.root_model.clone()
+        node = self.root
+        path = []
+        while node.moves is not None:
+            i1 = node.select(1, exploration)
+            i2 = node.select(2, exploration)
+            path.append((node, i1, i2))
+            joint = (node.moves[1][i1], node.moves[2][i2])
+            model.step(*joint)
+            child = node.children.get(joint)
+            if child is None:
+                node.children[joint] = Node(model)
+                break
+            node = child
+
+        rng = self.rng
+        for _ in range(self.rollout_depth):
+            if model.game_over:
+                break
+            model.step(rollout_move(model, 1, rng), rollout_move(model, 2, rng))
+        value = evaluate(model, self.start_scores)
+
+        for node, i1, i2 in path:
+            node.visits += 1
+            node.counts[1][i1] += 1
+            node.totals[1][i1] += value
+            node.counts[2][i2] += 1
+            node.totals[2][i2] += 1.0 - value
+
+    def search(self, deadline):
+        """
+        Runs iterations until the deadline (a time.perf_counter value), at least one. Returns the number run.
+        """
+        iterations = 0
+        if self.root.moves is not None:
+            self.iterate()
+            iterations = 1
+            while time.perf_counter() < deadline:
+                self.iterate()
+                iterations += 1
+        self.iterations = iterations
+        return iterations
+
+    def root_stats(self, player):
+        """
+        Returns {move: (visits, total value)} for the player's moves at the root.
+        """
+        if self.root is None or self.root.moves is None:
+            return {}
+        return {move: (self.root.counts[player][i], self.root.totals[player][i]) for i, move in enumerate(self.root.moves[player])}
+
+def best_move(stats, default):
+    """
+    Returns the move with the most visits over a list of root_stats results (one per independent search),
+    or `default` if none of them has any.
+    """
+    visits = {}
+    for search_stats in stats:
+        for move, (count, _) in search_stats.items():
+            visits[move] = visits.get(move, 0) + count
+    if not visits:
+        return default
+    return max(visits, key=visits.get)
+
+def _helper_loop(connection, seed):
+    """
+    Entry point of a helper process: keeps its own tree between requests and answers each snapshot with the
+    root statistics of a search of the given budget.
+    """
+    searcher = MCTS(seed=seed)
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        request_id, budget, board_state, player_state, opponent_state = message
+        deadline = time.perf_counter() + budget
+        searcher.set_root(ForwardModel.from_snapshot(board_state, player_state, opponent_state))
+        searcher.search(deadline)
+        connection.send((request_id, searcher.root_stats(player_state["id"])))
+
+class SearchHelpers:
+    """
+    Processes running independent searches of the same position (root parallelism); their root statistics
+    are merged with the caller's by `best_move`.
+
+    Processes cannot be started from a daemonic process; `available()` is False there and the caller searches
+    alone. ControllerWorker processes (the GUI) and the tournament's pool workers are not daemonic. The helpers
+    are daemonic themselves, so they exit with the process that started them.
+    """
+    def __init__(self, count):
+        self.count = count
+        self.processes = []
+        self.connections = []
+        self.request_id = 0
+
+    @staticmethod
+    def available():
+        return not multiprocessing.current_process().daemon
+
+    def start(self):
+        """
+        Starts the helper processes.
+        """
+        for i in range(self.count):
+            parent_connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_helper_loop, args=(child_connection, i + 1), daemon=True)
+            process.start()
+            child_connection.close()
+            self.processes.append(process)
+            self.connections.append(parent_connection)
+
+    def stop(self):
+        """
+        Asks the helper processes to exit, killing any that do not.
+        """
+        for connection in self.connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.kill()
+        for connection in self.connections:
+            connection.close()
+        self.processes = []
+        self.connections = []
+
+    def request(self, budget, board_state, player_state, opponent_state):
+        """
+        Sends a snapshot to every helper, to be searched for `budget` seconds.
+        """
+        self.request_id += 1
+        for connection in list(self.connections):
+            try:
+                connection.send((self.request_id, budget, board_state, player_state, opponent_state))
+            except (BrokenPipeError, OSError):
+                self.connections.remove(connection)
+
+    def collect(self, deadline):
+        """
+        Returns the root statistics of the helpers that answered the last request by the deadline
+        (a time.perf_counter value). Answers to older requests are discarded.
+        """
+        results = []
+        for connection in list(self.connections):
+            try:
+                while connection.poll(max(0.0, deadline - time.perf_counter())):
+                    request_id, stats = connection.recv()
+                    if request_id == self.request_id:
+                        results.append(stats)
+                        break
+            except (EOFError, OSError):
+                self.connections.remove(connection)
+        return results
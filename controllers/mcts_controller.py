@@ -0,0 +1,71 @@
+# Reference Monte Carlo Tree Search controller.
+# It searches for most of CONTROLLER_TIMEOUT_MS every tick, so it is also a sparring partner that
+# uses its whole time budget instead of answering in a millisecond.
+#
+# The search itself lives in `controllers/mcts.py`; see `docs/controller_api.md` for the inputs.
+
+import atexit
+import os
+import time
+from . import mcts
+from config import config
+from core.forward_model import ForwardModel
+
+# Time spent searching, measured from the start of the call; the rest of CONTROLLER_TIMEOUT_MS
+# covers building the model and the pipe round trip
+SEARCH_BUDGET_MS = config.CONTROLLER_TIMEOUT_MS * 0.6
+
+# Extra processes searching the same position in parallel (root parallelism); 0 searches in-process only.
+# None sizes them when the search starts, up to MAX_ROLLOUT_WORKERS: in a tournament from the spare cores it
+# passes in (none while its pool keeps every core busy), elsewhere from the cores left over by the game and
+# both controllers.
+ROLLOUT_WORKERS = None
+MAX_ROLLOUT_WORKERS = 2
+
+# Keeps its tree between moves
+searcher = mcts.MCTS()
+helpers = None
+
+def set_player_name():
+    return "MCTSBot"
+
+def rollout_workers():
+    """
+    Returns the number of helper processes to start; see ROLLOUT_WORKERS.
+    """
+    if ROLLOUT_WORKERS is not None:
+        return ROLLOUT_WORKERS
+    spare_cores = os.environ.get(config.SPARE_CORES_VARIABLE)
+    if spare_cores is None:
+        spare_cores = (os.cpu_count() or 1) - 3
+    return max(0, min(MAX_ROLLOUT_WORKERS, int(spare_cores)))
+
+def get_helpers():
+    """
+    Returns the running SearchHelpers, starting them on first use, or None if there are none.
+    """
+    global helpers
+    if helpers is None:
+        count = rollout_workers()
+        if count > 0 and mcts.SearchHelpers.available():
+            helpers = mcts.SearchHelpers(count)
+            helpers.start()
+            atexit.register(helpers.stop)
+    return helpers
+
+def get_next_move(board_state, player_state, opponent_state):
+    deadline = time.perf_counter() + SEARCH_BUDGET_MS / 1000
+
+    search_helpers = get_helpers()
+    if search_helpers is not None:
+        search_helpers.request(deadline - time.perf_counter(), board_state, player_state, opponent_state)
+
+    model = ForwardModel.from_snapshot(board_state, player_state, opponent_state)
+    searcher.set_root(model)
+    searcher.search(deadline)
+
+    stats = [searcher.root_stats(player_state["id"])]
+    if search_helpers is not None:
+        # Helpers stop at the same deadline; a short grace covers sending the answer back
+        stats.extend(search_helpers.collect(deadline + 0.002))
+    return mcts.best_move(stats, player_state["direction"])
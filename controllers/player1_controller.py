@@ -12,9 +12,13 @@
 # please refer to the documentation at `docs/controller_api.md`.
 # Happy Coding!
 
-from . import a_star
+from . import d_star_lite
+from . import distance_field
 from config import config
 
+# Keeps its search between moves and only repairs it for the cells that changed
+planner = d_star_lite.DStarLite()
+
 grid = None
 
 def set_player_name():
@@ -71,14 +75,12 @@ def get_next_move(board_state, player_state, opponent_state):
     
     start = (head["row"], head["col"])
 
-    fruits.sort(key=lambda x: (x[0] - head["row"])**2 + (x[1] - head["col"])**2)
-    
-    if (opponent_head["row"] - fruits[0][0])**2 < (head["row"] - fruits[0][0])**2 and (opponent_head["row"] - fruits[0][0])**2 < (head["col"] - fruits[0][0])**2 and len(fruits) > 1:
-        goal = (fruits[1][0], fruits[1][1])
-    else:
-        goal = (fruits[0][0], fruits[0][1])
+    # Aim for the nearest food the opponent can't reach first, by true path distance
+    goal = distance_field.closest_food(distance_field.walkable_array(grid), start, (opponent_head["row"], opponent_head["col"]), fruits)
+    if goal is None:
+        return direction
 
-    path = a_star.a_star(start, goal, grid)
+    path = planner.plan(start, goal, grid)
     
     if path and len(path) > 1:   
         ans = path[1]
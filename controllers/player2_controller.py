@@ -12,9 +12,12 @@
 # please refer to the documentation at `docs/controller_api.md`.
 # Happy Coding!
 
-from . import a_star
+from . import d_star_lite
 from config import config
 
+# Keeps its search between moves and only repairs it for the cells that changed
+planner = d_star_lite.DStarLite()
+
 def set_player_name():
     return "SnakeBot"
 
@@ -72,7 +75,7 @@ def get_next_move(board_state, player_state, opponent_state):
 
    
     
-    path = a_star.a_star(start, goal, grid)
+    path = planner.plan(start, goal, grid)
     if path and len(path) > 1: 
         ans = path[1]
     elif path and len(path) == 1:
@@ -0,0 +1,284 @@
+import numpy as np
+from config import config
+from core.env import FOOD_REWARD, WIN_REWARD
+from core.game_state import MAX_PLACEMENT_ATTEMPTS
+from core.obstacle import MIN_LENGTH, MAX_LENGTH
+from core.occupancy import FOOD, OBSTACLE, SNAKE1, SNAKE2
+
+# Actions are indices into DIRECTIONS
+DIRECTIONS = ("left", "right", "up", "down")
+ROW_DELTAS = np.array([0, 0, -1, 1], dtype=np.int32)
+COL_DELTAS = np.array([-1, 1, 0, 0], dtype=np.int32)
+
+# Values of `winners`
+RUNNING = -1
+DRAW = 0
+
+# Rejection rounds for drawing a random free cell before falling back to choosing among the free cells
+FREE_CELL_DRAWS = 8
+
+SNAKE_TAGS = np.array([SNAKE1, SNAKE2], dtype=np.uint8)
+
+class BatchEnv:
+    """
+    N independent games held in NumPy arrays and advanced together by one `step(actions)` call.
+
+    The rules are those of GameState.apply_moves and resolve_collisions: both snakes move, a snake whose head
+    leaves the board or lands on its own body, the other snake or an obstacle collides (both collide on a
+    head-on), a snake that did not collide eats the food under its head, grows by its vacated tail cell and a
+    new food item spawns on a random free cell. Time is counted in moves: when a Match would call time up the
+    game is won on score, or goes to sudden death with one food item that wins the game for whoever eats it.
+
+    State per game:
+    - `cells`: (N, rows * cols) uint8 occupancy flags, as in OccupancyGrid (FOOD, OBSTACLE, SNAKE1, SNAKE2)
+    - `bodies`: (N, 2, rows * cols) ring buffers of flat body cells, the head at `head_slots`, `lengths` long
+    - `head_rows`, `head_cols`, `directions`, `scores`: (N, 2) per player
+    - `ticks`, `sudden_death`, `dones`, `winners`: (N,)
+
+    Rewards are those of core.env.SnakeEnv. With `auto_reset` a game that ends is reset at the end of the same step, so every game is always running;
+    otherwise finished games are left as they are and skipped until `reset` is called for them.
+    """
+    def __init__(self, num_games, rows=None, cols=None, num_food=config.NUM_FOOD, num_obstacles=config.NUM_OBSTACLES,
+                 max_ticks=None, auto_reset=True, seed=None):
+        self.num_games = num_games
+        self.rows = rows if rows is not None else config.BOARD_HEIGHT // config.GRID_SIZE
+        self.cols = cols if cols is not None else config.BOARD_WIDTH // config.GRID_SIZE
+        self.size = self.rows * self.cols
+        self.num_food = num_food
+        self.num_obstacles = num_obstacles
+        # Moves played before time is up, as in a Match counting ticks of AI_UPDATE_INTERVAL_MS
+        self.duration = config.GAME_DURATION // config.AI_UPDATE_INTERVAL_MS - 1
+        self.max_ticks = max_ticks
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+
+        self.cells = np.zeros((num_games, self.size), dtype=np.uint8)
+        self.bodies = np.zeros((num_games, 2, self.size), dtype=np.int32)
+        self.head_slots = np.zeros((num_games, 2), dtype=np.int64)
+        self.lengths = np.ones((num_games, 2), dtype=np.int64)
+        self.head_rows = np.zeros((num_games, 2), dtype=np.int32)
+        self.head_cols = np.zeros((num_games, 2), dtype=np.int32)
+        self.directions = np.zeros((num_games, 2), dtype=np.int8)
+        self.scores = np.zeros((num_games, 2), dtype=np.int32)
+        self.ticks = np.zeros(num_games, dtype=np.int32)
+        self.sudden_death = np.zeros(num_games, dtype=bool)
+        self.dones = np.zeros(num_games, dtype=bool)
+        self.winners = np.full(num_games, RUNNING, dtype=np.int8)
+        self.reset()
+
+    def observations(self):
+        """
+        Returns the (N, rows, cols) occupancy flags. This is a view of the live state; copy it to keep it.
+        """
+        return self.cells.reshape(self.num_games, self.rows, self.cols)
+
+    def reset(self, games=None):
+        """
+        Starts new games in the given slots (all of them by default) with the starting positions of a Player
+        and food and obstacles placed as GameState does. Returns the observations.
+        """
+        games = np.arange(self.num_games) if games is None else np.asarray(games, dtype=np.int64)
+        if not len(games):
+            return self.observations()
+
+        middle = self.rows // 2
+        starts = np.array([middle * self.cols, middle * self.cols + self.cols - 1], dtype=np.int32)
+        self.cells[games] = 0
+        self.cells[games, starts[0]] = SNAKE1
+        self.cells[games, starts[1]] = SNAKE2
+        self.bodies[games, :, 0] = starts
+        self.head_slots[games] = 0
+        self.lengths[games] = 1
+        self.head_rows[games] = middle
+        self.head_cols[games] = (0, self.cols - 1)
+        self.directions[games] = (DIRECTIONS.index("right"), DIRECTIONS.index("left"))
+        self.scores[games] = 0
+        self.ticks[games] = 0
+        self.sudden_death[games] = False
+        self.dones[games] = False
+        self.winners[games] = RUNNING
+
+        for _ in range(self.num_food):
+            self._spawn_food(games)
+        for _ in range(self.num_obstacles):
+            self._place_obstacle(games)
+        return self.observations()
+
+    def _random_free_cells(self, games):
+        """
+        Returns a uniformly random free cell of each game, and a mask of the games with no free cell.
+        Cells are drawn uniformly and redrawn while occupied, which on a mostly empty board settles in a few
+        rounds; games still unlucky after FREE_CELL_DRAWS rounds pick among their free cells directly.
+        """
+        cells = np.zeros(len(games), dtype=np.int64)
+        full = np.zeros(len(games), dtype=bool)
+        pending = np.arange(len(games))
+        for _ in range(FREE_CELL_DRAWS):
+            if not len(pending):
+                return cells, full
+            drawn = self.rng.integers(0, self.size, len(pending))
+            free = self.cells[games[pending], drawn] == 0
+            cells[pending[free]] = drawn[free]
+            pending = pending[~free]
+
+        if len(pending):
+            free = self.cells[games[pending]] == 0
+            keys = self.rng.random(free.shape)
+            keys[~free] = -1.0
+            cells[pending] = keys.argmax(axis=1)
+            full[pending] = ~free.any(axis=1)
+        return cells, full
+
+    def _spawn_food(self, games):
+        """
+        Spawns one food item in each of the given games. Returns the mask of games whose board was full.
+        """
+        cells, full = self._random_free_cells(games)
+        self.cells[games[~full], cells[~full]] |= FOOD
+        return full
+
+    def _obstacle_cells(self, anchors, vertical, lengths):
+        """
+        Returns the flat cells of obstacles with the given top-left anchors, and a mask of the placements
+        that stay on the board. Cells past an obstacle's length repeat its anchor.
+        """
+        steps = np.arange(MAX_LENGTH)
+        within = steps < lengths[:, None]
+        rows = anchors[:, None] // self.cols + np.where(vertical[:, None], steps, 0) * within
+        cols = anchors[:, None] % self.cols + np.where(vertical[:, None], 0, steps) * within
+        on_board = ((rows < self.rows) & (cols < self.cols)).all(axis=1)
+        return np.minimum(rows, self.rows - 1) * self.cols + np.minimum(cols, self.cols - 1), on_board
+
+    def _place_obstacle(self, games):
+        """
+        Places one obstacle of random orientation and length in each game on a uniformly chosen legal placement,
+        drawing free anchors as GameState._place_obstacle does. Games with no legal placement get none.
+        """
+        vertical = self.rng.integers(0, 2, len(games)).astype(bool)
+        lengths = self.rng.integers(MIN_LENGTH, MAX_LENGTH + 1, len(games))
+        anchors = np.full(len(games), -1, dtype=np.int64)
+
+        pending = np.arange(len(games))
+        for _ in range(MAX_PLACEMENT_ATTEMPTS):
+            if not len(pending):
+                break
+            drawn, full = self._random_free_cells(games[pending])
+            cells, on_board = self._obstacle_cells(drawn, vertical[pending], lengths[pending])
+            legal = on_board & (self.cells[games[pending][:, None], cells] == 0).all(axis=1) & ~full
+            anchors[pending[legal]] = drawn[legal]
+            pending = pending[~legal & ~full]
+
+        # Crowded boards: enumerate the legal placements instead of retrying without bound
+        for i in pending:
+            free = np.flatnonzero(self.cells[games[i]] == 0)
+            cells, on_board = self._obstacle_cells(free, np.repeat(vertical[i], len(free)), np.repeat(lengths[i], len(free)))
+            legal = free[on_board & (self.cells[games[i]][cells] == 0).all(axis=1)]
+            if len(legal):
+                anchors[i] = self.rng.choice(legal)
+
+        placed = anchors >= 0
+        cells, _ = self._obstacle_cells(anchors[placed], vertical[placed], lengths[placed])
+        self.cells[games[placed][:, None], cells] |= OBSTACLE
+
+    def _finish(self, games, winners):
+        self.dones[games] = True
+        self.winners[games] = winners
+
+    def _score_winners(self, games):
+        """
+        Returns the winner of each game on score: the higher score, or DRAW.
+        """
+        scores = self.scores[games]
+        return np.where(scores[:, 0] > scores[:, 1], 1, np.where(scores[:, 1] > scores[:, 0], 2, DRAW))
+
+    def step(self, actions):
+        """
+        Moves both snakes of every running game. `actions` is an (N, 2) array of DIRECTIONS indices
+        for player 1 and player 2. Returns (observations, rewards, dones, winners):
+        rewards are (N, 2) floats, and dones and winners are those of each game before any automatic reset,
+        so a game that ended in this step reports its result once.
+        """
+        actions = np.asarray(actions)
+        games = np.flatnonzero(~self.dones)
+        index = games[:, None]
+        players = np.arange(2)
+        size = self.size
+        rewards = np.zeros((self.num_games, 2), dtype=np.float32)
+
+        # Both tails move away before any collision is checked
+        slots = self.head_slots[games]
+        lengths = self.lengths[games]
+        tails = self.bodies[index, players, (slots - lengths + 1) % size]
+        self.cells[index, tails] &= ~SNAKE_TAGS
+
+        moves = actions[games]
+        rows = self.head_rows[games] + ROW_DELTAS[moves]
+        cols = self.head_cols[games] + COL_DELTAS[moves]
+        on_board = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        heads = np.where(on_board, rows * self.cols + cols, 0)
+        flags = np.where(on_board, self.cells[index, heads], 0)
+
+        # Same checks as resolve_collisions: wall, self, other snake, head-on, obstacle
+        head_on = (rows[:, 0] == rows[:, 1]) & (cols[:, 0] == cols[:, 1])
+        collided = ~on_board | ((flags & (SNAKE1 | SNAKE2)) != 0) | head_on[:, None] | ((flags & OBSTACLE) != 0)
+
+        slots = (slots + 1) % size
+        self.head_slots[games] = slots
+        self.bodies[index, players, slots] = heads
+        self.head_rows[games] = rows
+        self.head_cols[games] = cols
+        self.directions[games] = moves
+        for player in players:
+            placed = on_board[:, player]
+            self.cells[games[placed], heads[placed, player]] |= SNAKE_TAGS[player]
+
+        # Food: the eater grows back onto its vacated tail cell
+        eats = ~collided & ((flags & FOOD) != 0)
+        self.lengths[games] = lengths + eats
+        self.scores[games] += eats
+        rewards[games] += FOOD_REWARD * eats
+        for player in players:
+            eaters = eats[:, player]
+            self.cells[games[eaters], tails[eaters, player]] |= SNAKE_TAGS[player]
+            self.cells[games[eaters], heads[eaters, player]] &= ~np.uint8(FOOD)
+
+        sudden_death = self.sudden_death[games]
+        for player in players:
+            # Sudden death food wins the game; other food is replaced
+            won = eats[:, player] & sudden_death
+            self._finish(games[won], player + 1)
+            respawn = games[eats[:, player] & ~sudden_death]
+            full = self._spawn_food(respawn)
+            self._finish(respawn[full], DRAW)
+
+        # Collisions decide games that food did not
+        open_games = ~self.dones[games]
+        both = open_games & collided[:, 0] & collided[:, 1]
+        self._finish(games[both], self._score_winners(games[both]))
+        self._finish(games[open_games & collided[:, 0] & ~collided[:, 1]], 2)
+        self._finish(games[open_games & collided[:, 1] & ~collided[:, 0]], 1)
+
+        # Time up: decided on score, or sudden death with one food item on a tie
+        self.ticks[games] += 1
+        time_up = games[~self.dones[games] & ~self.sudden_death[games] & (self.ticks[games] >= self.duration)]
+        winners = self._score_winners(time_up)
+        self._finish(time_up[winners != DRAW], winners[winners != DRAW])
+        tied = time_up[winners == DRAW]
+        self.sudden_death[tied] = True
+        self.cells[tied] &= ~np.uint8(FOOD)
+        self._finish(tied[self._spawn_food(tied)], DRAW)
+
+        if self.max_ticks is not None:
+            expired = games[~self.dones[games] & (self.ticks[games] >= self.max_ticks)]
+            self._finish(expired, self._score_winners(expired))
+
+        finished = games[self.dones[games]]
+        winners = self.winners[finished]
+        rewards[finished, 0] += WIN_REWARD * ((winners == 1).astype(np.float32) - (winners == 2))
+        rewards[finished, 1] += WIN_REWARD * ((winners == 2).astype(np.float32) - (winners == 1))
+
+        dones = self.dones.copy()
+        winners = self.winners.copy()
+        if self.auto_reset:
+            self.reset(finished)
+        return self.observations(), rewards, dones, winners
@@ -0,0 +1,331 @@
+import gc
+import os
+import platform
+import random
+import time
+from itertools import count, cycle
+from config import config
+from controllers.a_star import a_star
+from core.board import Board
+from core.clock import TickClock
+from core.game_state import GameState
+from core.match import VALID_DIRECTIONS
+from core.occupancy import FOOD, OBSTACLE
+from core.player import Player
+from core.snake import DIRECTION_DELTAS
+
+# Seed of every benchmark position, so runs on different machines or commits measure the same work
+SEED = 2024
+
+# Each case is timed in REPEATS batches of calls lasting at least `min_time / REPEATS` seconds; the fastest counts
+REPEATS = 5
+MIN_TIME = 1.0
+
+# Parameter grids
+BOARD_SIZES = ((33, 66), (66, 132))
+SNAKE_LENGTHS = (4, 16, 64)
+OBSTACLE_COUNTS = (0, config.NUM_OBSTACLES, 40)
+FILL_FRACTIONS = (0.0, 0.5, 0.9, 0.99)
+
+OPPOSITES = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+class Case:
+    """
+    One benchmark case: `setup(**params)` builds the position and returns a callable doing one operation.
+    """
+    def __init__(self, name, setup, params):
+        self.name = name
+        self.setup = setup
+        self.params = params
+
+    @property
+    def key(self):
+        """
+        Returns the case's name with its parameters, e.g. "snake_move[length=16]", used as the baseline key.
+        """
+        if not self.params:
+            return self.name
+        return f"{self.name}[{','.join(f'{name}={value}' for name, value in self.params.items())}]"
+
+def loop_directions(rows, cols):
+    """
+    Returns the moves of a closed loop around the rectangle of the given size, starting from its bottom-left
+    cell going up; a snake shorter than the loop can follow it forever without touching itself.
+    """
+    return ["up"] * (rows - 1) + ["right"] * (cols - 1) + ["down"] * (rows - 1) + ["left"] * (cols - 1)
+
+def clear_obstacles(state):
+    """
+    Takes every obstacle off a GameState's board.
+    """
+    for obstacle in state.obstacle_locations:
+        for row, col in obstacle.get_occupied_positions():
+            state.occupancy.remove(OBSTACLE, row, col)
+    state.obstacle_locations.clear()
+
+def make_state(rows=33, cols=66, snake_length=4, obstacles=config.NUM_OBSTACLES, seed=SEED):
+    """
+    Returns a GameState on a board of the given size with controller-less players, each snake laid along a
+    loop in its own half of the board (player 1 top-left, player 2 bottom-right), then `obstacles` obstacles
+    and the food placed around them. Also returns each player's loop, positioned to continue from the head.
+    """
+    board = Board(cols * config.GRID_SIZE, rows * config.GRID_SIZE)
+    player1, player2 = Player(1, board, None), Player(2, board, None)
+    state = GameState(board, player1, player2, clock=TickClock(config.AI_UPDATE_INTERVAL_MS), seed=seed)
+
+    clear_obstacles(state)
+    state._clear_food()
+
+    # Player 1 starts at the bottom-left of its loop; player 2's loop is the same shape turned half way round
+    loops = {1: loop_directions(rows // 2 + 1, cols // 2), 2: [OPPOSITES[move] for move in loop_directions(rows - rows // 2, cols // 2)]}
+    for player in (player1, player2):
+        loop = loops[player.id]
+        if snake_length >= len(loop):
+            raise ValueError(f"A snake of length {snake_length} does not fit a {rows}x{cols} board")
+        for move in loop[:snake_length - 1]:
+            player.snake.direction = move
+            player.snake.move()
+            player.snake.grow()
+        loops[player.id] = loop[snake_length - 1:] + loop[:snake_length - 1]
+
+    for _ in range(obstacles):
+        state._place_obstacle()
+    for _ in range(config.NUM_FOOD):
+        state._spawn_food()
+    return state, loops
+
+def setup_snake_move(length):
+    state, loops = make_state(snake_length=length)
+    snake, moves = state.player1.snake, cycle(loops[1])
+
+    def run():
+        snake.direction = next(moves)
+        snake.move()
+    return run
+
+def setup_resolve_collisions(length, obstacles):
+    state, _ = make_state(snake_length=length, obstacles=obstacles)
+    return state.resolve_collisions
+
+def setup_spawn_food(fill):
+    """
+    Fills the given fraction of the board's free cells with obstacle cells, then times spawning one food item
+    (and taking it away again, so the board stays as full).
+    """
+    state, _ = make_state()
+    rng = random.Random(SEED)
+    free = list(state.occupancy.free_cells)
+    rng.shuffle(free)
+    for index in free[:int(len(free) * fill)]:
+        state.occupancy.add(OBSTACLE, *divmod(index, state.cols))
+
+    def run():
+        state._spawn_food()
+        state._remove_food(state.food_locations[-1])
+    return run
+
+def setup_occupied_positions(rows, cols, length, obstacles):
+    state, _ = make_state(rows, cols, length, obstacles)
+    return state._get_all_occupied_grid_positions
+
+def make_maze(rows, cols, seed=SEED):
+    """
+    Returns a rows x cols grid (1 walkable, 0 wall) holding a maze carved by a randomised depth-first search
+    between the cells at even coordinates, so every walkable cell is reachable along a single winding path.
+    """
+    grid = [[0] * cols for _ in range(rows)]
+    rng = random.Random(seed)
+    stack = [(0, 0)]
+    grid[0][0] = 1
+    while stack:
+        row, col = stack[-1]
+        options = [(row + 2 * d_row, col + 2 * d_col, d_row, d_col) for d_row, d_col in DIRECTION_DELTAS.values()
+                   if 0 <= row + 2 * d_row < rows and 0 <= col + 2 * d_col < cols and not grid[row + 2 * d_row][col + 2 * d_col]]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col, d_row, d_col = rng.choice(options)
+        grid[row + d_row][col + d_col] = 1
+        grid[next_row][next_col] = 1
+        stack.append((next_row, next_col))
+    return grid
+
+def setup_a_star(rows, cols, grid, jump_points):
+    if grid == "open":
+        cells = [[1] * cols for _ in range(rows)]
+    else:
+        cells = make_maze(rows, cols)
+    # Far corners, on cells the maze always carves
+    start, goal = (0, 0), ((rows - 1) // 2 * 2, (cols - 1) // 2 * 2)
+    if a_star(start, goal, cells) is None:
+        raise ValueError("Benchmark goal is unreachable")
+    return lambda: a_star(start, goal, cells, jump_points=jump_points)
+
+def setup_tick(rows, cols, obstacles):
+    """
+    Times whole ticks of the engine: the phase update, building both controllers' snapshots and applying
+    the moves of a simple policy (keep going unless the next cell is blocked, then turn to a free one).
+    Finished games are replaced by a new one from the next seed.
+    """
+    games = count(SEED)
+    state = clock = None
+
+    def new_game():
+        nonlocal state, clock
+        board = Board(cols * config.GRID_SIZE, rows * config.GRID_SIZE)
+        clock = TickClock(config.AI_UPDATE_INTERVAL_MS)
+        state = GameState(board, Player(1, board, None), Player(2, board, None), clock=clock, seed=next(games))
+        clear_obstacles(state)
+        for _ in range(obstacles):
+            state._place_obstacle()
+
+    def policy(snake):
+        occupancy = state.occupancy
+        for move in (snake.direction, *VALID_DIRECTIONS):
+            d_row, d_col = DIRECTION_DELTAS[move]
+            row, col = snake.body[0][0] + d_row, snake.body[0][1] + d_col
+            if occupancy.in_bounds(row, col) and not occupancy.get(row, col) & ~FOOD and OPPOSITES[move] != snake.direction:
+                return move
+        return snake.direction
+
+    def run():
+        if state.game_over:
+            new_game()
+        clock.advance()
+        if state.update_phase(clock()):
+            state.get_snapshots(tick=clock.tick)
+            state.apply_moves(policy(state.player1.snake), policy(state.player2.snake))
+    new_game()
+    return run
+
+def setup_render(part, length, obstacles):
+    """
+    Times drawing on an offscreen surface with core.renderer: "static" composites the board background and
+    the obstacles, "frame" draws the board with the food and both snakes over it.
+    Without a window a hidden display is opened, so images are converted to the display format as in the game.
+    """
+    import pygame
+    from core.renderer import Renderer
+
+    if pygame.display.get_surface() is None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+    state, _ = make_state(snake_length=length, obstacles=obstacles)
+    screen = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    renderer = Renderer(screen, state.board)
+    renderer.build_static_layer(state)
+
+    if part == "static":
+        return lambda: renderer.build_static_layer(state)
+
+    def run():
+        renderer.board_surface.blit(renderer.static_layer, (0, 0))
+        for food in state.food_locations:
+            renderer.draw_food(food)
+        renderer.draw_snake(state.player1.snake)
+        renderer.draw_snake(state.player2.snake)
+        screen.blit(renderer.board_surface, (0, 0))
+    return run
+
+def render_available():
+    try:
+        import pygame
+    except ImportError:
+        return False
+    return True
+
+def cases():
+    """
+    Returns every benchmark case, with the render cases only if pygame is installed.
+    """
+    result = []
+    for length in SNAKE_LENGTHS:
+        result.append(Case("snake_move", setup_snake_move, {"length": length}))
+    for length in SNAKE_LENGTHS:
+        for obstacles in OBSTACLE_COUNTS:
+            result.append(Case("resolve_collisions", setup_resolve_collisions, {"length": length, "obstacles": obstacles}))
+    for fill in FILL_FRACTIONS:
+        result.append(Case("spawn_food", setup_spawn_food, {"fill": fill}))
+    for rows, cols in BOARD_SIZES:
+        for length in SNAKE_LENGTHS:
+            for obstacles in OBSTACLE_COUNTS:
+                result.append(Case("occupied_positions", setup_occupied_positions, {"rows": rows, "cols": cols, "length": length, "obstacles": obstacles}))
+    for rows, cols in BOARD_SIZES:
+        for grid in ("open", "maze"):
+            for jump_points in (False, True):
+                result.append(Case("a_star", setup_a_star, {"rows": rows, "cols": cols, "grid": grid, "jump_points": jump_points}))
+    for rows, cols in BOARD_SIZES:
+        for obstacles in OBSTACLE_COUNTS:
+            result.append(Case("tick", setup_tick, {"rows": rows, "cols": cols, "obstacles": obstacles}))
+    if render_available():
+        for obstacles in OBSTACLE_COUNTS:
+            result.append(Case("render", setup_render, {"part": "static", "length": 4, "obstacles": obstacles}))
+        for length in SNAKE_LENGTHS:
+            result.append(Case("render", setup_render, {"part": "frame", "length": length, "obstacles": config.NUM_OBSTACLES}))
+    return result
+
+def measure(run, min_time=MIN_TIME, repeats=REPEATS):
+    """
+    Returns the operations per second of a callable: the best of `repeats` batches, each sized (by doubling)
+    to last at least min_time / repeats seconds. Garbage collection is off while timing, as in timeit.
+    """
+    batch_time = min_time / repeats
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                run()
+            elapsed = time.perf_counter() - start
+            if elapsed >= batch_time:
+                break
+            number *= 2
+
+        best = elapsed
+        for _ in range(repeats - 1):
+            start = time.perf_counter()
+            for _ in range(number):
+                run()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return number / best
+
+def run_cases(selected, min_time=MIN_TIME, report=None):
+    """
+    Runs the given cases and returns {case key: operations per second}. `report(key, ops)` is called after each.
+    """
+    results = {}
+    for case in selected:
+        ops = measure(case.setup(**case.params), min_time)
+        results[case.key] = ops
+        if report is not None:
+            report(case.key, ops)
+    return results
+
+def baseline(results):
+    """
+    Returns a baseline document for the results, with the machine they were measured on.
+    """
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "results": results
+    }
+
+def compare(results, baseline_results, threshold):
+    """
+    Returns (key, ops, baseline ops, ratio, regressed) for every result, where ratio is ops / baseline ops
+    (None for cases missing from the baseline) and regressed means more than `threshold` slower.
+    """
+    rows = []
+    for key, ops in results.items():
+        base = baseline_results.get(key)
+        ratio = ops / base if base else None
+        rows.append((key, ops, base, ratio, ratio is not None and ratio < 1.0 - threshold))
+    return rows
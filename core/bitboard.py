@@ -0,0 +1,181 @@
+from core.occupancy import FOOD, OBSTACLE, SNAKE1, SNAKE2
+
+DIRECTIONS = ("left", "right", "up", "down")
+
+class Bitboard:
+    """
+    Bit layout for representing sets of board cells as Python ints, one bit per cell.
+
+    Cell (row, col) is bit row * stride + col, where stride = cols + 1: every row is followed by one
+    always-clear guard bit, so shifting a whole board left or right by one moves cells along their row
+    and anything pushed off the edge lands in a guard bit, which `board` masks out. Unions,
+    intersections, neighbour expansion and counts over the whole board are then a few int operations.
+    """
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.stride = cols + 1
+
+        row_mask = (1 << cols) - 1
+        self.board = 0
+        for row in range(rows):
+            self.board |= row_mask << (row * self.stride)
+
+        # Cells along each edge of the board, i.e. next to a wall
+        self.left_edge = sum(1 << (row * self.stride) for row in range(rows))
+        self.right_edge = self.left_edge << (cols - 1)
+        self.top_edge = row_mask
+        self.bottom_edge = row_mask << ((rows - 1) * self.stride)
+        self.walls = self.left_edge | self.right_edge | self.top_edge | self.bottom_edge
+
+        # Maps a cell tag byte to "1"/"0" for building masks from the occupancy grid
+        self._tag_tables = {}
+
+    def bit(self, row, col):
+        """
+        Returns the mask of a single cell, or 0 for positions outside the board.
+        """
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return 1 << (row * self.stride + col)
+        return 0
+
+    def mask(self, cells):
+        """
+        Returns the mask of an iterable of (row, col) cells; cells outside the board are ignored.
+        """
+        mask = 0
+        for row, col in cells:
+            if 0 <= row < self.rows and 0 <= col < self.cols:
+                mask |= 1 << (row * self.stride + col)
+        return mask
+
+    def cells(self, mask):
+        """
+        Returns the (row, col) cells of a mask in row-major order.
+        """
+        cells = []
+        while mask:
+            low = mask & -mask
+            cells.append(divmod(low.bit_length() - 1, self.stride))
+            mask ^= low
+        return cells
+
+    def contains(self, mask, row, col):
+        """
+        Returns True if the cell is in the mask.
+        """
+        return bool(mask & self.bit(row, col))
+
+    @staticmethod
+    def count(mask):
+        """
+        Returns the number of cells in the mask.
+        """
+        return mask.bit_count()
+
+    def shift(self, mask, direction):
+        """
+        Returns the mask moved one cell in the given direction; cells leaving the board are dropped.
+        """
+        if direction == "left":
+            return (mask >> 1) & self.board
+        if direction == "right":
+            return (mask << 1) & self.board
+        if direction == "up":
+            return mask >> self.stride
+        return (mask << self.stride) & self.board
+
+    def neighbours(self, mask):
+        """
+        Returns every cell next to a cell of the mask (the mask itself is not included unless adjacent).
+        """
+        stride = self.stride
+        return ((mask << 1) | (mask >> 1) | (mask << stride) | (mask >> stride)) & self.board
+
+    def flood_fill(self, sources, passable):
+        """
+        Returns every cell reachable from the `sources` mask through `passable` cells, sources included.
+        Sources do not need to be passable themselves (e.g. a snake head).
+        """
+        stride = self.stride
+        region = sources
+        frontier = sources
+        while frontier:
+            grown = ((frontier << 1) | (frontier >> 1) | (frontier << stride) | (frontier >> stride)) & passable
+            frontier = grown & ~region
+            region |= frontier
+        return region
+
+    def reachable_count(self, sources, passable):
+        """
+        Returns the number of passable cells reachable from the sources, not counting the sources.
+        """
+        return (self.flood_fill(sources, passable) & ~sources).bit_count()
+
+    def distance_layers(self, sources, passable):
+        """
+        Yields the BFS layers from the sources: the sources first, then each mask of cells one step further.
+        """
+        stride = self.stride
+        visited = sources
+        frontier = sources
+        while frontier:
+            yield frontier
+            grown = ((frontier << 1) | (frontier >> 1) | (frontier << stride) | (frontier >> stride)) & passable
+            frontier = grown & ~visited
+            visited |= frontier
+
+    def distance(self, sources, target, passable):
+        """
+        Returns the number of steps from the nearest source to any cell of `target`, or None if unreachable.
+        """
+        for steps, layer in enumerate(self.distance_layers(sources, passable)):
+            if layer & target:
+                return steps
+        return None
+
+    def from_tags(self, cells, tags):
+        """
+        Returns the mask of the cells of an OccupancyGrid `cells` bytearray that have any of the `tags` flags.
+        The bytes are mapped to "0"/"1" digits and parsed as one binary number, so no Python loop runs per cell.
+        """
+        table = self._tag_tables.get(tags)
+        if table is None:
+            table = bytes(ord("1") if flags & tags else ord("0") for flags in range(256))
+            self._tag_tables[tags] = table
+
+        digits = cells.translate(table)
+        cols = self.cols
+        # A guard "0" after every row, then reversed so that bit 0 is cell (0, 0)
+        rows = b"0".join(digits[start:start + cols] for start in range(0, len(digits), cols))
+        return int(rows[::-1], 2) if rows else 0
+
+    def from_grid(self, grid):
+        """
+        Returns the mask of the walkable cells (value 1) of a list-of-lists controller grid.
+        """
+        mask = 0
+        for row, values in enumerate(grid):
+            offset = row * self.stride
+            for col, value in enumerate(values):
+                if value == 1:
+                    mask |= 1 << (offset + col)
+        return mask
+
+def board_masks(state):
+    """
+    Returns the masks of a GameState as a dictionary: food, obstacles, each snake's body, everything
+    occupied and the free cells, plus the Bitboard layout they use.
+    """
+    layout = state.bitboard
+    cells = state.occupancy.cells
+    occupied = layout.from_tags(cells, FOOD | OBSTACLE | SNAKE1 | SNAKE2)
+    return {
+        "layout": layout,
+        "food": layout.from_tags(cells, FOOD),
+        "obstacles": layout.from_tags(cells, OBSTACLE),
+        "snake1": layout.from_tags(cells, SNAKE1),
+        "snake2": layout.from_tags(cells, SNAKE2),
+        "occupied": occupied,
+        "free": layout.board & ~occupied
+    }
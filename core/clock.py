@@ -0,0 +1,35 @@
+import time
+
+_start_time = time.monotonic()
+
+def get_ticks():
+    """
+    Returns the number of milliseconds since this module was imported.
+    Mirrors pygame.time.get_ticks so the game logic can keep time without pygame.
+    """
+    return int((time.monotonic() - _start_time) * 1000)
+
+class TickClock:
+    """
+    Game clock driven by a tick counter instead of the wall clock: every `advance` moves game time on by
+    `tick_ms`. Calling it returns the game time in milliseconds, so it can be passed wherever a clock
+    callable is expected (e.g. GameState).
+    """
+    def __init__(self, tick_ms):
+        self.tick_ms = tick_ms
+        self.tick = 0
+
+    def reset(self):
+        """
+        Goes back to tick 0.
+        """
+        self.tick = 0
+
+    def advance(self):
+        """
+        Moves on by one tick.
+        """
+        self.tick += 1
+
+    def __call__(self):
+        return self.tick * self.tick_ms
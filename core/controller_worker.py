@@ -0,0 +1,195 @@
+import atexit
+import importlib
+import multiprocessing
+import time
+import traceback
+from multiprocessing.connection import wait
+from config import config
+from core.shared_board import SharedBoardView
+from core.state_delta import StateView, is_state_update
+
+def _worker_loop(connection, controller_module_name):
+    """
+    Entry point of a controller process.
+    Imports the controller once, then answers move requests until the pipe is closed.
+    Lean snapshots name a shared board, which is attached once and handed to the controller as `grid`.
+    State updates are applied to a StateView kept for the life of the process.
+    """
+    controller = importlib.import_module(controller_module_name)
+    shared_boards = {}
+    state_view = StateView()
+
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        request_id, board_state, player_state, opponent_state = message
+        try:
+            if is_state_update(board_state):
+                board_state, player_state, opponent_state = state_view.apply(board_state)
+
+            name = board_state.get("shared_board")
+            if name is not None:
+                if name not in shared_boards:
+                    shared_boards[name] = SharedBoardView(name)
+                board_state["grid"] = shared_boards[name].grid
+
+            direction = controller.get_next_move(board_state, player_state, opponent_state)
+            connection.send((request_id, direction, None))
+        except Exception:
+            connection.send((request_id, None, traceback.format_exc()))
+
+    for view in shared_boards.values():
+        view.close()
+
+class ControllerWorker:
+    """
+    Runs a player's controller in its own long-lived process.
+    Snapshots are sent over a pipe and moves are collected against a deadline, so a slow controller
+    never blocks the game loop or competes with the other controller for the GIL.
+    A worker that stays stuck on one request for CONTROLLER_RESTART_MS is killed and restarted.
+
+    The process is not daemonic, so a controller can start processes of its own (e.g. the MCTS controller's
+    search helpers). It still exits with the game: it stops when the pipe closes, and `stop` also runs at exit.
+    """
+    def __init__(self, controller_module_name):
+        self.controller_module_name = controller_module_name
+        self.process = None
+        self.connection = None
+        self.request_id = 0
+        self.pending_since = None
+        self.restarts = 0
+        self.start()
+        atexit.register(self.stop)
+
+    def start(self):
+        """
+        Starts the controller process.
+        """
+        parent_connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_loop, args=(child_connection, self.controller_module_name), daemon=False)
+        self.process.start()
+        child_connection.close()
+        self.connection = parent_connection
+        self.pending_since = None
+
+    def stop(self):
+        """
+        Asks the controller process to exit, killing it if it does not respond.
+        """
+        if self.process is None:
+            return
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=config.CONTROLLER_TIMEOUT_SECONDS)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+        self.process = None
+        atexit.unregister(self.stop)
+
+    def restart(self):
+        """
+        Kills the controller process and starts a fresh one.
+        """
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.connection.close()
+            self.process = None
+        self.restarts += 1
+        self.start()
+
+    def poll(self, request_id):
+        """
+        Returns (direction, error) if the given request has been answered, otherwise None.
+        Answers to older requests are discarded.
+        """
+        try:
+            while self.connection.poll():
+                answered_id, direction, error = self.connection.recv()
+                if answered_id == self.request_id:
+                    self.pending_since = None
+                if answered_id == request_id:
+                    return direction, error
+        except (EOFError, OSError):
+            self.restart()
+            return None, f"{self.controller_module_name} worker process exited"
+        return None
+
+    def request_move(self, board_state, player_state, opponent_state):
+        """
+        Sends a snapshot to the controller and returns the request id.
+        Returns None if the controller is still busy with an earlier request.
+        """
+        if self.pending_since is not None:
+            self.poll(None)
+        if self.pending_since is not None:
+            if time.perf_counter() - self.pending_since < config.CONTROLLER_RESTART_SECONDS:
+                return None
+            self.restart()
+
+        if not self.process.is_alive():
+            self.restart()
+
+        self.request_id += 1
+        self.connection.send((self.request_id, board_state, player_state, opponent_state))
+        self.pending_since = time.perf_counter()
+        return self.request_id
+
+class PendingMoves:
+    """
+    Moves requested from several workers under one shared deadline (a time.perf_counter value).
+    `poll` never blocks, so the caller can keep rendering while the controllers think.
+    `requests` is a list of (worker, request_id) pairs; `results` holds a (direction, error) pair per request,
+    (None, None) for requests that were not sent or not answered in time.
+    """
+    def __init__(self, requests, deadline):
+        self.requests = requests
+        self.deadline = deadline
+        self.results = [(None, None)] * len(requests)
+        # time.perf_counter value at which each request was answered, None until then
+        self.answered_at = [None] * len(requests)
+        self.waiting = {i: (worker, request_id) for i, (worker, request_id) in enumerate(requests) if request_id is not None}
+
+    def poll(self):
+        """
+        Collects any answers that have arrived. Returns True once every request is answered or the deadline has passed.
+        """
+        for i, (worker, request_id) in list(self.waiting.items()):
+            answer = worker.poll(request_id)
+            if answer is not None:
+                self.results[i] = answer
+                self.answered_at[i] = time.perf_counter()
+                del self.waiting[i]
+
+        return not self.waiting or time.perf_counter() >= self.deadline
+
+    def wait(self, until=None):
+        """
+        Blocks until every request is answered or the deadline passes, then returns the results.
+        With `until` (a time.perf_counter value) earlier than the deadline, gives up waiting at that time
+        and returns None if answers are still outstanding.
+        """
+        end = self.deadline if until is None else min(self.deadline, until)
+        while not self.poll():
+            now = time.perf_counter()
+            if until is not None and now >= until:
+                return None
+            wait([worker.connection for worker, _ in self.waiting.values()], timeout=max(0.0, end - now))
+        return self.results
+
+def collect_moves(requests, deadline):
+    """
+    Waits until every request is answered or the shared deadline (a time.perf_counter value) passes.
+    `requests` is a list of (worker, request_id) pairs; returns a list of (direction, error) pairs,
+    with (None, None) for requests that were not sent or not answered in time.
+    """
+    return PendingMoves(requests, deadline).wait()
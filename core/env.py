@@ -0,0 +1,104 @@
+import operator
+from core.match import Match, VALID_DIRECTIONS
+
+# Rewards per player: each food item eaten, and the outcome when the game ends
+FOOD_REWARD = 0.1
+WIN_REWARD = 1.0
+
+class SnakeEnv:
+    """
+    Gym-style environment around the game rules, for training and tuning controllers without the pygame loop.
+
+    `reset(seed)` starts a game and `step(action_p1, action_p2)` plays one move for both snakes, returning
+    (observation, rewards, done, info). Time is counted in ticks as in a Match, so nothing depends on the wall
+    clock; the pause before sudden death is skipped inside the step that reaches it.
+
+    A side given a controller module name is played by that controller, called in-process like in a Match
+    (without the timeout, which would depend on the wall clock); its action passed to `step` is ignored.
+    Sides without a controller must be given an action every step: a direction or an index into VALID_DIRECTIONS.
+    """
+    def __init__(self, player1_controller=None, player2_controller=None, max_ticks=None):
+        self.player1_controller = player1_controller
+        self.player2_controller = player2_controller
+        self.max_ticks = max_ticks
+        self.match = None
+        self.state = None
+
+    def reset(self, seed=None):
+        """
+        Starts a new game and returns its first observation.
+        The seed seeds the game's random generator, so the same seed and actions play the same game.
+        """
+        self.match = Match(self.player1_controller, self.player2_controller, max_ticks=self.max_ticks, enforce_timeout=False, seed=seed)
+        self.state = self.match.state
+        return self.observation()
+
+    def observation(self):
+        """
+        Returns the observation of the current position, shared by both players:
+        "cells" is a bytes copy of the occupancy grid (row-major, flags from core.occupancy) and the per-player
+        tuples are ordered player 1, player 2.
+        """
+        snake1, snake2 = self.match.player1.snake, self.match.player2.snake
+        return {
+            "rows": self.state.rows,
+            "cols": self.state.cols,
+            "cells": bytes(self.state.occupancy.cells),
+            "heads": (snake1.body[0], snake2.body[0]),
+            "directions": (snake1.direction, snake2.direction),
+            "lengths": (len(snake1.body), len(snake2.body)),
+            "scores": (self.match.player1.score, self.match.player2.score),
+            "tick": self.match.tick
+        }
+
+    def snapshot(self, player_id):
+        """
+        Returns the (board_state, player_state, opponent_state) arguments a controller playing the given player
+        would receive, to evaluate a controller's get_next_move directly.
+        """
+        player, opponent = (self.match.player1, self.match.player2) if player_id == 1 else (self.match.player2, self.match.player1)
+        return self.state.get_board_state(), self.state.get_player_state(player), self.state.get_player_state(opponent)
+
+    def _direction(self, action, player):
+        """
+        Returns the direction to play for a side: None for a controller side, otherwise the validated action.
+        Any integer type is accepted as an index, including NumPy integers from e.g. np.argmax.
+        """
+        if player.controller is not None:
+            return None
+        if isinstance(action, str):
+            if action in VALID_DIRECTIONS:
+                return action
+        else:
+            try:
+                index = operator.index(action)
+            except TypeError:
+                index = None
+            if index is not None and 0 <= index < len(VALID_DIRECTIONS):
+                return VALID_DIRECTIONS[index]
+        raise ValueError(f"Invalid action for player {player.id}: {action!r}")
+
+    def step(self, action_p1=None, action_p2=None):
+        """
+        Plays one move and returns (observation, (reward_p1, reward_p2), done, info).
+        info holds the winner's id (None for a draw or a game still running) and the tick.
+        Stepping a finished game changes nothing and returns zero rewards.
+        """
+        match = self.match
+        player1, player2 = match.player1, match.player2
+        p1_direction = self._direction(action_p1, player1)
+        p2_direction = self._direction(action_p2, player2)
+
+        was_over = self.state.game_over
+        scores = (player1.score, player2.score)
+        while not match.step(p1_direction, p2_direction) and not self.state.game_over:
+            pass
+
+        reward1 = FOOD_REWARD * (player1.score - scores[0])
+        reward2 = FOOD_REWARD * (player2.score - scores[1])
+        winner = self.state.winner.id if self.state.winner is not None else None
+        if self.state.game_over and not was_over and winner is not None:
+            reward1 += WIN_REWARD if winner == 1 else -WIN_REWARD
+            reward2 += WIN_REWARD if winner == 2 else -WIN_REWARD
+
+        return self.observation(), (reward1, reward2), self.state.game_over, {"winner": winner, "tick": match.tick}
@@ -0,0 +1,41 @@
+from collections import namedtuple
+
+# Event kinds
+WALL = "wall"
+SELF = "self"
+SNAKE = "snake"
+HEAD_ON = "head_on"
+OBSTACLE = "obstacle"
+FOOD = "food"
+BOARD_FULL = "board_full"
+FORFEIT = "forfeit"
+
+class GameEvent(namedtuple("GameEvent", ["time", "kind", "player", "other"])):
+    """
+    A diagnostic event recorded by GameState instead of printing on the hot path.
+    `time` is the game clock in milliseconds, `player` and `other` are player ids (or None).
+    """
+    __slots__ = ()
+
+    def describe(self, names):
+        """
+        Returns a human-readable message. `names` maps player ids to player names.
+        """
+        player = names.get(self.player)
+        if self.kind == WALL:
+            return f"{player} collided with a wall!"
+        if self.kind == SELF:
+            return f"{player} self-collided!"
+        if self.kind == SNAKE:
+            return f"{player} hit {names.get(self.other)}!"
+        if self.kind == HEAD_ON:
+            return "Head-on collision!"
+        if self.kind == OBSTACLE:
+            return f"{player} collided with an obstacle!"
+        if self.kind == FOOD:
+            return f"{player} ate food."
+        if self.kind == BOARD_FULL:
+            return "Warning: Could not spawn food. Board is full."
+        if self.kind == FORFEIT:
+            return f"{player} forfeited the match."
+        return f"{self.kind}: {player}"
@@ -0,0 +1,382 @@
+from collections import deque
+from core.occupancy import OBSTACLE
+from core import zobrist
+from core.game_state import SUDDEN_DEATH
+
+# Static cell kinds; the board is padded with one ring of wall cells
+OPEN = 0
+WALL = 1
+BLOCKED = 2
+
+_hash_tables = {}
+
+def _get_hash_tables(rows, cols):
+    """
+    Returns the Zobrist keys of a board size re-indexed by padded cell index:
+    (keys, key index of every padded cell, body keys per player, food keys).
+    Body and food keys are 0 on the wall ring, which the occupancy grid never records.
+    """
+    tables = _hash_tables.get((rows, cols))
+    if tables is None:
+        keys = zobrist.keys_for(rows, cols)
+        stride = cols + 2
+        key_index = [keys.cell_index(index // stride - 1, index % stride - 1) for index in range((rows + 2) * stride)]
+        off_board = rows * cols
+        body = [None] + [[keys.body[player][i] if i != off_board else 0 for i in key_index] for player in (1, 2)]
+        food = [keys.food[i] if i != off_board else 0 for i in key_index]
+        tables = _hash_tables[(rows, cols)] = (keys, key_index, body, food)
+    return tables
+
+class ForwardModel:
+    """
+    Compact copy of a game for lookahead search, with `step(move1, move2)` following the same rules as
+    GameState.apply_moves and resolve_collisions: both snakes move, then walls, self, snake, head-on and
+    obstacle collisions are checked, food is eaten (with the sudden death food rules) and the winner is set.
+
+    Cells are flat indices into a board padded by one ring of wall cells, so leaving the board is a lookup
+    like any other collision. Bodies are deques of indices (head first) with per-player segment counts in
+    bytearrays, and walls and obstacles live in one shared static bytearray.
+
+    Two ways to explore: `step` returns an undo record that `undo` reverts in place (make/unmake), and
+    `clone` copies the mutable parts only, which costs a few microseconds.
+
+    Food respawns are random in the real game. By default eaten food is not replaced, which keeps
+    searches deterministic; pass an `rng` (random.Random) to respawn food on a random free cell instead.
+    Players are numbered 1 and 2 as in the game; per-player lists are indexed by player id.
+
+    `get_hash` returns the same Zobrist hash as GameState.get_hash for the same position; its body and
+    food part is updated incrementally by every step, so transpositions can be looked up in O(1).
+    """
+    __slots__ = ("rows", "cols", "stride", "deltas", "static", "bodies", "counts", "directions", "scores",
+                 "food", "sudden_death", "sudden_death_food", "collided", "game_over", "winner", "rng",
+                 "hash", "hash_tables")
+
+    def __init__(self, rows, cols, obstacle_cells=(), rng=None):
+        self.rows = rows
+        self.cols = cols
+        self.stride = cols + 2
+        self.deltas = {"left": -1, "right": 1, "up": -self.stride, "down": self.stride}
+
+        static = bytearray([WALL]) * ((rows + 2) * self.stride)
+        for row in range(rows):
+            start = (row + 1) * self.stride + 1
+            static[start:start + cols] = bytes(cols)
+        for row, col in obstacle_cells:
+            static[self.index(row, col)] = BLOCKED
+        self.static = bytes(static)
+        self.hash_tables = _get_hash_tables(rows, cols)
+        self.hash = 0
+        self._hash_obstacles()
+
+        size = len(self.static)
+        self.bodies = [None, deque(), deque()]
+        self.counts = [None, bytearray(size), bytearray(size)]
+        self.directions = [None, "right", "left"]
+        self.scores = [None, 0, 0]
+        self.food = set()
+        self.sudden_death = False
+        self.sudden_death_food = None
+        self.collided = [None, False, False]
+        self.game_over = False
+        self.winner = None
+        self.rng = rng
+
+    def _hash_obstacles(self):
+        """
+        Recomputes the hash from the static board, dropping everything else; used while building a model.
+        """
+        keys, key_index = self.hash_tables[0], self.hash_tables[1]
+        self.hash = 0
+        for index, kind in enumerate(self.static):
+            if kind == BLOCKED:
+                self.hash ^= keys.obstacle[key_index[index]]
+
+    def get_hash(self):
+        """
+        Returns the Zobrist hash of the position.
+        """
+        keys, key_index = self.hash_tables[0], self.hash_tables[1]
+        position_hash = self.hash
+        for player in (1, 2):
+            body = self.bodies[player]
+            position_hash ^= (keys.head[player][key_index[body[0]]] ^ keys.tail[player][key_index[body[-1]]]
+                              ^ keys.direction[player][self.directions[player]] ^ keys.score(player, self.scores[player]))
+        if self.sudden_death:
+            position_hash ^= keys.sudden_death
+        return position_hash
+
+    def _set_food(self, cells):
+        """
+        Replaces the food with the given flat indices.
+        """
+        food_keys = self.hash_tables[3]
+        for index in self.food:
+            self.hash ^= food_keys[index]
+        self.food = set(cells)
+        for index in self.food:
+            self.hash ^= food_keys[index]
+
+    def index(self, row, col):
+        """
+        Returns the flat index of a board cell.
+        """
+        return (row + 1) * self.stride + col + 1
+
+    def cell(self, index):
+        """
+        Returns the (row, col) board cell of a flat index.
+        """
+        row, col = divmod(index, self.stride)
+        return row - 1, col - 1
+
+    def set_snake(self, player, cells, direction, score=0):
+        """
+        Places a player's snake; `cells` are (row, col) cells, head first.
+        """
+        counts = self.counts[player]
+        body_keys = self.hash_tables[2][player]
+        for index in self.bodies[player]:
+            counts[index] -= 1
+            self.hash ^= body_keys[index]
+        body = deque(self.index(row, col) for row, col in cells)
+        for index in body:
+            counts[index] += 1
+            self.hash ^= body_keys[index]
+        self.bodies[player] = body
+        self.directions[player] = direction
+        self.scores[player] = score
+
+    @classmethod
+    def from_game_state(cls, state, rng=None):
+        """
+        Builds a model of a GameState.
+        """
+        model = cls(state.rows, state.cols, rng=rng)
+        static = bytearray(model.static)
+        for position, flags in enumerate(state.occupancy.cells):
+            if flags & OBSTACLE:
+                static[model.index(*divmod(position, state.cols))] = BLOCKED
+        model.static = bytes(static)
+        model._hash_obstacles()
+
+        for player in (state.player1, state.player2):
+            model.set_snake(player.id, player.snake.body, player.snake.direction, player.score)
+            model.collided[player.id] = getattr(player, "collided", False)
+        model._set_food(model.index(row, col) for row, col in state.food_map)
+        model.sudden_death = state.sudden_death_active
+        if state.sudden_death_food is not None:
+            model.sudden_death_food = model.index(state.sudden_death_food.grid_row, state.sudden_death_food.grid_col)
+        model.game_over = state.game_over
+        model.winner = state.winner.id if state.winner is not None else None
+        return model
+
+    @classmethod
+    def from_snapshot(cls, board_state, player_state, opponent_state, rng=None):
+        """
+        Builds a model from the dictionaries a controller receives (with "body" and "obstacle_locations"),
+        including the sudden death phase and food item.
+        """
+        model = cls(board_state["rows"], board_state["cols"], board_state["obstacle_locations"], rng=rng)
+        for state in (player_state, opponent_state):
+            cells = [(segment["row"], segment["col"]) for segment in state["body"]]
+            model.set_snake(state["id"], cells, state["direction"], state["score"])
+        model._set_food(model.index(row, col) for row, col in board_state["food_locations"])
+        model.sudden_death = board_state["phase"] == SUDDEN_DEATH
+        if board_state["sudden_death_food"] is not None:
+            model.sudden_death_food = model.index(*board_state["sudden_death_food"])
+        return model
+
+    def clone(self):
+        """
+        Returns an independent copy; the static board is shared.
+        """
+        other = ForwardModel.__new__(ForwardModel)
+        other.rows = self.rows
+        other.cols = self.cols
+        other.stride = self.stride
+        other.deltas = self.deltas
+        other.static = self.static
+        other.bodies = [None, self.bodies[1].copy(), self.bodies[2].copy()]
+        other.counts = [None, self.counts[1][:], self.counts[2][:]]
+        other.directions = self.directions[:]
+        other.scores = self.scores[:]
+        other.food = self.food.copy()
+        other.sudden_death = self.sudden_death
+        other.sudden_death_food = self.sudden_death_food
+        other.collided = self.collided[:]
+        other.game_over = self.game_over
+        other.winner = self.winner
+        other.rng = self.rng
+        other.hash = self.hash
+        other.hash_tables = self.hash_tables
+        return other
+
+    def head(self, player):
+        """
+        Returns the player's head as a (row, col) cell.
+        """
+        return self.cell(self.bodies[player][0])
+
+    def is_free(self, index):
+        """
+        Returns True if nothing occupies the cell at a flat index (food does not count).
+        """
+        return self.static[index] == OPEN and not self.counts[1][index] and not self.counts[2][index]
+
+    def _spawn_food(self, undo):
+        """
+        Adds a food item on a random free cell if the model has an rng. Returns False if the board is full.
+        """
+        if self.rng is None:
+            return True
+        free = [index for index in range(len(self.static)) if self.is_free(index) and index not in self.food]
+        if not free:
+            return False
+        index = free[self.rng.randrange(len(free))]
+        self.food.add(index)
+        self.hash ^= self.hash_tables[3][index]
+        undo["food_added"].append(index)
+        return True
+
+    def _remove_food(self, index, undo):
+        self.food.discard(index)
+        self.hash ^= self.hash_tables[3][index]
+        undo["food_removed"].append(index)
+
+    def _grow(self, player, tail, undo):
+        self.bodies[player].append(tail)
+        self.counts[player][tail] += 1
+        self.hash ^= self.hash_tables[2][player][tail]
+        self.scores[player] += 1
+        undo["grown"][player] = True
+
+    def _eat(self, index, p1_eats, p2_eats, undo):
+        """
+        Applies one food item being eaten, as GameState._eat_food.
+        """
+        tails = undo["tails"]
+        if self.sudden_death and index == self.sudden_death_food:
+            if p1_eats and p2_eats:
+                # Replaced by a new sudden death food
+                for food in list(self.food):
+                    self._remove_food(food, undo)
+                self.sudden_death_food = None
+                if not self._spawn_food(undo):
+                    self.winner = None
+                    self.game_over = True
+                elif undo["food_added"]:
+                    self.sudden_death_food = undo["food_added"][-1]
+            else:
+                player = 1 if p1_eats else 2
+                self.winner = player
+                self._grow(player, tails[player], undo)
+                self.game_over = True
+        else:
+            if p1_eats:
+                self._grow(1, tails[1], undo)
+            if p2_eats:
+                self._grow(2, tails[2], undo)
+            self._remove_food(index, undo)
+            if not self.sudden_death and not self._spawn_food(undo):
+                self.winner = None
+                self.game_over = True
+
+    def step(self, move1, move2):
+        """
+        Moves both snakes and resolves the tick. Returns an undo record for `undo`, or None if the game is over.
+        """
+        if self.game_over:
+            return None
+
+        bodies, counts, static = self.bodies, self.counts, self.static
+        undo = {
+            "directions": self.directions[:],
+            "scores": self.scores[:],
+            "collided": self.collided[:],
+            "sudden_death_food": self.sudden_death_food,
+            "hash": self.hash,
+            "tails": [None, None, None],
+            "grown": [None, False, False],
+            "food_removed": [],
+            "food_added": []
+        }
+
+        self.directions[1] = move1
+        self.directions[2] = move2
+        body_keys = self.hash_tables[2]
+        for player, move in ((1, move1), (2, move2)):
+            body = bodies[player]
+            player_counts = counts[player]
+            tail = body.pop()
+            player_counts[tail] -= 1
+            head = body[0] + self.deltas[move] if body else tail + self.deltas[move]
+            body.appendleft(head)
+            player_counts[head] += 1
+            self.hash ^= body_keys[player][tail] ^ body_keys[player][head]
+            undo["tails"][player] = tail
+
+        head1 = bodies[1][0]
+        head2 = bodies[2][0]
+        counts1, counts2 = counts[1], counts[2]
+
+        # Same checks as resolve_collisions: wall, self, other snake, head-on, obstacle
+        p1_collided = static[head1] == WALL or counts1[head1] > 1 or counts2[head1] > 0 or head1 == head2 or static[head1] == BLOCKED
+        p2_collided = static[head2] == WALL or counts2[head2] > 1 or counts1[head2] > 0 or head1 == head2 or static[head2] == BLOCKED
+
+        p1_food = head1 if not p1_collided and head1 in self.food else None
+        p2_food = head2 if not p2_collided and head2 in self.food else None
+        if p1_food is not None and p1_food == p2_food:
+            self._eat(p1_food, True, True, undo)
+        else:
+            if p1_food is not None:
+                self._eat(p1_food, True, False, undo)
+            if p2_food is not None:
+                self._eat(p2_food, False, True, undo)
+
+        self.collided[1] = p1_collided
+        self.collided[2] = p2_collided
+
+        if not self.game_over:
+            if p1_collided and p2_collided:
+                scores = self.scores
+                self.winner = 1 if scores[1] > scores[2] else 2 if scores[2] > scores[1] else None
+                self.game_over = True
+            elif p1_collided:
+                self.winner = 2
+                self.game_over = True
+            elif p2_collided:
+                self.winner = 1
+                self.game_over = True
+
+        return undo
+
+    def undo(self, undo):
+        """
+        Reverts the step that returned the undo record. Steps must be undone in reverse order.
+        """
+        if undo is None:
+            return
+
+        for index in undo["food_added"]:
+            self.food.discard(index)
+        self.food.update(undo["food_removed"])
+
+        for player in (1, 2):
+            body = self.bodies[player]
+            player_counts = self.counts[player]
+            tail = undo["tails"][player]
+            if undo["grown"][player]:
+                body.pop()
+                player_counts[tail] -= 1
+            head = body.popleft()
+            player_counts[head] -= 1
+            body.append(tail)
+            player_counts[tail] += 1
+
+        self.directions = undo["directions"]
+        self.scores = undo["scores"]
+        self.collided = undo["collided"]
+        self.sudden_death_food = undo["sudden_death_food"]
+        self.hash = undo["hash"]
+        self.game_over = False
+        self.winner = None
@@ -1,6 +1,7 @@
 from config import config
 import pygame
 import config.colors as colors
+from core import resources
 
 class GameOverScreen:
     """
@@ -26,22 +27,16 @@ class GameOverScreen:
             game_over_color = winner.snake.border_color
         
         # Define Text
-        title_font = pygame.font.SysFont(None, 40)
-        game_over_title_surface = title_font.render("GAME OVER", True, "white")
-        
-        winner_font = pygame.font.SysFont(None, 32)
-        game_over_winner_surface = winner_font.render(f"Winner: {winner_name}", True, game_over_color)
-        
-        restart_font = pygame.font.SysFont(None, 28)
-        restart_surface = restart_font.render("Restart", True, (53, 53, 53))
+        game_over_title_surface = resources.cache.text("GAME OVER", 40, "white")
+        game_over_winner_surface = resources.cache.text(f"Winner: {winner_name}", 32, game_over_color)
+        restart_surface = resources.cache.text("Restart", 28, (53, 53, 53))
     
         # Select Colors
         self.surface.fill(colors.border_color)
         self.border.fill(game_over_color)
         
         # Draw Crown
-        crown = pygame.image.load("assets/crown.png")
-        crown = pygame.transform.scale(crown, (200, 200))
+        crown = resources.cache.image(resources.CROWN_IMAGE, (200, 200))
         self.surface.blit(crown, (self.width/2 - 100, 60))
         
         # Restart Button        
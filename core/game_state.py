@@ -1,15 +1,34 @@
-import pygame
+import random
+from itertools import chain
 from config import config
-from core.player import Player
+from core import clock as game_clock
 from core.food import Food
-from core.obstacle import Obstacle
+from core.obstacle import Obstacle, ORIENTATIONS, MIN_LENGTH, MAX_LENGTH, get_positions
+from core.occupancy import OccupancyGrid, FOOD, OBSTACLE
+from core.bitboard import Bitboard, board_masks
+from core import events
+from core.events import GameEvent
+from core.shared_board import uses_shared_board
+from core.snake import DIRECTION_CODES
+from core.state_delta import DeltaTracker, uses_state_deltas
+
+# Random anchors tried before an obstacle placement falls back to enumerating every legal one
+MAX_PLACEMENT_ATTEMPTS = 32
+
+# Game phases, as reported in board_state["phase"]
+NORMAL = "normal"
+PRE_SUDDEN_DEATH = "pre_sudden_death"
+SUDDEN_DEATH = "sudden_death"
 
 class GameState:
     """
     Represents the current state of the game, including the board, players, food, and obstacles.
     Handles collision detection and core game logic.
+    Never renders anything; time is read from `clock`, a callable returning milliseconds.
+    Every random choice comes from one generator seeded with `seed` (a 64-bit unsigned integer, drawn from
+    the `random` module if not given), so the seed and the moves reproduce a game; see core.replay.
     """
-    def __init__(self, board, player1, player2):
+    def __init__(self, board, player1, player2, clock=None, seed=None):
         # Board Attributes
         self.board = board
         self.rows = board.rows
@@ -17,16 +36,39 @@ class GameState:
         
         # Occupied Spaces
         self.food_locations = []
+        self.food_map = {}
         self.obstacle_locations = []
         
         # Players
         self.player1 = player1 
         self.player2 = player2 
+
+        # Occupancy Grid, updated incrementally by the snakes and by food/obstacle placement
+        self.occupancy = OccupancyGrid(self.rows, self.cols)
+        self.occupancy.attach_snake(player1.snake, player1.id)
+        self.occupancy.attach_snake(player2.snake, player2.id)
+        # Bit layout for whole-board set operations; see get_bitboards
+        self.bitboard = Bitboard(self.rows, self.cols)
         self.winner = None
+        # Player who forfeited the game, see forfeit
+        self.forfeited = None
         
         # Game State Flags
         self.game_over = False
         self.time_up = False 
+        self.clock = clock if clock is not None else game_clock.get_ticks
+
+        # Diagnostics collected instead of printed; see drain_events
+        self.events = []
+
+        # Source of all randomness in the game, and the moves played, one byte per tick: player 1's
+        # direction code in bits 2-3 and player 2's in bits 0-1
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.move_log = bytearray()
+
+        # What each delta controller has been sent, by player id; see get_snapshots
+        self.delta_trackers = {}
         
         # Sudden Death Attributes
         self.pre_sudden_death_active = False
@@ -40,176 +82,341 @@ class GameState:
             
         # Spawn Initial Obstacles
         for _ in range(config.NUM_OBSTACLES):
-            while True:
-                new_obstacle = Obstacle()
-                obstacle_positions = new_obstacle.get_occupied_positions()
-
-                # Avoid placing on occupied positions
-                occupied_positions = self._get_all_occupied_grid_positions(include_future_heads=False)
-                if not any(pos in occupied_positions for pos in obstacle_positions):
-                    self.obstacle_locations.append(new_obstacle)
-                    break
+            self._place_obstacle()
 
     def _get_all_occupied_grid_positions(self, include_future_heads=True):
         """
         Returns all occupied grid positions as a set of (row, col) tuples.
-        If include_future_heads is True, current snake heads are included.
+        If include_future_heads is True, current snake heads are included even when they are off the board.
+        Prefer self.occupancy.is_occupied for single-cell checks; this builds a new set.
         """
-        occupied_positions = set()
+        occupied_positions = self.occupancy.occupied_positions()
 
         # Include future snake heads
         if include_future_heads:
             occupied_positions.add((self.player1.snake.head_position["row"], self.player1.snake.head_position["col"]))
             occupied_positions.add((self.player2.snake.head_position["row"], self.player2.snake.head_position["col"]))
-        
-        # Snake bodies
-        for segment in self.player1.snake.body:
-            occupied_positions.add((segment.position["row"], segment.position["col"]))
-        for segment in self.player2.snake.body:
-            occupied_positions.add((segment.position["row"], segment.position["col"]))
-        
-        # Food locations
-        for food in self.food_locations:
-            occupied_positions.add((food.grid_row, food.grid_col))
-        
-        # Obstacles
-        for obs in self.obstacle_locations:
-            occupied_positions.update(obs.get_occupied_positions())
             
         return occupied_positions
-                            
+
+    def _is_legal_placement(self, positions):
+        """
+        Returns True if every position is on the board and unoccupied.
+        """
+        return all(self.occupancy.is_free(row, col) for row, col in positions)
+
+    def _place_obstacle(self):
+        """
+        Places one obstacle of random orientation and length on a uniformly chosen legal placement.
+        Anchors are drawn from the free-cell index; since every legal placement has exactly one free
+        top-left anchor, accepting only legal draws keeps the choice uniform.
+        Returns False if no legal placement exists.
+        """
+        orientation = self.rng.choice(ORIENTATIONS)
+        length = self.rng.randint(MIN_LENGTH, MAX_LENGTH)
+
+        for _ in range(MAX_PLACEMENT_ATTEMPTS):
+            anchor = self.occupancy.random_free_cell(self.rng)
+            if anchor is None:
+                return False
+            positions = get_positions(anchor[0], anchor[1], orientation, length)
+            if self._is_legal_placement(positions):
+                break
+        else:
+            # Crowded board: enumerate the legal placements instead of retrying without bound
+            anchors = sorted(divmod(index, self.cols) for index in self.occupancy.free_cells)
+            legal = [anchor for anchor in anchors if self._is_legal_placement(get_positions(anchor[0], anchor[1], orientation, length))]
+            if not legal:
+                return False
+            anchor = self.rng.choice(legal)
+            positions = get_positions(anchor[0], anchor[1], orientation, length)
+
+        self.obstacle_locations.append(Obstacle(anchor[0], anchor[1], orientation, length))
+        for row, col in positions:
+            self.occupancy.add(OBSTACLE, row, col)
+        return True
+
+    def _add_food(self, food):
+        """
+        Adds a food item to the board and the occupancy grid.
+        """
+        self.food_locations.append(food)
+        self.food_map[(food.grid_row, food.grid_col)] = food
+        self.occupancy.add(FOOD, food.grid_row, food.grid_col)
+
+    def _remove_food(self, food):
+        """
+        Removes a food item from the board and the occupancy grid.
+        """
+        if food in self.food_locations:
+            self.food_locations.remove(food)
+            del self.food_map[(food.grid_row, food.grid_col)]
+            self.occupancy.remove(FOOD, food.grid_row, food.grid_col)
+
+    def _clear_food(self):
+        """
+        Removes every food item from the board and the occupancy grid.
+        """
+        for food in self.food_locations:
+            self.occupancy.remove(FOOD, food.grid_row, food.grid_col)
+        self.food_locations.clear()
+        self.food_map.clear()
+
     def _spawn_food(self, is_sudden_death_food=False):
         """
         Spawns a single food item in a valid, unoccupied location.
         If is_sudden_death_food is True, replaces all existing food with one sudden death item.
         """
         if is_sudden_death_food:
-            self.food_locations.clear()
+            self._clear_food()
             self.sudden_death_food = None
             
-        spawned = False
-        attempts = 0
-        max_attempts = self.rows * self.cols * 2
-
-        while not spawned and attempts < max_attempts:
-            new_food = Food()
-            food_position_grid = (new_food.grid_row, new_food.grid_col)
-            occupied_positions = self._get_all_occupied_grid_positions(include_future_heads=True)
-            
-            if food_position_grid in occupied_positions:
-                attempts += 1
-                continue
-            
-            if is_sudden_death_food:
-                self.sudden_death_food = new_food
-                self.food_locations.append(new_food)
-            else:
-                self.food_locations.append(new_food)
-            spawned = True
-        
-        if not spawned:
-            print("Warning: Could not spawn food. Board might be full.")
+        position = self.occupancy.random_free_cell(self.rng)
+
+        if position is None:
+            self._record(events.BOARD_FULL)
             self.winner = None
             self.game_over = True
+            return
+
+        new_food = Food(position[0], position[1])
+        if is_sudden_death_food:
+            self.sudden_death_food = new_food
+        self._add_food(new_food)
+
+    def get_phase(self):
+        """
+        Returns the game phase: NORMAL, PRE_SUDDEN_DEATH or SUDDEN_DEATH.
+        """
+        if self.sudden_death_active:
+            return SUDDEN_DEATH
+        if self.pre_sudden_death_active:
+            return PRE_SUDDEN_DEATH
+        return NORMAL
+
+    def get_sudden_death_food_cell(self):
+        """
+        Returns the (row, col) cell of the sudden death food item, or None if there is none.
+        """
+        if self.sudden_death_food is None:
+            return None
+        return (self.sudden_death_food.grid_row, self.sudden_death_food.grid_col)
+
+    def get_board_state(self):
+        """
+        Returns a dictionary snapshot of the board for the controllers.
+        """
+        return {
+            "width": self.board.width,
+            "height": self.board.height,
+            "rows": self.rows,
+            "cols": self.cols,
+            "food_locations": [(food.grid_row, food.grid_col) for food in self.food_locations],
+            "obstacle_locations": list(chain.from_iterable(obs.get_occupied_positions() for obs in self.obstacle_locations)),
+            "phase": self.get_phase(),
+            "sudden_death_food": self.get_sudden_death_food_cell(),
+            "zobrist_hash": self.get_hash()
+        }
+
+    def get_player_state(self, player, include_body=True):
+        """
+        Returns a dictionary snapshot of the given player's state.
+        Controllers reading the shared board grid do not need the body list, so it can be left out.
+        """
+        player_state = {
+            "id": player.id,
+            "head_position": player.snake.head_position.copy(),
+            "direction": player.snake.direction,
+            "score": player.score,
+            "length": len(player.snake.body)
+        }
+        if include_body:
+            player_state["body"] = [{"row": row, "col": col} for row, col in player.snake.body]
+        return player_state
+
+    def get_snapshots(self, shared_board=None, in_process=True, tick=0):
+        """
+        Returns the (board_state, player_state, opponent_state) controller arguments for player 1 and player 2.
+        Controllers that opted in to the shared board get a lean snapshot: the published grid instead of
+        the obstacle and body lists, which are only built for controllers that still need them.
+        Controllers that opted in to state deltas get a (state update, None, None) triple instead.
+        """
+        shared_players = [player for player in (self.player1, self.player2) if shared_board is not None and uses_shared_board(player.controller)]
+        if shared_players:
+            shared_board.publish(self, tick)
+
+        full_board_state = None
+        snapshots = []
+        for player, opponent in ((self.player1, self.player2), (self.player2, self.player1)):
+            if player in shared_players:
+                snapshots.append((shared_board.get_board_state(self, in_process), self.get_player_state(player, include_body=False), self.get_player_state(opponent, include_body=False)))
+            elif uses_state_deltas(player.controller):
+                tracker = self.delta_trackers.setdefault(player.id, DeltaTracker())
+                snapshots.append((tracker.build(self, player, opponent, tick), None, None))
+            else:
+                if full_board_state is None:
+                    full_board_state = self.get_board_state()
+                snapshots.append((full_board_state, self.get_player_state(player), self.get_player_state(opponent)))
+        return snapshots
+
+    def get_hash(self):
+        """
+        Returns the 64-bit Zobrist hash of the position: bodies, heads, tails, directions, food, obstacles,
+        scores and sudden death. The body and food part is kept up to date by the occupancy grid, so this is O(1).
+        """
+        keys = self.occupancy.keys
+        position_hash = self.occupancy.hash
+        for player in (self.player1, self.player2):
+            snake = player.snake
+            position_hash ^= keys.snake_key(player.id, snake.body[0], snake.body[-1], snake.direction, player.score)
+        if self.sudden_death_active:
+            position_hash ^= keys.sudden_death
+        return position_hash
+
+    def get_bitboards(self):
+        """
+        Returns the food, obstacle, body, occupied and free cells as bitboard masks (see core.bitboard).
+        """
+        return board_masks(self)
+
+    def resync_controller(self, player):
+        """
+        Makes the next state update for the player's controller a full one,
+        e.g. after an update was not delivered or the controller's view went out of sync.
+        """
+        tracker = self.delta_trackers.get(player.id)
+        if tracker is not None:
+            tracker.reset()
+
+    def apply_moves(self, p1_direction, p2_direction):
+        """
+        Applies both players' directions, moves both snakes one grid unit and resolves the outcome.
+        """
+        self.move_log.append(DIRECTION_CODES[p1_direction] << 2 | DIRECTION_CODES[p2_direction])
+        self.player1.snake.direction = p1_direction
+        self.player2.snake.direction = p2_direction
+        self.player1.snake.move()
+        self.player2.snake.move()
+
+        # Handle collisions, food, growth, deaths, etc.
+        self.resolve_collisions()
+
+    def _record(self, kind, player=None, other=None):
+        """
+        Records a diagnostic event.
+        """
+        self.events.append(GameEvent(self.clock(), kind, player, other))
+
+    def drain_events(self):
+        """
+        Returns the events recorded since the last call and clears them.
+        """
+        drained = self.events
+        self.events = []
+        return drained
+
+    def _eat_food(self, food_item, p1_eats, p2_eats):
+        """
+        Applies the effect of one food item being eaten by one or both players.
+        """
+        if p1_eats:
+            self._record(events.FOOD, self.player1.id)
+        if p2_eats:
+            self._record(events.FOOD, self.player2.id)
+
+        if self.sudden_death_active and food_item == self.sudden_death_food:
+            if p1_eats and p2_eats:
+                self._remove_food(food_item)
+                self._spawn_food(is_sudden_death_food=True)
+            elif p1_eats:
+                self.winner = self.player1
+                self.player1.snake.grow()
+                self.player1.score += 1
+                self.game_over = True
+            elif p2_eats:
+                self.winner = self.player2
+                self.player2.snake.grow()
+                self.player2.score += 1
+                self.game_over = True
+        else:
+            if p1_eats:
+                self.player1.snake.grow()
+                self.player1.score += 1
+            if p2_eats:
+                self.player2.snake.grow()
+                self.player2.score += 1
+            self._remove_food(food_item)
+            if not self.sudden_death_active:
+                self._spawn_food()
 
     def resolve_collisions(self):
         """
         Resolves all collisions in the game simultaneously and updates the game state accordingly.
-        All grid positions are handled as (row, col).
+        All grid positions are handled as (row, col). Every check is a cell lookup in the occupancy grid,
+        the snakes' cell counts or the food map, so the cost does not grow with snake length,
+        obstacle count or food count.
         """
-        p1_head_grid = (self.player1.snake.head_position["row"], self.player1.snake.head_position["col"])
-        p2_head_grid = (self.player2.snake.head_position["row"], self.player2.snake.head_position["col"])
+        snake1 = self.player1.snake
+        snake2 = self.player2.snake
+        p1_head_grid = snake1.body[0]
+        p2_head_grid = snake2.body[0]
         
         p1_collided = False
         p2_collided = False
         
         # Wall collisions
-        if not (0 <= p1_head_grid[0] < self.rows and 0 <= p1_head_grid[1] < self.cols):
+        if not self.occupancy.in_bounds(*p1_head_grid):
             p1_collided = True
-            print(self.player1.name, "collided with a wall!")
+            self._record(events.WALL, self.player1.id)
             
-        if not (0 <= p2_head_grid[0] < self.rows and 0 <= p2_head_grid[1] < self.cols):
+        if not self.occupancy.in_bounds(*p2_head_grid):
             p2_collided = True
-            print(self.player2.name, "collided with a wall!")
-            
+            self._record(events.WALL, self.player2.id)
 
         # Self-collisions
-        for i in range(1, len(self.player1.snake.body)):
-            segment = self.player1.snake.body[i]
-            if p1_head_grid == (segment.position["row"], segment.position["col"]):
-                p1_collided = True
-                print(self.player1.name, "self-collided!")
-                break
+        if snake1.head_in_body():
+            p1_collided = True
+            self._record(events.SELF, self.player1.id)
             
-        for i in range(1, len(self.player2.snake.body)):
-            segment = self.player2.snake.body[i]
-            if p2_head_grid == (segment.position["row"], segment.position["col"]):
-                p2_collided = True
-                print(self.player2.name, "self-collided!")
-                break
+        if snake2.head_in_body():
+            p2_collided = True
+            self._record(events.SELF, self.player2.id)
 
         # Player-to-player collisions
-        for segment in self.player2.snake.body:
-            if p1_head_grid == (segment.position["row"], segment.position["col"]):
-                p1_collided = True
-                print(self.player1.name, "hit", self.player2.name + "!")
-                break
-        for segment in self.player1.snake.body:
-            if p2_head_grid == (segment.position["row"], segment.position["col"]):
-                p2_collided = True
-                print(self.player2.name, "hit", self.player1.name + "!")
-                break
+        if snake2.occupies(p1_head_grid):
+            p1_collided = True
+            self._record(events.SNAKE, self.player1.id, self.player2.id)
+        if snake1.occupies(p2_head_grid):
+            p2_collided = True
+            self._record(events.SNAKE, self.player2.id, self.player1.id)
 
         # Head on collision
         if p1_head_grid == p2_head_grid:
             p1_collided = True
             p2_collided = True
-            print("Head-on collision!")
+            self._record(events.HEAD_ON, self.player1.id, self.player2.id)
             
-        # Obstacle collisions
-        for obstacle in self.obstacle_locations:
-            if p1_head_grid in obstacle.get_occupied_positions():
-                p1_collided = True
-                print(self.player1.name, "collided with an obstacle!")
+        # Obstacle collisions (obstacle cells are static, so the grid flag is authoritative)
+        if self.occupancy.get(*p1_head_grid) & OBSTACLE:
+            p1_collided = True
+            self._record(events.OBSTACLE, self.player1.id)
 
-            if p2_head_grid in obstacle.get_occupied_positions():
-                p2_collided = True
-                print(self.player2.name, "collided with an obstacle!")
+        if self.occupancy.get(*p2_head_grid) & OBSTACLE:
+            p2_collided = True
+            self._record(events.OBSTACLE, self.player2.id)
 
         # Food collisions
-        for food_item in list(self.food_locations): 
-            food_pos_grid = (food_item.grid_row, food_item.grid_col)
-            
-            p1_eats = food_pos_grid == p1_head_grid and not p1_collided
-            p2_eats = food_pos_grid == p2_head_grid and not p2_collided
-            
-            if p1_eats or p2_eats:
-                if self.sudden_death_active and food_item == self.sudden_death_food:
-                    if p1_eats and p2_eats:
-                        if food_item in self.food_locations:
-                            self.food_locations.remove(food_item)
-                        self._spawn_food(is_sudden_death_food=True)
-                    elif p1_eats:
-                        self.winner = self.player1
-                        self.player1.snake.grow()
-                        self.player1.score += 1
-                        self.game_over = True
-                    elif p2_eats:
-                        self.winner = self.player2
-                        self.player2.snake.grow()
-                        self.player2.score += 1
-                        self.game_over = True
-                else:
-                    if p1_eats:
-                        self.player1.snake.grow()
-                        self.player1.score += 1
-                    if p2_eats:
-                        self.player2.snake.grow()
-                        self.player2.score += 1
-                    if food_item in self.food_locations:
-                        self.food_locations.remove(food_item)
-                    if not self.sudden_death_active:
-                        self._spawn_food()
+        p1_food = None if p1_collided else self.food_map.get(p1_head_grid)
+        p2_food = None if p2_collided else self.food_map.get(p2_head_grid)
+
+        if p1_food is not None and p1_food is p2_food:
+            self._eat_food(p1_food, True, True)
+        else:
+            eaten = [(food_item, food_item is p1_food, food_item is p2_food) for food_item in (p1_food, p2_food) if food_item is not None]
+            # Same order as the food list, so spawns happen in the same order as before
+            eaten.sort(key=lambda item: self.food_locations.index(item[0]))
+            for food_item, p1_eats, p2_eats in eaten:
+                self._eat_food(food_item, p1_eats, p2_eats)
 
         # Update player status
         self.player1.collided = p1_collided
@@ -232,6 +439,26 @@ class GameState:
                 self.winner = self.player1
                 self.game_over = True
 
+    def update_phase(self, elapsed_game_time):
+        """
+        Advances the time-based phases of the game: time-up, the pre-sudden death message and sudden death.
+        Returns True if the snakes are allowed to move this tick.
+        """
+        # Activate pre-sudden-death if time limit reached
+        if not self.sudden_death_active and not self.pre_sudden_death_active and elapsed_game_time >= config.GAME_DURATION:
+            if self.player1.score == self.player2.score:
+                self.start_pre_sudden_death()
+            else:
+                self.calculate_winner(self.player1, self.player2)
+
+        # Transition to sudden death after pre-message delay
+        if self.pre_sudden_death_active:
+            if self.clock() - self.pre_sudden_death_start_time >= config.PRE_SUDDEN_DEATH_MESSAGE_DURATION:
+                self.start_sudden_death()
+            return False
+
+        return not self.game_over
+
     def start_pre_sudden_death(self):
         """
         Activates the pre-sudden death phase if not already active.
@@ -240,7 +467,7 @@ class GameState:
             return
 
         self.pre_sudden_death_active = True
-        self.pre_sudden_death_start_time = pygame.time.get_ticks()
+        self.pre_sudden_death_start_time = self.clock()
             
     def start_sudden_death(self):
         """
@@ -251,8 +478,8 @@ class GameState:
 
         self.sudden_death_active = True
         self.pre_sudden_death_active = False
-        self.sudden_death_start_time = pygame.time.get_ticks()
-        self.food_locations.clear()
+        self.sudden_death_start_time = self.clock()
+        self._clear_food()
         self._spawn_food(is_sudden_death_food=True)
                             
     def calculate_winner(self, player1, player2):
@@ -293,4 +520,15 @@ class GameState:
             elif player1.score > player2.score:
                 self.winner = player1
             else:
-                self.winner = player2
\ No newline at end of file
+                self.winner = player2
+
+    def forfeit(self, player):
+        """
+        Ends the game with the other player as the winner, e.g. when the player's controller ran over a time limit.
+        """
+        if self.game_over:
+            return
+        self._record(events.FORFEIT, player.id)
+        self.forfeited = player
+        self.winner = self.player2 if player is self.player1 else self.player1
+        self.game_over = True
\ No newline at end of file
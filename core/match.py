@@ -0,0 +1,208 @@
+import time
+import traceback
+from config import config
+from core.board import Board
+from core.player import Player
+from core.game_state import GameState
+from core import events
+from core import replay
+from core.controller_worker import ControllerWorker, PendingMoves
+from core.shared_board import SharedBoard
+from core.state_delta import StateView, is_state_update
+
+VALID_DIRECTIONS = ("left", "right", "up", "down")
+
+def is_logged_error(count):
+    """
+    Returns True if a controller's count-th error should be printed: the 1st, 10th, 100th and so on,
+    so a controller failing on every tick does not flood the output.
+    """
+    while count % 10 == 0:
+        count //= 10
+    return count == 1
+
+class Match:
+    """
+    Plays a single game between two controllers without pygame, a display or wall-clock pacing.
+    Game time is derived from the tick counter, so a full 5 minute game runs as fast as the controllers allow.
+    With `enforce_timeout` off, slow controllers are not overruled, so a match does not depend on the wall clock.
+    `seed` seeds the game's random generator; see get_replay.
+
+    Controllers are called in-process unless `isolated` is set; then each runs in a ControllerWorker as in the GUI,
+    so a move is abandoned at the deadline and a controller stuck for CONTROLLER_RESTART_MS is restarted.
+    Call `close` to stop the workers. With a `time_limit` (seconds of wall-clock time), a match still running
+    after it is forfeited by the player whose controller used more time.
+    """
+    def __init__(self, player1_controller, player2_controller, max_ticks=None, enforce_timeout=True, seed=None,
+                 isolated=False, time_limit=None):
+        self.board = Board(config.BOARD_WIDTH, config.BOARD_HEIGHT)
+        self.player1 = Player(1, self.board, player1_controller)
+        self.player2 = Player(2, self.board, player2_controller)
+        self.tick = 0
+        self.max_ticks = max_ticks
+        self.enforce_timeout = enforce_timeout
+        self.events = []
+        # Errors raised by each player's controller, and seconds spent waiting for its moves
+        self.controller_errors = {self.player1.id: 0, self.player2.id: 0}
+        self.controller_time = {self.player1.id: 0.0, self.player2.id: 0.0}
+        self.state = GameState(self.board, self.player1, self.player2, clock=self.get_game_time, seed=seed)
+        if isolated:
+            self.workers = {player.id: ControllerWorker(controller) for player, controller in ((self.player1, player1_controller), (self.player2, player2_controller))}
+            self.shared_board = SharedBoard(self.board.rows, self.board.cols)
+        else:
+            self.workers = None
+            # In-process controllers read the board straight from a local buffer
+            self.shared_board = SharedBoard(self.board.rows, self.board.cols, shared=False)
+        self.time_limit = time_limit
+        self.start_time = time.perf_counter()
+        # Mirrors of the game for controllers that opted in to state deltas
+        self.state_views = {self.player1.id: StateView(), self.player2.id: StateView()}
+
+    def get_game_time(self):
+        """
+        Returns the simulated game time in milliseconds.
+        """
+        return self.tick * config.AI_UPDATE_INTERVAL_MS
+
+    def report_error(self, player, error, details):
+        """
+        Counts an error of the player's controller and prints it: the first one with its traceback (`details`),
+        repeats only now and then (see is_logged_error).
+        """
+        self.controller_errors[player.id] += 1
+        count = self.controller_errors[player.id]
+        if count == 1:
+            print(f"Error in {player.name}'s controller: {error}\n{details}")
+        elif is_logged_error(count):
+            print(f"Error in {player.name}'s controller: {error} ({count} errors so far)")
+
+    def get_move(self, player, board_state, player_state, opponent_state):
+        """
+        Calls the player's controller and returns its direction.
+        Falls back to the current direction if the controller fails, returns an invalid value or exceeds the timeout.
+        State updates are applied to the player's StateView first; a failure resyncs it with a full update.
+        """
+        start = time.perf_counter()
+        try:
+            if is_state_update(board_state):
+                board_state, player_state, opponent_state = self.state_views[player.id].apply(board_state)
+            direction = player.controller.get_next_move(board_state, player_state, opponent_state)
+        except Exception as e:
+            self.controller_time[player.id] += time.perf_counter() - start
+            self.report_error(player, e, traceback.format_exc())
+            self.state.resync_controller(player)
+            return player.snake.direction
+
+        elapsed = time.perf_counter() - start
+        self.controller_time[player.id] += elapsed
+        if self.enforce_timeout and elapsed > config.CONTROLLER_TIMEOUT_SECONDS:
+            return player.snake.direction
+        if direction not in VALID_DIRECTIONS:
+            return player.snake.direction
+        return direction
+
+    def get_worker_moves(self, directions, snapshots):
+        """
+        Asks the controller workers for the moves missing from `directions` under one shared deadline and
+        returns both directions. As in the GUI, a controller that fails, misses the deadline or is still busy
+        with an earlier request keeps its current direction. A busy controller is charged the whole deadline.
+        """
+        start = time.perf_counter()
+        players = (self.player1, self.player2)
+        requests = []
+        for player, direction, snapshot in zip(players, directions, snapshots):
+            worker = self.workers[player.id]
+            requests.append((worker, worker.request_move(*snapshot) if direction is None else None))
+        pending = PendingMoves(requests, start + config.CONTROLLER_TIMEOUT_SECONDS)
+        pending.wait()
+        now = time.perf_counter()
+
+        moves = []
+        for i, (player, direction) in enumerate(zip(players, directions)):
+            if direction is None:
+                _, request_id = requests[i]
+                direction, error = pending.results[i]
+                if request_id is None:
+                    self.controller_time[player.id] += config.CONTROLLER_TIMEOUT_SECONDS
+                    self.state.resync_controller(player)
+                else:
+                    answered_at = pending.answered_at[i]
+                    self.controller_time[player.id] += (answered_at if answered_at is not None else now) - start
+                    if error is not None:
+                        self.report_error(player, error.strip().splitlines()[-1], error)
+                        self.state.resync_controller(player)
+            moves.append(direction if direction in VALID_DIRECTIONS else player.snake.direction)
+        return moves
+
+    def step(self, p1_direction=None, p2_direction=None):
+        """
+        Advances the game by one tick. Returns True if the snakes moved.
+        A direction passed in is played instead of asking that player's controller.
+        The tick limit is checked once the tick's moves are played, so `max_ticks` ticks are played in full.
+        """
+        if self.state.game_over:
+            return False
+
+        self.tick += 1
+        moved = self.state.update_phase(self.get_game_time())
+        if moved:
+            if p1_direction is None or p2_direction is None:
+                snapshots = self.state.get_snapshots(self.shared_board, in_process=self.workers is None, tick=self.tick)
+                if self.workers is not None:
+                    p1_direction, p2_direction = self.get_worker_moves((p1_direction, p2_direction), snapshots)
+                else:
+                    if p1_direction is None:
+                        p1_direction = self.get_move(self.player1, *snapshots[0])
+                    if p2_direction is None:
+                        p2_direction = self.get_move(self.player2, *snapshots[1])
+            self.state.apply_moves(p1_direction, p2_direction)
+
+        if self.max_ticks is not None and self.tick >= self.max_ticks and not self.state.game_over:
+            self.state.calculate_winner(self.player1, self.player2)
+        if self.time_limit is not None and not self.state.game_over and time.perf_counter() - self.start_time > self.time_limit:
+            self.state.forfeit(max((self.player1, self.player2), key=lambda player: self.controller_time[player.id]))
+        self.events.extend(self.state.drain_events())
+        return moved
+
+    def run(self):
+        """
+        Plays the match to completion and returns a summary of the result.
+        """
+        while not self.state.game_over:
+            self.step()
+        return self.get_result()
+
+    def close(self):
+        """
+        Stops the controller workers of an isolated match and releases the shared board.
+        """
+        if self.workers is not None:
+            for worker in self.workers.values():
+                worker.stop()
+        self.shared_board.close()
+
+    def get_result(self):
+        """
+        Returns a dictionary describing the outcome of the match.
+        """
+        winner = self.state.winner
+        names = {self.player1.id: self.player1.name, self.player2.id: self.player2.name}
+        return {
+            "seed": self.state.seed,
+            "player1": self.player1.name,
+            "player2": self.player2.name,
+            "player1_score": self.player1.score,
+            "player2_score": self.player2.score,
+            "winner": winner.id if winner is not None else None,
+            "ticks": self.tick,
+            "sudden_death": self.state.sudden_death_active,
+            "controller_errors": [self.controller_errors[self.player1.id], self.controller_errors[self.player2.id]],
+            "controller_seconds": [round(self.controller_time[self.player1.id], 3), round(self.controller_time[self.player2.id], 3)],
+            "events": [event.describe(names) for event in self.events if event.kind != events.FOOD]
+        }
+
+    def get_replay(self):
+        """
+        Returns the match so far as a compact binary replay (see core.replay).
+        """
+        return replay.encode(self.state, self.tick, self.max_ticks)
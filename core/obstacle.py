@@ -1,17 +1,19 @@
-import random
-import pygame
-import os
 from config import config
 
+ORIENTATIONS = ("horizontal", "vertical")
+MIN_LENGTH = 4
+MAX_LENGTH = 6
+
 class Obstacle:
     """
     Represents an obstacle composed of repeating spike images.
-    Orientation can be horizontal or vertical, and length varies from 3 to 5 grid units.
+    Orientation can be horizontal or vertical, and length varies from MIN_LENGTH to MAX_LENGTH grid units.
+    The placement is chosen by GameState; (grid_row, grid_col) is the top-left cell.
     """
-    def __init__(self):
+    def __init__(self, grid_row, grid_col, orientation, length):
         self.size = config.GRID_SIZE
-        self.orientation = random.choice(["horizontal", "vertical"])
-        self.length = random.randint(4, 6)
+        self.orientation = orientation
+        self.length = length
 
         if self.orientation == "horizontal":
             self.width = self.size * self.length
@@ -20,30 +22,8 @@ class Obstacle:
             self.width = self.size
             self.height = self.size * self.length
 
-        max_x = (config.BOARD_WIDTH - self.width) // self.size
-        max_y = (config.BOARD_HEIGHT - self.height) // self.size
-        
-        self.x = random.randint(0, max_x) * self.size
-        self.y = random.randint(0, max_y) * self.size
-
-        # Load and scale the tile image (1 grid size)
-        image_path = os.path.join("assets", "spike.png")
-        self.tile_image = pygame.image.load(image_path)
-        self.tile_image = pygame.transform.scale(self.tile_image, (self.size, self.size))
-
-    def draw(self, board):
-        """
-        Draws the obstacle as a row/column of repeated spike tiles.
-        """
-        for i in range(self.length):
-            if self.orientation == "horizontal":
-                tile_x = self.x + i * self.size
-                tile_y = self.y 
-            else:
-                tile_x = self.x 
-                tile_y = self.y + i * self.size
-                
-            board.board.blit(self.tile_image, (tile_x, tile_y))
+        self.x = grid_col * self.size
+        self.y = grid_row * self.size
 
     def get_occupied_positions(self):
         """
@@ -61,3 +41,11 @@ class Obstacle:
             positions.append((grid_row, grid_col))
         
         return positions
+
+def get_positions(grid_row, grid_col, orientation, length):
+    """
+    Returns the grid positions an obstacle with the given placement would occupy.
+    """
+    if orientation == "horizontal":
+        return [(grid_row, grid_col + i) for i in range(length)]
+    return [(grid_row + i, grid_col) for i in range(length)]
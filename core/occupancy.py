@@ -0,0 +1,162 @@
+from array import array
+from core import zobrist
+
+# Cell tags, combined as bit flags since a snake's head can share a cell with food or another snake
+EMPTY = 0
+FOOD = 1
+OBSTACLE = 2
+SNAKE1 = 4
+SNAKE2 = 8
+SNAKE_TAGS = {1: SNAKE1, 2: SNAKE2}
+
+class OccupancyGrid:
+    """
+    Compact occupancy grid with one byte per board cell, tagged with the occupant type and owner.
+    Kept up to date incrementally by the snakes and the game state, so queries are O(1) and allocation-free.
+    Positions outside the board (a snake head that hit a wall) are ignored.
+
+    Empty cells are also kept in a free-cell index (a swap-remove array of cell indices plus each
+    cell's slot in it), so a uniformly random empty cell can be drawn in O(1) however full the board is.
+
+    `hash` is the Zobrist hash of the food, obstacles and body segments, updated with every change;
+    GameState.get_hash adds the heads, tails, directions and scores.
+    """
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.cells = bytearray(rows * cols)
+        # Per-owner segment counts, since a self-colliding snake has two segments in one cell
+        self.body_counts = {owner: array("H", bytes(2 * rows * cols)) for owner in SNAKE_TAGS}
+
+        # Free-cell index; free_slots[index] is -1 for occupied cells
+        self.free_cells = array("i", range(rows * cols))
+        self.free_slots = array("i", range(rows * cols))
+
+        self.keys = zobrist.keys_for(rows, cols)
+        self.tag_keys = {FOOD: self.keys.food, OBSTACLE: self.keys.obstacle}
+        self.hash = 0
+
+    def _occupy(self, index):
+        """
+        Removes a cell that just became occupied from the free-cell index.
+        """
+        slot = self.free_slots[index]
+        last = self.free_cells.pop()
+        if last != index:
+            self.free_cells[slot] = last
+            self.free_slots[last] = slot
+        self.free_slots[index] = -1
+
+    def _vacate(self, index):
+        """
+        Adds a cell that just became empty to the free-cell index.
+        """
+        self.free_slots[index] = len(self.free_cells)
+        self.free_cells.append(index)
+
+    def in_bounds(self, row, col):
+        """
+        Returns True if (row, col) lies on the board.
+        """
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def get(self, row, col):
+        """
+        Returns the tag flags of the cell, or EMPTY for positions outside the board.
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return EMPTY
+        return self.cells[row * self.cols + col]
+
+    def is_occupied(self, row, col):
+        """
+        Returns True if anything occupies the cell.
+        """
+        return self.get(row, col) != EMPTY
+
+    def add(self, tag, row, col):
+        """
+        Tags the cell with a food or obstacle flag.
+        """
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            index = row * self.cols + col
+            if self.cells[index] == EMPTY:
+                self._occupy(index)
+            if not self.cells[index] & tag:
+                self.hash ^= self.tag_keys[tag][index]
+            self.cells[index] |= tag
+
+    def remove(self, tag, row, col):
+        """
+        Clears a food or obstacle flag from the cell.
+        """
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            index = row * self.cols + col
+            if self.cells[index] & tag:
+                self.hash ^= self.tag_keys[tag][index]
+                self.cells[index] &= ~tag
+                if self.cells[index] == EMPTY:
+                    self._vacate(index)
+
+    def add_body(self, owner, row, col):
+        """
+        Records one body segment of the given player in the cell.
+        """
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            index = row * self.cols + col
+            if self.cells[index] == EMPTY:
+                self._occupy(index)
+            self.body_counts[owner][index] += 1
+            self.hash ^= self.keys.body[owner][index]
+            self.cells[index] |= SNAKE_TAGS[owner]
+
+    def remove_body(self, owner, row, col):
+        """
+        Removes one body segment of the given player from the cell.
+        """
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            index = row * self.cols + col
+            counts = self.body_counts[owner]
+            counts[index] -= 1
+            self.hash ^= self.keys.body[owner][index]
+            if counts[index] == 0:
+                self.cells[index] &= ~SNAKE_TAGS[owner]
+                if self.cells[index] == EMPTY:
+                    self._vacate(index)
+
+    def free_count(self):
+        """
+        Returns the number of empty cells.
+        """
+        return len(self.free_cells)
+
+    def random_free_cell(self, rng):
+        """
+        Returns a uniformly random empty cell as (row, col), or None if the board is full.
+        `rng` is a random.Random instance (or the random module).
+        """
+        if not self.free_cells:
+            return None
+        index = self.free_cells[rng.randrange(len(self.free_cells))]
+        return divmod(index, self.cols)
+
+    def is_free(self, row, col):
+        """
+        Returns True if the cell lies on the board and nothing occupies it.
+        """
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.cells[row * self.cols + col] == EMPTY
+
+    def attach_snake(self, snake, owner):
+        """
+        Records the snake's current body and makes the snake report its future moves to this grid.
+        """
+        snake.occupancy = self
+        snake.owner = owner
+        for row, col in snake.body:
+            self.add_body(owner, row, col)
+
+    def occupied_positions(self):
+        """
+        Returns every occupied cell as a set of (row, col) tuples.
+        """
+        return {divmod(index, self.cols) for index, tag in enumerate(self.cells) if tag}
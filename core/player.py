@@ -1,4 +1,3 @@
-import pygame
 import config.colors as colors
 import config.config as config
 import core.snake as snake
@@ -19,17 +18,21 @@ class Player:
         self.collided = False     
 
         position = {"row": board.rows // 2, "col": 0}
-        
-        self.snake = snake.Snake(position, "right", self.color, self.border_color)
+        direction = "right"
         
         if self.id == 2: 
             position = {"row": board.rows // 2, "col": board.cols - 1}
-            self.snake.head_position = position.copy()
-            self.snake.body[0].position = position.copy()
-            self.snake.direction = "left"
-            
-        self.controller = self._load_controller(controller_path)
-        self.name = self.controller.set_player_name()
+            direction = "left"
+
+        self.snake = snake.Snake(position, direction, self.color, self.border_color)
+
+        # Without a controller the moves come from outside, e.g. core.env.SnakeEnv
+        if controller_path is None:
+            self.controller = None
+            self.name = f"Player {self.id}"
+        else:
+            self.controller = self._load_controller(controller_path)
+            self.name = self.controller.set_player_name()
         
     def _load_controller(self, controller_module_name):
         """Loads the player's controller file."""
@@ -46,15 +49,3 @@ class Player:
             raise e
         except Exception as e:
             raise RuntimeError(f"Error loading controller module {controller_module_name}: {e}")
-
-    def draw_score(self, surface, position):
-        """
-        Draws the player's name and score on the given surface at the specified position.
-        """
-        font = pygame.font.SysFont(None, 25)
-        
-        name_surface = font.render("Player " + str(self.id) + " - " + self.name, True, self.border_color)
-        score_surface = font.render(f"Score: {self.score}", True, "white")
-        
-        surface.blit(name_surface, (position["x"], position["y"]))
-        surface.blit(score_surface, (position["x"], position["y"] + 25))
\ No newline at end of file
@@ -0,0 +1,292 @@
+import pygame
+import config.colors as colors
+from config import config
+from core import resources
+from core.scorebar import ScoreBar
+
+# Screen positions of the board border and the board itself
+BORDER_POS = (145, 165)
+BOARD_POS = (150, 170)
+
+# Height of the leaf drawn above each apple, which pokes into the cell above
+LEAF_HEIGHT = 4
+
+class Renderer:
+    """
+    Draws a GameState onto a pygame screen.
+    All pygame drawing lives here so the simulation core can run without a display.
+
+    The static layer (board background and obstacles) is composited once per game. After a full
+    frame, each frame only redraws the cells whose contents changed (new heads, vacated tails, eaten
+    or spawned food) and the HUD elements whose values changed, and returns the dirty rectangles
+    for pygame.display.update.
+
+    Between ticks the heads can be interpolated: with `alpha` below 1.0 each head is drawn part of the way
+    from its previous cell to its current one, so movement stays smooth at any frame rate.
+    """
+    def __init__(self, screen, board):
+        self.screen = screen
+        self.board = board
+        self.size = config.GRID_SIZE
+        self.board_surface = pygame.Surface((board.width, board.height))
+        self.static_layer = pygame.Surface((board.width, board.height))
+        self.border = pygame.Surface((board.width + 10, board.height + 10))
+        self.border.fill(colors.border_color)
+        self.scorebar = ScoreBar(config.SCOREBAR_POS_X, config.SCOREBAR_POS_Y, screen)
+        self.scorebar_rect = pygame.Rect(self.scorebar.x, self.scorebar.y, self.scorebar.width + 2, self.scorebar.height)
+
+        # What is currently on screen, used to find the cells and HUD elements that changed
+        self.state = None
+        self.needs_full_redraw = True
+        self.drawn_snake_cells = [set(), set()]
+        self.drawn_food_cells = set()
+        self.timer_key = None
+        self.timer_rect = None
+        self.score_key = None
+        self.score_rects = []
+        self.head_overlay_cells = set()
+
+    def invalidate(self):
+        """
+        Forces the next frame to be drawn in full, e.g. after something else drew over the screen.
+        """
+        self.needs_full_redraw = True
+
+    def build_static_layer(self, state):
+        """
+        Composites the board background and the obstacles of the given game.
+        """
+        board_background = resources.cache.image(resources.BOARD_IMAGE, (self.board.width, self.board.height))
+        self.static_layer.blit(board_background, (0, 0))
+
+        for obstacle in state.obstacle_locations:
+            self.draw_obstacle(obstacle, self.static_layer)
+
+    def cell_rect(self, row, col):
+        """
+        Returns the board-surface rectangle of a grid cell.
+        """
+        return pygame.Rect(col * self.size, row * self.size, self.size, self.size)
+
+    def draw_food(self, food):
+        """
+        Draws a food item on the board surface.
+        """
+        food_rect = pygame.Rect(food.x, food.y, self.size, self.size)
+        leaf = pygame.Rect(food.x  + self.size/2 - 2, food.y - LEAF_HEIGHT, 4.5, LEAF_HEIGHT)
+        pygame.draw.rect(self.board_surface, colors.food_color, food_rect)
+        pygame.draw.rect(self.board_surface, colors.food_leaf_color, leaf)
+
+    def draw_obstacle(self, obstacle, surface):
+        """
+        Draws an obstacle as a row/column of repeated spike tiles.
+        """
+        # Tile image scaled to 1 grid size, shared by every obstacle
+        tile_image = resources.cache.image(resources.SPIKE_IMAGE, (self.size, self.size))
+
+        for i in range(obstacle.length):
+            if obstacle.orientation == "horizontal":
+                tile_x = obstacle.x + i * self.size
+                tile_y = obstacle.y
+            else:
+                tile_x = obstacle.x
+                tile_y = obstacle.y + i * self.size
+
+            surface.blit(tile_image, (tile_x, tile_y))
+
+    def draw_segment(self, snake, row, col):
+        """
+        Draws one snake segment on the board surface.
+        """
+        segment_rect = self.cell_rect(row, col)
+        pygame.draw.rect(self.board_surface, snake.color, segment_rect)
+        pygame.draw.rect(self.board_surface, snake.border_color, segment_rect, 2)
+
+    def draw_snake(self, snake, skip_head=False):
+        """
+        Draws every segment of the snake on the board surface.
+        With skip_head, the head is left out unless another segment shares its cell.
+        """
+        for row, col in snake.body:
+            if skip_head and (row, col) == snake.body[0] and snake.cell_counts[snake.body[0]] == 1:
+                continue
+            self.draw_segment(snake, row, col)
+
+    def get_moving_heads(self, state, alpha):
+        """
+        Returns (snake, head cell, previous head cell) for both snakes if the heads are being interpolated.
+        """
+        if alpha >= 1.0:
+            return []
+
+        moving_heads = []
+        for snake in (state.player1.snake, state.player2.snake):
+            previous = snake.body[1] if len(snake.body) > 1 else snake.last_position
+            moving_heads.append((snake, snake.body[0], previous))
+        return moving_heads
+
+    def draw_moving_heads(self, moving_heads, alpha):
+        """
+        Draws each head part of the way from its previous cell to its current one.
+        Returns the cells the heads were drawn over.
+        """
+        cells = set()
+        for snake, head, previous in moving_heads:
+            row = previous[0] + (head[0] - previous[0]) * alpha
+            col = previous[1] + (head[1] - previous[1]) * alpha
+            head_rect = pygame.Rect(round(col * self.size), round(row * self.size), self.size, self.size)
+            pygame.draw.rect(self.board_surface, snake.color, head_rect)
+            pygame.draw.rect(self.board_surface, snake.border_color, head_rect, 2)
+            cells.add(head)
+            cells.add(previous)
+        return cells
+
+    def draw_score(self, player, position):
+        """
+        Draws the player's name and score on the screen at the specified position.
+        Returns the rectangles drawn.
+        """
+        name_surface = resources.cache.text("Player " + str(player.id) + " - " + player.name, 25, player.border_color)
+        score_surface = resources.cache.text(f"Score: {player.score}", 25, "white")
+
+        name_rect = self.screen.blit(name_surface, (position["x"], position["y"]))
+        score_rect = self.screen.blit(score_surface, (position["x"], position["y"] + 25))
+        return [name_rect, score_rect]
+
+    def draw_hud(self, state, timer_text, timer_color, force=False):
+        """
+        Redraws the timer, the scores and the scorebar if their values changed (or if forced).
+        Returns the dirty rectangles.
+        """
+        rects = []
+
+        timer_key = (timer_text, timer_color)
+        if force or timer_key != self.timer_key:
+            if self.timer_rect is not None:
+                self.screen.fill(colors.background_color, self.timer_rect)
+                rects.append(self.timer_rect)
+            timer_surface = resources.cache.text(timer_text, 36, timer_color)
+            self.timer_rect = self.screen.blit(timer_surface, (config.TIMER_POS_X, config.TIMER_POS_Y))
+            rects.append(self.timer_rect)
+            self.timer_key = timer_key
+
+        player1, player2 = state.player1, state.player2
+        score_key = (player1.name, player1.score, player2.name, player2.score)
+        if force or score_key != self.score_key:
+            for rect in self.score_rects:
+                self.screen.fill(colors.background_color, rect)
+            rects.extend(self.score_rects)
+
+            self.score_rects = self.draw_score(player1, {"x": config.PLAYER1_SCORE_POS_X, "y": config.PLAYER1_SCORE_POS_Y})
+            self.score_rects += self.draw_score(player2, {"x": config.PLAYER2_SCORE_POS_X, "y": config.PLAYER2_SCORE_POS_Y})
+            rects.extend(self.score_rects)
+
+            self.screen.fill(colors.background_color, self.scorebar_rect)
+            self.scorebar.draw(self.screen, player1, player2)
+            rects.append(self.scorebar_rect)
+            self.score_key = score_key
+
+        return rects
+
+    def draw_full(self, state, timer_text, timer_color, alpha=1.0):
+        """
+        Draws the whole screen from the static layer and the current game state.
+        """
+        self.screen.fill(colors.background_color)
+        self.screen.blit(resources.cache.text(config.TITLE, 40, "white"), (config.TITLE_POS_X, config.TITLE_POS_Y))
+        self.screen.blit(self.border, BORDER_POS)
+
+        self.board_surface.blit(self.static_layer, (0, 0))
+        for apple in state.food_locations:
+            self.draw_food(apple)
+        moving_heads = self.get_moving_heads(state, alpha)
+        self.draw_snake(state.player1.snake, skip_head=bool(moving_heads))
+        self.draw_snake(state.player2.snake, skip_head=bool(moving_heads))
+        self.head_overlay_cells = self.draw_moving_heads(moving_heads, alpha)
+        self.screen.blit(self.board_surface, BOARD_POS)
+
+        self.timer_rect = None
+        self.score_rects = []
+        self.draw_hud(state, timer_text, timer_color, force=True)
+
+        self.drawn_snake_cells = [set(state.player1.snake.cell_counts), set(state.player2.snake.cell_counts)]
+        self.drawn_food_cells = set(state.food_map)
+        self.needs_full_redraw = False
+
+    def draw_changed_cells(self, state, alpha=1.0):
+        """
+        Redraws only the board cells whose contents changed since the last frame,
+        plus the cells under moving heads. Returns the dirty screen rectangles.
+        """
+        snakes = (state.player1.snake, state.player2.snake)
+        dirty = set()
+
+        for i, snake in enumerate(snakes):
+            cells = set(snake.cell_counts)
+            dirty |= cells ^ self.drawn_snake_cells[i]
+            self.drawn_snake_cells[i] = cells
+
+        food_cells = set(state.food_map)
+        food_changes = food_cells ^ self.drawn_food_cells
+        self.drawn_food_cells = food_cells
+        # An apple's leaf lives in the cell above it
+        dirty |= food_changes | {(row - 1, col) for row, col in food_changes}
+
+        # Cells under the heads drawn last frame, and under the heads drawn this frame
+        moving_heads = self.get_moving_heads(state, alpha)
+        dirty |= self.head_overlay_cells
+        for _, head, previous in moving_heads:
+            dirty.add(head)
+            dirty.add(previous)
+
+        dirty = {(row, col) for row, col in dirty if 0 <= row < self.board.rows and 0 <= col < self.board.cols}
+        if not dirty:
+            return []
+
+        # Restore the static layer under every changed cell
+        for row, col in dirty:
+            rect = self.cell_rect(row, col)
+            self.board_surface.blit(self.static_layer, rect, rect)
+
+        # Apples in a changed cell, or whose leaf pokes into one from below
+        redrawn_food = [cell for cell in food_cells if cell in dirty or (cell[0] - 1, cell[1]) in dirty]
+        for cell in redrawn_food:
+            self.draw_food(state.food_map[cell])
+
+        # Snakes go on top, including over any leaf redrawn into the cell above an apple
+        snake_cells = dirty | {(row - 1, col) for row, col in redrawn_food if row > 0}
+        for snake in snakes:
+            for row, col in snake_cells:
+                if not snake.occupies((row, col)):
+                    continue
+                if moving_heads and (row, col) == snake.body[0] and snake.cell_counts[snake.body[0]] == 1:
+                    continue
+                self.draw_segment(snake, row, col)
+        self.head_overlay_cells = self.draw_moving_heads(moving_heads, alpha)
+
+        rects = []
+        for row, col in snake_cells.union(redrawn_food, self.head_overlay_cells):
+            if not (0 <= row < self.board.rows and 0 <= col < self.board.cols):
+                continue
+            rect = self.cell_rect(row, col)
+            rects.append(self.screen.blit(self.board_surface, rect.move(BOARD_POS), rect))
+        return rects
+
+    def draw_frame(self, state, timer_text, timer_color, alpha=1.0):
+        """
+        Draws the current frame and returns the dirty screen rectangles.
+        A new game or an invalidated screen is drawn in full.
+        `alpha` is the fraction of the current tick that has elapsed, used to interpolate the heads.
+        """
+        if state is not self.state:
+            self.state = state
+            self.build_static_layer(state)
+            self.needs_full_redraw = True
+
+        if self.needs_full_redraw:
+            self.draw_full(state, timer_text, timer_color, alpha)
+            return [self.screen.get_rect()]
+
+        rects = self.draw_changed_cells(state, alpha)
+        rects.extend(self.draw_hud(state, timer_text, timer_color))
+        return rects
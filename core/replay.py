@@ -0,0 +1,132 @@
+import struct
+from config import config
+from core.board import Board
+from core.clock import TickClock
+from core.game_state import GameState
+from core.player import Player
+from core.snake import DIRECTION_CODES
+
+MAGIC = b"BOTA"
+VERSION = 2
+
+# Magic, version, seed, rows, cols, food count, obstacle count, game duration (ms),
+# sudden death message duration (ms), tick length (ms), tick limit (0 for none)
+HEADER = struct.Struct("<4sBQHHHHIIHI")
+# Ticks played, Zobrist hash of the final position, winner id (0 for a draw or unfinished game), scores,
+# id of the player who forfeited on the last tick (0 for none)
+TRAILER = struct.Struct("<IQBHHB")
+
+DIRECTIONS = tuple(sorted(DIRECTION_CODES, key=DIRECTION_CODES.get))
+
+class ReplayError(Exception):
+    """
+    Raised for a replay that cannot be read, was recorded with another configuration or does not reproduce its result.
+    """
+
+def game_config(rows, cols):
+    """
+    Returns the configuration values a replay depends on, in header order.
+    """
+    return (rows, cols, config.NUM_FOOD, config.NUM_OBSTACLES, config.GAME_DURATION,
+            config.PRE_SUDDEN_DEATH_MESSAGE_DURATION, config.AI_UPDATE_INTERVAL_MS)
+
+def encode(state, ticks, max_ticks=None):
+    """
+    Returns the replay of a game as bytes: a header with the seed and configuration, the GameState's
+    move log (one byte per tick with moves) and a trailer with the tick count, final hash and result.
+    """
+    winner = state.winner.id if state.winner is not None else 0
+    try:
+        header = HEADER.pack(MAGIC, VERSION, state.seed, *game_config(state.rows, state.cols), max_ticks or 0)
+    except struct.error as e:
+        raise ReplayError(f"Game cannot be recorded: {e}") from e
+    forfeited = state.forfeited.id if state.forfeited is not None else 0
+    trailer = TRAILER.pack(ticks, state.get_hash(), winner, state.player1.score, state.player2.score, forfeited)
+    return header + bytes(state.move_log) + trailer
+
+def decode(data):
+    """
+    Splits a replay into (header, moves, trailer); header and trailer are dictionaries, moves a bytes-like object.
+    """
+    if len(data) < HEADER.size + TRAILER.size:
+        raise ReplayError("Replay is truncated")
+    magic, version, seed, *values = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ReplayError("Not a replay of this version")
+
+    header = {"seed": seed, "config": tuple(values[:-1]), "max_ticks": values[-1] or None}
+    ticks, position_hash, winner, score1, score2, forfeited = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+    trailer = {"ticks": ticks, "hash": position_hash, "winner": winner or None, "scores": (score1, score2), "forfeited": forfeited or None}
+    return header, memoryview(data)[HEADER.size:len(data) - TRAILER.size], trailer
+
+def new_game(header):
+    """
+    Returns (state, clock) for the start of the game a replay header describes, with controller-less players.
+    """
+    board = Board(config.BOARD_WIDTH, config.BOARD_HEIGHT)
+    if header["config"] != game_config(board.rows, board.cols):
+        raise ReplayError("Replay was recorded with a different game configuration")
+
+    clock = TickClock(config.AI_UPDATE_INTERVAL_MS)
+    state = GameState(board, Player(1, board, None), Player(2, board, None), clock=clock, seed=header["seed"])
+    return state, clock
+
+def play(data):
+    """
+    Re-plays a replay headlessly, yielding (state, tick, moved) for the start of the game (tick 0) and after
+    every tick; `moved` is False for ticks that passed without moves. The same GameState is yielded each time.
+    Ticks follow Match.step: game time is counted in ticks, the phases (time up, sudden death) are advanced
+    before each tick's moves and the tick limit and a recorded forfeit are applied after them.
+    Raises ReplayError if moves are left over once the recorded ticks are played.
+    """
+    header, moves, trailer = decode(data)
+    state, clock = new_game(header)
+    max_ticks = header["max_ticks"]
+    played = 0
+    yield state, 0, False
+
+    while clock.tick < trailer["ticks"] and not state.game_over:
+        clock.advance()
+        moved = state.update_phase(clock())
+        if moved:
+            if played == len(moves):
+                # Recording stopped in the middle of a tick, e.g. the window was closed while the controllers thought
+                break
+            code = moves[played]
+            played += 1
+            state.apply_moves(DIRECTIONS[code >> 2], DIRECTIONS[code & 3])
+        if max_ticks is not None and clock.tick >= max_ticks and not state.game_over:
+            state.calculate_winner(state.player1, state.player2)
+        if trailer["forfeited"] is not None and clock.tick == trailer["ticks"]:
+            state.forfeit(state.player1 if trailer["forfeited"] == 1 else state.player2)
+        yield state, clock.tick, moved
+
+    if played != len(moves):
+        raise ReplayError("Replay does not reproduce the recorded result")
+
+def check_result(state, trailer):
+    """
+    Raises ReplayError if a re-played game's final position or result differs from the trailer's.
+    """
+    winner = state.winner.id if state.winner is not None else None
+    if (state.get_hash() != trailer["hash"] or winner != trailer["winner"]
+            or (state.player1.score, state.player2.score) != trailer["scores"]):
+        raise ReplayError("Replay does not reproduce the recorded result")
+
+def simulate(data):
+    """
+    Re-plays a replay headlessly and returns the final GameState.
+    Raises ReplayError if the final position or result differs from the recorded one.
+    """
+    for state, _, _ in play(data):
+        pass
+    check_result(state, decode(data)[2])
+    return state
+
+def save(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def load(path):
+    with open(path, "rb") as f:
+        return f.read()
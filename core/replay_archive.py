@@ -0,0 +1,351 @@
+import mmap
+import struct
+from collections import deque
+from config import config
+from core import replay
+from core.board import Board
+from core.food import Food
+from core.obstacle import Obstacle, ORIENTATIONS
+from core.player import Player
+from core.replay import ReplayError, DIRECTIONS
+from core.snake import DIRECTION_CODES
+
+MAGIC = b"BOTX"
+VERSION = 1
+
+# Ticks between keyframes; seeking applies at most KEYFRAME_INTERVAL - 1 tick records after loading one
+KEYFRAME_INTERVAL = 64
+
+# Magic, version, rows, cols, keyframe interval, match count
+HEADER = struct.Struct("<4sBHHHI")
+# Match id, offset of the match section
+MATCH_ENTRY = struct.Struct("<IQ")
+# Seed, ticks, tick pre sudden death started, tick sudden death started (0 for never), game over,
+# winner id (0 for none), scores, obstacle count, player name lengths
+MATCH_HEADER = struct.Struct("<QIIIBBHHHBB")
+# Top-left row and col, orientation index, length
+OBSTACLE = struct.Struct("<HHBB")
+# Offset of a keyframe from the start of its match section
+INDEX_ENTRY = struct.Struct("<Q")
+# Direction codes (as in a replay move byte), scores, body lengths, food count, each snake's last tail cell
+KEYFRAME = struct.Struct("<BHHHHBHH")
+# Flags, moves, food cells removed, food cells added; followed by the cells
+RECORD = struct.Struct("<BBBB")
+
+# Record flags
+MOVED = 1
+GREW = {1: 2, 2: 4}
+
+class ReplayArchive:
+    """
+    Random-access archive of many replayed matches, for reviewing a tournament.
+
+    Each match is stored as periodic keyframes holding the full position (bodies, food, scores, directions)
+    followed by one small record per tick (the moves, who grew and the food cells that changed), with a
+    keyframe index in front. Seeking to any tick of any match is two index lookups, one keyframe load and at
+    most KEYFRAME_INTERVAL - 1 records, however long the match. Obstacles are stored once per match and
+    the occupancy of a position follows from the obstacles, bodies and food.
+
+    The file is read through mmap, so only the pages of the positions actually looked at are loaded and
+    many archives can be open at once. Archives are written by `write` from replays (see core.replay).
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < HEADER.size:
+            raise ReplayError("Archive is truncated")
+        magic, version, self.rows, self.cols, self.interval, count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ReplayError("Not a replay archive of this version")
+
+        self.offsets = {}
+        for i in range(count):
+            match_id, offset = MATCH_ENTRY.unpack_from(self.data, HEADER.size + i * MATCH_ENTRY.size)
+            self.offsets[match_id] = offset
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.data.close()
+
+    def match_ids(self):
+        """
+        Returns the ids of the archived matches in archive order.
+        """
+        return list(self.offsets)
+
+    def match_info(self, match_id):
+        """
+        Returns a dictionary describing an archived match: seed, ticks, names, scores, winner id and whether it finished.
+        """
+        offset = self.offsets[match_id]
+        seed, ticks, pre_tick, sudden_death_tick, game_over, winner, score1, score2, _, length1, length2 = MATCH_HEADER.unpack_from(self.data, offset)
+        start = offset + MATCH_HEADER.size
+        names = (bytes(self.data[start:start + length1]).decode(), bytes(self.data[start + length1:start + length1 + length2]).decode())
+        return {
+            "match_id": match_id,
+            "seed": seed,
+            "ticks": ticks,
+            "names": names,
+            "scores": (score1, score2),
+            "winner": winner or None,
+            "game_over": bool(game_over),
+            "pre_sudden_death_tick": pre_tick or None,
+            "sudden_death_tick": sudden_death_tick or None
+        }
+
+    def open(self, match_id):
+        """
+        Returns a Playback of an archived match, positioned at tick 0.
+        """
+        if match_id not in self.offsets:
+            raise KeyError(f"No match {match_id} in the archive")
+        return Playback(self, match_id)
+
+class PlaybackState:
+    """
+    The position of an archived match at one tick, with the attributes the renderer and the GUI read from a
+    GameState: players with snakes, food, obstacles, the sudden death phases and the result.
+    """
+    def __init__(self, board, info, obstacles):
+        self.board = board
+        self.rows = board.rows
+        self.cols = board.cols
+        self.player1 = Player(1, board, None)
+        self.player2 = Player(2, board, None)
+        self.player1.name, self.player2.name = info["names"]
+        self.food_locations = []
+        self.food_map = {}
+        self.obstacle_locations = obstacles
+        self.winner = None
+        self.game_over = False
+        self.pre_sudden_death_active = False
+        self.pre_sudden_death_start_time = None
+        self.sudden_death_active = False
+        self.sudden_death_start_time = None
+
+    def add_food(self, cell):
+        food = Food(*cell)
+        self.food_locations.append(food)
+        self.food_map[cell] = food
+
+    def remove_food(self, cell):
+        self.food_locations.remove(self.food_map.pop(cell))
+
+class Playback:
+    """
+    Seeks through one archived match. `state` is a PlaybackState updated in place, so a renderer drawing it
+    only redraws what changed between two positions, whichever way the playback went.
+    """
+    def __init__(self, archive, match_id):
+        self.data = archive.data
+        self.info = archive.match_info(match_id)
+        self.interval = archive.interval
+        self.ticks = self.info["ticks"]
+        self.tick = None
+
+        board = Board(config.BOARD_WIDTH, config.BOARD_HEIGHT)
+        if (board.rows, board.cols) != (archive.rows, archive.cols):
+            raise ReplayError("Archive was recorded on a board of a different size")
+        self.stride = board.cols + 2
+
+        offset = archive.offsets[match_id]
+        obstacle_count = MATCH_HEADER.unpack_from(self.data, offset)[8]
+        position = offset + MATCH_HEADER.size + sum(len(name.encode()) for name in self.info["names"])
+        obstacles = []
+        for _ in range(obstacle_count):
+            row, col, orientation, length = OBSTACLE.unpack_from(self.data, position)
+            obstacles.append(Obstacle(row, col, ORIENTATIONS[orientation], length))
+            position += OBSTACLE.size
+        self.index_offset = position
+        self.base = offset
+
+        self.state = PlaybackState(board, self.info, obstacles)
+        self.seek(0)
+
+    def cell(self, value):
+        """
+        Returns the (row, col) cell of a stored cell value; cells are stored on the board padded by one cell
+        on each side, so a head that left the board can be stored too.
+        """
+        row, col = divmod(value, self.stride)
+        return (row - 1, col - 1)
+
+    def seek(self, tick):
+        """
+        Moves the playback to the position after the given tick (clamped to the match). Moving forward within
+        a keyframe interval applies the tick records from the current position; anything else loads the
+        keyframe at or before the tick first.
+        """
+        tick = max(0, min(tick, self.ticks))
+        if self.tick is None or tick < self.tick or tick // self.interval != self.tick // self.interval:
+            self._load_keyframe(tick // self.interval)
+        while self.tick < tick:
+            self._apply_record()
+        self._update_phase()
+
+    def _load_keyframe(self, number):
+        """
+        Replaces the position with a keyframe's and leaves the read position at its first tick record.
+        """
+        data, state = self.data, self.state
+        (keyframe_offset,) = INDEX_ENTRY.unpack_from(data, self.index_offset + number * INDEX_ENTRY.size)
+        position = self.base + keyframe_offset
+        directions, score1, score2, length1, length2, food_count, last1, last2 = KEYFRAME.unpack_from(data, position)
+        position += KEYFRAME.size
+
+        cells = struct.unpack_from(f"<{length1 + length2 + food_count}H", data, position)
+        position += 2 * len(cells)
+        bodies = (cells[:length1], cells[length1:length1 + length2])
+        for player, body, last, code, score in ((state.player1, bodies[0], last1, directions >> 2, score1),
+                                               (state.player2, bodies[1], last2, directions & 3, score2)):
+            self._set_snake(player.snake, [self.cell(value) for value in body], self.cell(last), DIRECTIONS[code])
+            player.score = score
+
+        state.food_locations.clear()
+        state.food_map.clear()
+        for value in cells[length1 + length2:]:
+            state.add_food(self.cell(value))
+
+        self.tick = number * self.interval
+        self.position = position
+
+    def _set_snake(self, snake, body, last_position, direction):
+        """
+        Puts a snake's body, tail trace and direction in place.
+        """
+        snake.body = deque(body)
+        snake.cell_counts = {}
+        for cell in body:
+            snake.cell_counts[cell] = snake.cell_counts.get(cell, 0) + 1
+        snake.head_position = {"row": body[0][0], "col": body[0][1]}
+        snake.last_position = last_position
+        snake.length = len(body)
+        snake.direction = direction
+
+    def _apply_record(self):
+        """
+        Plays the next tick record.
+        """
+        data, state = self.data, self.state
+        flags, moves, removed, added = RECORD.unpack_from(data, self.position)
+        self.position += RECORD.size
+        cells = struct.unpack_from(f"<{removed + added}H", data, self.position)
+        self.position += 2 * len(cells)
+
+        if flags & MOVED:
+            state.player1.snake.direction = DIRECTIONS[moves >> 2]
+            state.player2.snake.direction = DIRECTIONS[moves & 3]
+            state.player1.snake.move()
+            state.player2.snake.move()
+            for player in (state.player1, state.player2):
+                if flags & GREW[player.id]:
+                    player.snake.grow()
+                    player.score += 1
+
+        for value in cells[:removed]:
+            state.remove_food(self.cell(value))
+        for value in cells[removed:]:
+            state.add_food(self.cell(value))
+        self.tick += 1
+
+    def _update_phase(self):
+        """
+        Sets the sudden death phases and the result for the current tick.
+        """
+        state, info, tick_ms = self.state, self.info, config.AI_UPDATE_INTERVAL_MS
+        state.game_over = info["game_over"] and self.tick == self.ticks
+        winner = info["winner"] if state.game_over else None
+        state.winner = state.player1 if winner == 1 else state.player2 if winner == 2 else None
+
+        pre_tick, sudden_death_tick = info["pre_sudden_death_tick"], info["sudden_death_tick"]
+        state.sudden_death_active = sudden_death_tick is not None and self.tick >= sudden_death_tick
+        state.sudden_death_start_time = sudden_death_tick * tick_ms if state.sudden_death_active else None
+        state.pre_sudden_death_active = (pre_tick is not None and self.tick >= pre_tick and not state.sudden_death_active
+                                         and not state.game_over)
+        state.pre_sudden_death_start_time = pre_tick * tick_ms if state.pre_sudden_death_active else None
+
+def _pad(cell, stride):
+    """
+    Returns the stored value of a (row, col) cell; see Playback.cell.
+    """
+    return (cell[0] + 1) * stride + cell[1] + 1
+
+def encode_match(data, names=None, interval=KEYFRAME_INTERVAL):
+    """
+    Re-plays a replay and returns its archive section (without the match id). `names` are the players' names.
+    Raises ReplayError if the replay does not reproduce its result.
+    """
+    header, _, trailer = replay.decode(data)
+    names = [name.encode()[:255] for name in (names or ("Player 1", "Player 2"))]
+    stride = header["config"][1] + 2
+
+    body = bytearray()
+    index = []
+    pre_tick = sudden_death_tick = 0
+    food, lengths = [], (0, 0)
+    for state, tick, moved in replay.play(data):
+        snakes = (state.player1.snake, state.player2.snake)
+        food_cells = [(item.grid_row, item.grid_col) for item in state.food_locations]
+        if state.pre_sudden_death_active and not pre_tick:
+            pre_tick = tick
+        if state.sudden_death_active and not sudden_death_tick:
+            sudden_death_tick = tick
+
+        if tick % interval == 0:
+            index.append(len(body))
+            directions = DIRECTION_CODES[snakes[0].direction] << 2 | DIRECTION_CODES[snakes[1].direction]
+            cells = [_pad(cell, stride) for cell in (*snakes[0].body, *snakes[1].body, *food_cells)]
+            body += KEYFRAME.pack(directions, state.player1.score, state.player2.score, len(snakes[0].body), len(snakes[1].body),
+                                  len(food_cells), _pad(snakes[0].last_position, stride), _pad(snakes[1].last_position, stride))
+            body += struct.pack(f"<{len(cells)}H", *cells)
+        else:
+            flags = MOVED if moved else 0
+            for snake, length, player_id in zip(snakes, lengths, (1, 2)):
+                if len(snake.body) > length:
+                    flags |= GREW[player_id]
+            removed = [_pad(cell, stride) for cell in food if cell not in food_cells]
+            added = [_pad(cell, stride) for cell in food_cells if cell not in food]
+            body += RECORD.pack(flags, state.move_log[-1] if moved else 0, len(removed), len(added))
+            body += struct.pack(f"<{len(removed) + len(added)}H", *removed, *added)
+
+        food = food_cells
+        lengths = (len(snakes[0].body), len(snakes[1].body))
+
+    replay.check_result(state, trailer)
+
+    obstacles = b"".join(OBSTACLE.pack(obstacle.y // obstacle.size, obstacle.x // obstacle.size,
+                                       ORIENTATIONS.index(obstacle.orientation), obstacle.length)
+                         for obstacle in state.obstacle_locations)
+    section_header = MATCH_HEADER.pack(header["seed"], tick, pre_tick, sudden_death_tick, state.game_over,
+                                       trailer["winner"] or 0, *trailer["scores"], len(state.obstacle_locations),
+                                       len(names[0]), len(names[1]))
+    prefix_size = len(section_header) + len(names[0]) + len(names[1]) + len(obstacles) + len(index) * INDEX_ENTRY.size
+    index_bytes = b"".join(INDEX_ENTRY.pack(prefix_size + offset) for offset in index)
+    return section_header + names[0] + names[1] + obstacles + index_bytes + body
+
+def write(path, matches, interval=KEYFRAME_INTERVAL):
+    """
+    Writes an archive of matches, an iterable of (match_id, replay data, player names or None).
+    All replays must come from the same board size.
+    """
+    matches = list(matches)
+    rows, cols = replay.decode(matches[0][1])[0]["config"][:2] if matches else (0, 0)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, rows, cols, interval, len(matches)))
+        table_offset = f.tell()
+        f.write(bytes(MATCH_ENTRY.size * len(matches)))
+
+        table = []
+        for match_id, data, names in matches:
+            if replay.decode(data)[0]["config"][:2] != (rows, cols):
+                raise ReplayError("Replays of different board sizes cannot share an archive")
+            table.append(MATCH_ENTRY.pack(match_id, f.tell()))
+            f.write(encode_match(data, names, interval))
+
+        f.seek(table_offset)
+        f.write(b"".join(table))
@@ -0,0 +1,81 @@
+import os
+from collections import OrderedDict
+import pygame
+
+# Rendered text surfaces kept before the least recently used one is evicted
+TEXT_CACHE_SIZE = 256
+
+class ResourceCache:
+    """
+    Central cache for the pygame renderer.
+    Images are loaded, scaled and converted once and shared by every user; fonts are created once per
+    (name, size, bold) and rendered text surfaces are kept by (font, size, bold, text, colour) with LRU eviction.
+    """
+    def __init__(self, text_cache_size=TEXT_CACHE_SIZE):
+        self.images = {}
+        self.fonts = {}
+        self.texts = OrderedDict()
+        self.text_cache_size = text_cache_size
+
+    def image(self, path, size):
+        """
+        Returns the image at `path` scaled to `size` (width, height).
+        """
+        key = (path, size)
+        surface = self.images.get(key)
+
+        if surface is None:
+            surface = pygame.image.load(path)
+            surface = pygame.transform.scale(surface, size)
+            # Converting needs a display; headless offscreen rendering keeps the loaded format
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self.images[key] = surface
+
+        return surface
+
+    def font(self, size, name=None, bold=False):
+        """
+        Returns a system font, creating it on first use.
+        """
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+
+        if font is None:
+            font = pygame.font.SysFont(name, size, bold=bold)
+            self.fonts[key] = font
+
+        return font
+
+    def text(self, text, size, color, name=None, bold=False):
+        """
+        Returns the rendered (antialiased) text surface, rendering it only on a cache miss.
+        """
+        key = (name, size, bold, text, color)
+        surface = self.texts.get(key)
+
+        if surface is not None:
+            self.texts.move_to_end(key)
+            return surface
+
+        surface = self.font(size, name, bold).render(text, True, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.text_cache_size:
+            self.texts.popitem(last=False)
+
+        return surface
+
+    def clear(self):
+        """
+        Drops every cached resource.
+        """
+        self.images.clear()
+        self.fonts.clear()
+        self.texts.clear()
+
+# Shared by the renderer, the game over screen and the main loop
+cache = ResourceCache()
+
+BOARD_IMAGE = os.path.join("assets", "board.png")
+SPIKE_IMAGE = os.path.join("assets", "spike.png")
+CROWN_IMAGE = os.path.join("assets", "crown.png")
@@ -0,0 +1,80 @@
+class TickScheduler:
+    """
+    Fixed-timestep scheduler for the simulation, independent of the render rate.
+    Ticks fall due every `timestep_ms` on a fixed grid. A tick is only completed once its moves are in,
+    so a late tick delays the next one instead of causing a burst of catch-up ticks.
+    `clock` is a callable returning milliseconds.
+
+    Ticks that fell due less than `max_lag_ms` ago still run on the grid, so the ticks that fell due while a
+    frame was drawn (several per frame at high speeds) are caught up in the next frame rather than dropped.
+
+    `speed` plays the schedule faster than real time: ticks fall due every timestep_ms / speed.
+    A speed of None is uncapped: every tick is due as soon as the previous one completes.
+    """
+    def __init__(self, timestep_ms, clock, speed=1, max_lag_ms=0):
+        self.timestep_ms = timestep_ms
+        self.clock = clock
+        self.speed = speed
+        self.max_lag_ms = max_lag_ms
+        self.reset()
+
+    @property
+    def interval_ms(self):
+        """
+        Returns the wall-clock time between ticks at the current speed (0 when uncapped).
+        """
+        return self.timestep_ms / self.speed if self.speed is not None else 0
+
+    def set_speed(self, speed):
+        """
+        Changes the playback speed; the next tick falls due one interval of the new speed from now.
+        """
+        self.speed = speed
+        self.hold()
+
+    def reset(self):
+        """
+        Restarts the schedule with the first tick due one timestep from now.
+        """
+        now = self.clock()
+        self.tick = 0
+        self.last_tick_time = now
+        self.next_tick_time = now + self.interval_ms
+
+    def hold(self):
+        """
+        Keeps the schedule paused (e.g. while the game is paused) so it resumes without catching up.
+        """
+        now = self.clock()
+        self.last_tick_time = now
+        self.next_tick_time = now + self.interval_ms
+
+    def tick_due(self):
+        """
+        Returns True if the next tick should start.
+        """
+        return self.speed is None or self.clock() >= self.next_tick_time
+
+    def complete_tick(self):
+        """
+        Records that the due tick has been simulated and schedules the next one.
+        """
+        now = self.clock()
+        self.tick += 1
+        self.last_tick_time = now
+        self.next_tick_time += self.interval_ms
+
+        # A tick stretched by slow controllers pushes the grid back rather than queueing extra ticks
+        if self.next_tick_time < now - self.max_lag_ms:
+            self.next_tick_time = now - self.max_lag_ms
+
+    def alpha(self):
+        """
+        Returns how far the display is between the last tick and the next one, from 0.0 to 1.0,
+        for interpolating movement in the renderer.
+        """
+        interval = self.interval_ms
+        if not interval:
+            return 1.0
+        elapsed = self.clock() - self.last_tick_time
+        return min(1.0, max(0.0, elapsed / interval))
@@ -0,0 +1,160 @@
+import struct
+from multiprocessing import shared_memory
+from core.occupancy import FOOD, OBSTACLE, SNAKE1, SNAKE2
+
+# Cell codes of the published grid
+EMPTY_CELL = 0
+OBSTACLE_CELL = 1
+FOOD_CELL = 2
+PLAYER1_BODY = 3
+PLAYER2_BODY = 4
+
+DIRECTIONS = ("left", "right", "up", "down")
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# Layout: header, one record per player, then one byte per cell in row-major order
+HEADER = struct.Struct("<4i")         # sequence, rows, cols, tick
+PLAYER_RECORD = struct.Struct("<5i")  # head row, head col, direction code, score, length
+PLAYER_OFFSETS = {1: HEADER.size, 2: HEADER.size + PLAYER_RECORD.size}
+GRID_OFFSET = HEADER.size + 2 * PLAYER_RECORD.size
+
+def _build_translation():
+    """
+    Maps every combination of occupancy flags to a single cell code.
+    """
+    table = bytearray(256)
+    for flags in range(256):
+        if flags & OBSTACLE:
+            table[flags] = OBSTACLE_CELL
+        elif flags & SNAKE1:
+            table[flags] = PLAYER1_BODY
+        elif flags & SNAKE2:
+            table[flags] = PLAYER2_BODY
+        elif flags & FOOD:
+            table[flags] = FOOD_CELL
+    return bytes(table)
+
+OCCUPANCY_TO_CELL = _build_translation()
+
+def uses_shared_board(controller):
+    """
+    Returns True if the controller module opted in to the shared board with `USE_SHARED_BOARD = True`.
+    """
+    return getattr(controller, "USE_SHARED_BOARD", False) is True
+
+class SharedBoard:
+    """
+    Engine side of the board snapshot published to controllers as a typed grid.
+    The grid is one byte per cell (see the *_CELL and *_BODY codes) followed by small head, direction and
+    score records, all in one buffer. With shared=True the buffer is a multiprocessing.shared_memory block
+    that controller processes attach to by name; otherwise it is a local bytearray for in-process controllers.
+    Publishing rewrites the grid with one bytes.translate of the occupancy grid and bumps a sequence number
+    (odd while writing) so readers can detect a snapshot that changed under them.
+    """
+    def __init__(self, rows, cols, shared=True):
+        self.rows = rows
+        self.cols = cols
+        size = GRID_OFFSET + rows * cols
+
+        if shared:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+            self.name = self.memory.name
+            self.buffer = self.memory.buf
+        else:
+            self.memory = None
+            self.name = None
+            self.buffer = memoryview(bytearray(size))
+
+        self.sequence = 0
+        HEADER.pack_into(self.buffer, 0, self.sequence, rows, cols, 0)
+        self.grid = self.buffer[GRID_OFFSET:GRID_OFFSET + rows * cols].toreadonly()
+
+    def publish(self, state, tick=0):
+        """
+        Writes the current game state into the buffer.
+        """
+        self.sequence += 1
+        HEADER.pack_into(self.buffer, 0, self.sequence, self.rows, self.cols, tick)
+
+        self.buffer[GRID_OFFSET:GRID_OFFSET + self.rows * self.cols] = state.occupancy.cells.translate(OCCUPANCY_TO_CELL)
+        for player in (state.player1, state.player2):
+            head = player.snake.head_position
+            PLAYER_RECORD.pack_into(self.buffer, PLAYER_OFFSETS[player.id], head["row"], head["col"], DIRECTION_CODES[player.snake.direction], player.score, player.snake.length)
+
+        self.sequence += 1
+        HEADER.pack_into(self.buffer, 0, self.sequence, self.rows, self.cols, tick)
+
+    def get_board_state(self, state, in_process):
+        """
+        Returns the lean board_state for opted-in controllers: dimensions, food and the grid itself
+        (in-process) or the shared memory name the controller worker attaches to.
+        """
+        board_state = {
+            "width": state.board.width,
+            "height": state.board.height,
+            "rows": self.rows,
+            "cols": self.cols,
+            "food_locations": list(state.food_map),
+            "phase": state.get_phase(),
+            "sudden_death_food": state.get_sudden_death_food_cell(),
+            "zobrist_hash": state.get_hash()
+        }
+        if in_process:
+            board_state["grid"] = self.grid
+        else:
+            board_state["shared_board"] = self.name
+        return board_state
+
+    def close(self):
+        """
+        Releases the buffer and removes the shared memory block.
+        """
+        self.grid.release()
+        if self.memory is not None:
+            self.buffer.release()
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+class SharedBoardView:
+    """
+    Controller side of a SharedBoard: a read-only view over the shared memory block, without copying.
+    `grid[row * cols + col]` is the cell code; wrap it with numpy.frombuffer(view.grid, dtype=numpy.uint8)
+    for a (rows * cols) array if NumPy is available.
+    Meant for controller worker processes started by the engine, which share its resource tracker;
+    the engine that created the block is responsible for removing it.
+    """
+    def __init__(self, name):
+        self.memory = shared_memory.SharedMemory(name=name)
+        self.buffer = self.memory.buf
+        _, self.rows, self.cols, _ = HEADER.unpack_from(self.buffer, 0)
+        self.grid = self.buffer[GRID_OFFSET:GRID_OFFSET + self.rows * self.cols].toreadonly()
+
+    @property
+    def sequence(self):
+        """
+        Returns the publish sequence number; odd while the engine is writing.
+        """
+        return HEADER.unpack_from(self.buffer, 0)[0]
+
+    @property
+    def tick(self):
+        """
+        Returns the tick of the published snapshot.
+        """
+        return HEADER.unpack_from(self.buffer, 0)[3]
+
+    def get_player(self, player_id):
+        """
+        Returns the head, direction, score and length record of a player.
+        """
+        row, col, direction, score, length = PLAYER_RECORD.unpack_from(self.buffer, PLAYER_OFFSETS[player_id])
+        return {"head_position": {"row": row, "col": col}, "direction": DIRECTIONS[direction], "score": score, "length": length}
+
+    def close(self):
+        """
+        Detaches from the shared memory block.
+        """
+        self.grid.release()
+        self.buffer.release()
+        self.memory.close()
@@ -1,30 +1,22 @@
-import pygame
+from collections import deque
 from config import config
 
-class SnakeSegment:
-    """
-    Represents a single segment of the snake.
-    Each segment is a square on the grid.
-    """
-    def __init__(self, position, color, border_color):
-        self.size = config.GRID_SIZE
-        self.position = position
-        self.color = color
-        self.border_color = border_color
+# Grid offset (row, col) of one step in each direction
+DIRECTION_DELTAS = {
+    "left": (0, -1),
+    "right": (0, 1),
+    "up": (-1, 0),
+    "down": (1, 0)
+}
 
-    def draw(self, board):
-        """
-        Draws the snake segment on the given board surface.
-        """
-        x = self.position["col"] * self.size
-        y = self.position["row"] * self.size
-        segment = pygame.Rect(x, y, self.size, self.size)
-        pygame.draw.rect(board, self.color, segment)
-        pygame.draw.rect(board, self.border_color, segment, 2)
+# Two-bit code of each direction, for recording moves compactly (see core.replay)
+DIRECTION_CODES = {"left": 0, "right": 1, "up": 2, "down": 3}
 
 class Snake:
     """
-    Represents the snake in the game, including its body segments, direction, and movement.
+    Represents the snake in the game, including its body, direction, and movement.
+    The body is a deque of (row, col) cells, head first, with a per-cell segment count,
+    so a move is one head push and one tail pop and head-in-body checks are O(1).
     """
     def __init__(self, position, direction, color, border_color):
         self.size = config.GRID_SIZE
@@ -32,53 +24,74 @@ class Snake:
         self.direction = direction
         self.color = color
         self.border_color = border_color
-        self.last_position = position.copy()
         self.head_position = position.copy()
-        self.tail_position = position.copy()
-        self.movement_accumulator = 0
-        self.body = [SnakeSegment(position, color, border_color)]
-    
-    def draw(self, board):
+        cell = (position["row"], position["col"])
+        self.last_position = cell
+        self.body = deque([cell])
+        self.cell_counts = {cell: 1}
+        # Number of moves made, used to tell which head cells are new since an earlier snapshot
+        self.moves = 0
+        # Set by OccupancyGrid.attach_snake so moves keep the grid up to date
+        self.occupancy = None
+        self.owner = None
+
+    @property
+    def tail_position(self):
+        """
+        Returns the tail cell as a {"row", "col"} dictionary.
         """
-        Draws the snake on the given board surface.
+        row, col = self.body[-1]
+        return {"row": row, "col": col}
+
+    def occupies(self, cell):
+        """
+        Returns True if any segment of the snake, including the head, is in the (row, col) cell.
+        """
+        return cell in self.cell_counts
+
+    def head_in_body(self):
+        """
+        Returns True if the head shares its cell with another segment of the same snake.
         """
-        for segment in self.body:
-            segment.draw(board)
-            
+        return self.cell_counts[self.body[0]] > 1
+
     def grow(self):
         """
         Increases the length of the snake by adding a new segment at the end of the body.
-        """      
-        new_segment = SnakeSegment(self.last_position.copy(), self.color, self.border_color)
-        self.body.append(new_segment)
+        """
+        cell = self.last_position
+        self.body.append(cell)
+        self.cell_counts[cell] = self.cell_counts.get(cell, 0) + 1
         self.length += 1
-        
+
+        if self.occupancy is not None:
+            self.occupancy.add_body(self.owner, cell[0], cell[1])
+
     def move(self):
         """
         Moves the snake one grid unit in its current direction.
         This method is now called discretely based on the AI update interval.
         """
         # Update head position based on current direction
-        if self.direction == "left":
-            self.head_position["col"] -= 1
-        elif self.direction == "right":
-            self.head_position["col"] += 1
-        elif self.direction == "up":
-            self.head_position["row"] -= 1
-        elif self.direction == "down":
-            self.head_position["row"] += 1
-            
-        # Update body segments
-        # Move all segments to the position of the segment in front of them, starting from the tail
-        if self.body:
-            # The last segment's current position becomes the new `last_position` for growth
-            self.last_position = self.body[-1].position.copy()
+        d_row, d_col = DIRECTION_DELTAS[self.direction]
+        self.head_position["row"] += d_row
+        self.head_position["col"] += d_col
+        head = (self.head_position["row"], self.head_position["col"])
 
-            for i in range(len(self.body) - 1, 0, -1):
-                self.body[i].position = self.body[i-1].position.copy() # Move segment to previous segment's pos
+        # The tail cell is vacated and becomes the new `last_position` for growth
+        tail = self.body.pop()
+        self.last_position = tail
+        count = self.cell_counts[tail] - 1
+        if count:
+            self.cell_counts[tail] = count
+        else:
+            del self.cell_counts[tail]
 
-            # The first body segment (which was previously the head) gets the old head position
-            self.body[0].position = self.head_position.copy()
+        self.body.appendleft(head)
+        self.moves += 1
+        self.cell_counts[head] = self.cell_counts.get(head, 0) + 1
 
-            # Update tail position
-            self.tail_position = self.body[-1].position.copy()
\ No newline at end of file
+        # Only the vacated tail and the new head change in the occupancy grid
+        if self.occupancy is not None:
+            self.occupancy.remove_body(self.owner, tail[0], tail[1])
+            self.occupancy.add_body(self.owner, head[0], head[1])
@@ -0,0 +1,222 @@
+from collections import deque
+
+# Update types sent to controllers that opted in to state deltas
+FULL_UPDATE = "full"
+DELTA_UPDATE = "delta"
+
+class StateDeltaError(Exception):
+    """
+    Raised when a controller's view of the game no longer matches the engine's.
+    """
+
+def uses_state_deltas(controller):
+    """
+    Returns True if the controller module opted in to state deltas with `USE_STATE_DELTAS = True`.
+    """
+    return getattr(controller, "USE_STATE_DELTAS", False) is True
+
+def is_state_update(board_state):
+    """
+    Returns True if a board_state argument is a state update rather than a full snapshot.
+    """
+    return isinstance(board_state, dict) and board_state.get("update") in (FULL_UPDATE, DELTA_UPDATE)
+
+def _check(state):
+    """
+    Returns the values a controller view is validated against after every update:
+    head, tail and length of each snake and the number of food items.
+    """
+    check = {"food": len(state.food_map)}
+    for player in (state.player1, state.player2):
+        body = player.snake.body
+        check[player.id] = (body[0], body[-1], len(body))
+    return check
+
+class DeltaTracker:
+    """
+    Engine side of the state delta protocol for one controller.
+    The first update carries the full snapshot; later ones only carry what changed since the last update sent:
+    the cells each head moved through, the new lengths (the controller drops tail cells to match), food spawned
+    and eaten, directions and scores that changed, and the game phase and sudden death food cell.
+    Every update also carries a cheap check of heads, tails,
+    lengths and food count; a controller whose view fails it reports an error and the engine calls `reset`,
+    so the next update is a full one again.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets what the controller has seen, so the next update is a full snapshot.
+        """
+        self.synced = False
+        self.moves = {}
+        self.directions = {}
+        self.scores = {}
+        self.food = set()
+
+    def remember(self, state):
+        """
+        Records the state the controller was just sent.
+        """
+        for player in (state.player1, state.player2):
+            self.moves[player.id] = player.snake.moves
+            self.directions[player.id] = player.snake.direction
+            self.scores[player.id] = player.score
+        self.food = set(state.food_map)
+        self.synced = True
+
+    def build(self, state, player, opponent, tick=0):
+        """
+        Returns the update to send to the given player's controller.
+        """
+        if not self.synced:
+            update = {
+                "update": FULL_UPDATE,
+                "tick": tick,
+                "board_state": state.get_board_state(),
+                "player_state": state.get_player_state(player),
+                "opponent_state": state.get_player_state(opponent)
+            }
+        else:
+            food = set(state.food_map)
+            players = {}
+            for changed in (state.player1, state.player2):
+                snake = changed.snake
+                steps = min(snake.moves - self.moves[changed.id], len(snake.body))
+                player_delta = {
+                    "heads": [snake.body[i] for i in range(steps - 1, -1, -1)],
+                    "length": len(snake.body)
+                }
+                if snake.direction != self.directions[changed.id]:
+                    player_delta["direction"] = snake.direction
+                if changed.score != self.scores[changed.id]:
+                    player_delta["score"] = changed.score
+                players[changed.id] = player_delta
+
+            update = {
+                "update": DELTA_UPDATE,
+                "tick": tick,
+                "players": players,
+                "food_spawned": list(food - self.food),
+                "food_eaten": list(self.food - food),
+                "phase": state.get_phase(),
+                "sudden_death_food": state.get_sudden_death_food_cell(),
+                "zobrist_hash": state.get_hash()
+            }
+
+        update["check"] = _check(state)
+        self.remember(state)
+        return update
+
+class StateView:
+    """
+    Controller side of the state delta protocol: a mirror of the usual board_state, player_state and
+    opponent_state dictionaries, updated in place from each update instead of rebuilt.
+    The mirrored "body" lists are deques (head first), so pushing heads and dropping tails stays O(1).
+    After each update board_state["delta"] describes what changed, for controllers that keep their own structures.
+    """
+    def __init__(self):
+        self.board_state = None
+        self.states = {}
+        self.player_id = None
+        self.opponent_id = None
+
+    def load(self, update):
+        """
+        Replaces the view with the full snapshot of a full update.
+        """
+        self.board_state = update["board_state"]
+        self.board_state["food_locations"] = list(self.board_state["food_locations"])
+        player_state, opponent_state = update["player_state"], update["opponent_state"]
+        for state in (player_state, opponent_state):
+            state["body"] = deque(state["body"])
+        self.player_id = player_state["id"]
+        self.opponent_id = opponent_state["id"]
+        self.states = {self.player_id: player_state, self.opponent_id: opponent_state}
+
+        self.board_state["delta"] = {
+            "tick": update["tick"],
+            "full": True,
+            "added": {self.player_id: [], self.opponent_id: []},
+            "removed": {self.player_id: [], self.opponent_id: []},
+            "food_spawned": [],
+            "food_eaten": [],
+            "directions": {}
+        }
+
+    def apply_delta(self, update):
+        """
+        Applies the changes of a delta update to the view.
+        """
+        if self.board_state is None:
+            raise StateDeltaError("Received a state delta before a full state update")
+
+        delta = {"tick": update["tick"], "full": False, "added": {}, "removed": {}, "directions": {}}
+        for player_id, player_delta in update["players"].items():
+            state = self.states[player_id]
+            body = state["body"]
+            for row, col in player_delta["heads"]:
+                body.appendleft({"row": row, "col": col})
+
+            removed = []
+            while len(body) > player_delta["length"]:
+                segment = body.pop()
+                removed.append((segment["row"], segment["col"]))
+
+            if body:
+                state["head_position"] = body[0].copy()
+            state["length"] = player_delta["length"]
+            if "direction" in player_delta:
+                state["direction"] = player_delta["direction"]
+                delta["directions"][player_id] = player_delta["direction"]
+            if "score" in player_delta:
+                state["score"] = player_delta["score"]
+            delta["added"][player_id] = player_delta["heads"]
+            delta["removed"][player_id] = removed
+
+        food_locations = self.board_state["food_locations"]
+        for cell in update["food_eaten"]:
+            food_locations.remove(cell)
+        food_locations.extend(update["food_spawned"])
+        delta["food_spawned"] = update["food_spawned"]
+        delta["food_eaten"] = update["food_eaten"]
+        self.board_state["delta"] = delta
+        self.board_state["phase"] = update["phase"]
+        self.board_state["sudden_death_food"] = update["sudden_death_food"]
+        self.board_state["zobrist_hash"] = update["zobrist_hash"]
+
+    def validate(self, check):
+        """
+        Raises StateDeltaError if the view disagrees with the engine's check values.
+        """
+        if len(self.board_state["food_locations"]) != check["food"]:
+            raise StateDeltaError("Controller view is out of sync: food count differs")
+
+        for player_id, state in self.states.items():
+            body = state["body"]
+            head, tail, length = check[player_id]
+            if len(body) != length or not body:
+                raise StateDeltaError(f"Controller view is out of sync: player {player_id} length differs")
+            if (body[0]["row"], body[0]["col"]) != tuple(head) or (body[-1]["row"], body[-1]["col"]) != tuple(tail):
+                raise StateDeltaError(f"Controller view is out of sync: player {player_id} body differs")
+
+    def apply(self, update):
+        """
+        Applies a full or delta update, validates the result and returns the
+        (board_state, player_state, opponent_state) arguments for get_next_move.
+        """
+        try:
+            if update["update"] == FULL_UPDATE:
+                self.load(update)
+            else:
+                self.apply_delta(update)
+            self.validate(update["check"])
+        except StateDeltaError:
+            self.board_state = None
+            raise
+        except (KeyError, ValueError) as e:
+            self.board_state = None
+            raise StateDeltaError(f"Could not apply state update: {e!r}") from e
+
+        return self.board_state, self.states[self.player_id], self.states[self.opponent_id]
@@ -0,0 +1,239 @@
+import importlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from config import config
+from core.match import Match
+from core import replay as replays
+from core import replay_archive
+
+# Matches are capped so that two snakes circling forever in sudden death cannot stall the bracket
+DEFAULT_MAX_TICKS = 2 * (config.GAME_DURATION + config.PRE_SUDDEN_DEATH_MESSAGE_DURATION) // config.AI_UPDATE_INTERVAL_MS
+
+# Seconds a match may take before the player whose controller used more time forfeits: twice a live game
+DEFAULT_TIME_LIMIT = 2 * config.GAME_DURATION / 1000
+
+def discover_controllers(directory):
+    """
+    Imports every module in the directory and returns the search path and the module names of those
+    that implement the controller API (`get_next_move` and `set_player_name`).
+    A module that fails to import is reported and skipped.
+    """
+    directory = os.path.abspath(directory)
+    search_path, package = os.path.split(directory)
+    if search_path not in sys.path:
+        sys.path.insert(0, search_path)
+
+    module_names = []
+    for filename in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(filename)
+        if extension != ".py" or stem.startswith("_"):
+            continue
+
+        module_name = f"{package}.{stem}"
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            print(f"Skipping {module_name}: {type(e).__name__}: {e}")
+            continue
+        if callable(getattr(module, "get_next_move", None)) and callable(getattr(module, "set_player_name", None)):
+            module_names.append(module_name)
+
+    return search_path, module_names
+
+def _init_worker(search_path, spare_cores):
+    """
+    Makes the controller directory importable inside a pool worker and tells its controllers how many spare
+    cores each may use for processes of their own (see config.SPARE_CORES_VARIABLE).
+    """
+    if search_path not in sys.path:
+        sys.path.insert(0, search_path)
+    os.environ[config.SPARE_CORES_VARIABLE] = str(spare_cores)
+
+def play_match(job):
+    """
+    Plays one match in a pool worker and returns its result, with the match's binary replay under "replay".
+    Each controller runs in its own worker process with the per-move deadline, so a slow or hung entrant
+    cannot stall the pool; see Match. A controller that fails to load forfeits the match.
+    """
+    match_id, stage, controller1, controller2, max_ticks, time_limit = job
+    result = {"match_id": match_id, "stage": stage, "controller1": controller1, "controller2": controller2}
+
+    match = None
+    try:
+        match = Match(controller1, controller2, max_ticks=max_ticks, isolated=True, time_limit=time_limit)
+        result.update(match.run())
+        result["replay"] = match.get_replay()
+    except Exception as e:
+        result["error"] = str(e)
+        result["winner"] = None
+    finally:
+        if match is not None:
+            match.close()
+
+    return result
+
+def seeding_order(bracket_size):
+    """
+    Returns the seed numbers (1-based) in bracket order, so that seed 1 and seed 2 can only meet in the final.
+    """
+    order = [1]
+    while len(order) < bracket_size:
+        size = len(order) * 2
+        order = [seed for s in order for seed in (s, size + 1 - s)]
+    return order
+
+class Tournament:
+    """
+    Runs a round-robin seeding stage followed by a single elimination bracket.
+    Independent matches of each stage are played at the same time across a process pool.
+    """
+    def __init__(self, directory, workers=None, max_ticks=DEFAULT_MAX_TICKS, max_replays=2, seeding=True, time_limit=DEFAULT_TIME_LIMIT):
+        self.search_path, self.entrants = discover_controllers(directory)
+        self.workers = workers or os.cpu_count()
+        self.max_ticks = max_ticks
+        self.time_limit = time_limit
+        self.max_replays = max_replays
+        self.seeding = seeding
+        self.results = []
+        # Binary replay of every match played, by match id
+        self.replay_data = {}
+        self.standings = {name: {"controller": name, "wins": 0, "draws": 0, "losses": 0, "food_for": 0, "food_against": 0} for name in self.entrants}
+        self.placements = {}
+        self._next_match_id = 0
+
+    def _job(self, stage, controller1, controller2):
+        self._next_match_id += 1
+        return (self._next_match_id, stage, controller1, controller2, self.max_ticks, self.time_limit)
+
+    def _play(self, pool, jobs):
+        results = list(pool.map(play_match, jobs))
+        for result in results:
+            data = result.pop("replay", None)
+            if data is not None:
+                self.replay_data[result["match_id"]] = data
+        self.results.extend(results)
+        return results
+
+    def _winner_name(self, result):
+        if result["winner"] == 1:
+            return result["controller1"]
+        if result["winner"] == 2:
+            return result["controller2"]
+        return None
+
+    def run_seeding(self, pool):
+        """
+        Plays every pairing once and returns the entrants ordered by points, then food difference.
+        """
+        jobs = [self._job("seeding", a, b) for a, b in combinations(self.entrants, 2)]
+
+        for result in self._play(pool, jobs):
+            first, second = self.standings[result["controller1"]], self.standings[result["controller2"]]
+            first["food_for"] += result.get("player1_score", 0)
+            first["food_against"] += result.get("player2_score", 0)
+            second["food_for"] += result.get("player2_score", 0)
+            second["food_against"] += result.get("player1_score", 0)
+
+            if result["winner"] == 1:
+                first["wins"] += 1
+                second["losses"] += 1
+            elif result["winner"] == 2:
+                second["wins"] += 1
+                first["losses"] += 1
+            else:
+                first["draws"] += 1
+                second["draws"] += 1
+
+        return sorted(self.entrants, key=lambda name: (
+            -(2 * self.standings[name]["wins"] + self.standings[name]["draws"]),
+            -(self.standings[name]["food_for"] - self.standings[name]["food_against"]),
+            name
+        ))
+
+    def run_elimination(self, pool, seeds):
+        """
+        Plays the single elimination bracket and returns the champion.
+        Drawn matches are replayed with sides swapped; if still drawn, the higher seed advances.
+        """
+        bracket_size = 1
+        while bracket_size < len(seeds):
+            bracket_size *= 2
+
+        seed_of = {name: i + 1 for i, name in enumerate(seeds)}
+        bracket = [seeds[s - 1] if s <= len(seeds) else None for s in seeding_order(bracket_size)]
+        round_number = 1
+
+        while len(bracket) > 1:
+            stage = f"round {round_number}"
+            pairs = [(bracket[i], bracket[i + 1]) for i in range(0, len(bracket), 2)]
+            winners = [a if b is None else b if a is None else None for a, b in pairs]
+            pending = [i for i, (a, b) in enumerate(pairs) if a is not None and b is not None]
+
+            for replay in range(self.max_replays + 1):
+                if not pending:
+                    break
+                jobs = []
+                for i in pending:
+                    a, b = pairs[i]
+                    jobs.append(self._job(stage, a, b) if replay % 2 == 0 else self._job(stage, b, a))
+                for i, result in zip(pending, self._play(pool, jobs)):
+                    winners[i] = self._winner_name(result)
+                pending = [i for i in pending if winners[i] is None]
+
+            for i in pending:
+                winners[i] = min(pairs[i], key=lambda name: seed_of[name])
+
+            for (a, b), winner in zip(pairs, winners):
+                for name in (a, b):
+                    if name is not None and name != winner:
+                        self.placements[name] = stage
+            bracket = winners
+            round_number += 1
+
+        champion = bracket[0]
+        self.placements[champion] = "champion"
+        return champion
+
+    def run(self):
+        """
+        Plays the whole tournament and returns the champion's module name, or None if there are no entrants.
+        """
+        if not self.entrants:
+            return None
+        # Every match in flight runs two controller processes; cores beyond those are shared out between them
+        spare_cores = max(0, (os.cpu_count() or 1) - 2 * self.workers) // (2 * self.workers)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.search_path, spare_cores)) as pool:
+            seeds = self.run_seeding(pool) if self.seeding and len(self.entrants) > 1 else list(self.entrants)
+            for seed, name in enumerate(seeds, start=1):
+                self.standings[name]["seed"] = seed
+            return self.run_elimination(pool, seeds)
+
+    def write_results(self, output_directory):
+        """
+        Writes standings.json and matches.json to the output directory, the replay of each match
+        to replays/match_<id>.replay and all of them to replays.archive for seeking (see core.replay_archive).
+        """
+        os.makedirs(output_directory, exist_ok=True)
+
+        standings = []
+        for name in sorted(self.standings, key=lambda name: self.standings[name].get("seed", 0)):
+            entry = dict(self.standings[name])
+            entry["placement"] = self.placements.get(name)
+            standings.append(entry)
+
+        with open(os.path.join(output_directory, "standings.json"), "w") as f:
+            json.dump(standings, f, indent=2)
+        with open(os.path.join(output_directory, "matches.json"), "w") as f:
+            json.dump(self.results, f, indent=2)
+
+        replay_directory = os.path.join(output_directory, "replays")
+        os.makedirs(replay_directory, exist_ok=True)
+        for match_id, data in self.replay_data.items():
+            replays.save(os.path.join(replay_directory, f"match_{match_id:04d}.replay"), data)
+
+        names = {result["match_id"]: (result.get("player1"), result.get("player2")) for result in self.results}
+        matches = [(match_id, data, names.get(match_id)) for match_id, data in sorted(self.replay_data.items())]
+        replay_archive.write(os.path.join(output_directory, "replays.archive"), matches)
@@ -0,0 +1,142 @@
+import random
+
+# Fixed seed, so the engine and every controller process draw the same keys
+ZOBRIST_SEED = 0x5A4B
+
+DIRECTIONS = ("left", "right", "up", "down")
+
+class ZobristKeys:
+    """
+    Random 64-bit keys for Zobrist hashing of a rows x cols game: one per (player, body cell),
+    food cell, obstacle cell, (player, head cell), (player, tail cell), (player, direction) and
+    (player, score), plus one for sudden death.
+
+    A position's hash is the XOR of the keys of everything in it, so a move only XORs out what
+    left and XORs in what arrived. Keys are indexed by the flat cell index row * cols + col; heads
+    and tails off the board (after a wall collision) use one extra key per player.
+    """
+    def __init__(self, rows, cols, seed=ZOBRIST_SEED):
+        self.rows = rows
+        self.cols = cols
+        self.rng = random.Random(seed)
+        size = rows * cols
+        draw = self.rng.getrandbits
+
+        self.body = {player: [draw(64) for _ in range(size)] for player in (1, 2)}
+        self.food = [draw(64) for _ in range(size)]
+        self.obstacle = [draw(64) for _ in range(size)]
+        self.head = {player: [draw(64) for _ in range(size + 1)] for player in (1, 2)}
+        self.tail = {player: [draw(64) for _ in range(size + 1)] for player in (1, 2)}
+        self.direction = {player: {direction: draw(64) for direction in DIRECTIONS} for player in (1, 2)}
+        self.sudden_death = draw(64)
+        # Score keys are drawn as scores are reached, from a stream per player so a score's key
+        # does not depend on the order scores were first reached in this process
+        self.score_rngs = {player: random.Random(f"{seed}-score-{player}") for player in (1, 2)}
+        self.scores = {1: [], 2: []}
+
+    def cell_index(self, row, col):
+        """
+        Returns the key index of a cell, or the extra off-board index.
+        """
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return self.rows * self.cols
+
+    def score(self, player, score):
+        """
+        Returns the key of a player's score, drawing keys for new scores as they are reached.
+        """
+        keys = self.scores[player]
+        while len(keys) <= score:
+            keys.append(self.score_rngs[player].getrandbits(64))
+        return keys[score]
+
+    def snake_key(self, player, head, tail, direction, score):
+        """
+        Returns the combined key of a snake's head and tail cells ((row, col) tuples), direction and score.
+        """
+        return (self.head[player][self.cell_index(*head)] ^ self.tail[player][self.cell_index(*tail)]
+                ^ self.direction[player][direction] ^ self.score(player, score))
+
+_keys = {}
+
+def keys_for(rows, cols):
+    """
+    Returns the shared ZobristKeys of a board size.
+    """
+    keys = _keys.get((rows, cols))
+    if keys is None:
+        keys = _keys[(rows, cols)] = ZobristKeys(rows, cols)
+    return keys
+
+# Transposition table entry bounds
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by Zobrist hash, for recognising positions
+    reached through different move orders.
+
+    The table has 2**size_bits slots, indexed by the low bits of the hash, and never grows.
+    A new entry replaces the one in its slot if the slot is empty, holds the same position, was stored
+    by an earlier search (see `new_search`), or was searched less deeply.
+    """
+    def __init__(self, size_bits=16):
+        size = 1 << size_bits
+        self.mask = size - 1
+        self.hashes = [None] * size
+        self.values = [None] * size
+        self.depths = [0] * size
+        self.flags = [EXACT] * size
+        self.moves = [None] * size
+        self.ages = [0] * size
+        self.age = 0
+        self.stored = 0
+        self.hits = 0
+
+    def new_search(self):
+        """
+        Marks the entries stored so far as older, so the next search may overwrite them first.
+        """
+        self.age += 1
+
+    def store(self, position_hash, value, depth=0, flag=EXACT, move=None):
+        """
+        Stores a search result, unless the slot holds a deeper result for another position from the current search.
+        """
+        slot = position_hash & self.mask
+        stored_hash = self.hashes[slot]
+        if stored_hash is not None and stored_hash != position_hash and self.ages[slot] == self.age and self.depths[slot] > depth:
+            return False
+
+        if stored_hash is None:
+            self.stored += 1
+        self.hashes[slot] = position_hash
+        self.values[slot] = value
+        self.depths[slot] = depth
+        self.flags[slot] = flag
+        self.moves[slot] = move
+        self.ages[slot] = self.age
+        return True
+
+    def lookup(self, position_hash):
+        """
+        Returns (value, depth, flag, move) stored for the position, or None.
+        """
+        slot = position_hash & self.mask
+        if self.hashes[slot] != position_hash:
+            return None
+        self.hits += 1
+        return self.values[slot], self.depths[slot], self.flags[slot], self.moves[slot]
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        size = self.mask + 1
+        self.hashes = [None] * size
+        self.values = [None] * size
+        self.stored = 0
+        self.hits = 0
@@ -1,284 +1,482 @@
 # --- Python Standard and Third-Party Libraries ---
+import argparse
+import os
 import pygame
-import threading
-import traceback
-import queue
-from itertools import chain
+import time
 
 # --- Project Modules ---
 from config import config
 import core.board as board_module
-import core.scorebar as scorebar_module
 import core.player as player
 import core.game_state as game_state
 import config.colors as colors
 import core.game_over_screen as game_over_screen
-
-# --- Pygame Initialization ---
-pygame.init()
-
-# --- Screen Setup ---
-screen_width = config.SCREEN_WIDTH
-screen_height = config.SCREEN_HEIGHT
-screen = pygame.display.set_mode((screen_width, screen_height))
-pygame.display.set_caption(config.TITLE)
-
-# --- Timing Setup ---
-clock = pygame.time.Clock()
-game_start_time = pygame.time.get_ticks()
-max_game_duration = config.GAME_DURATION
-timer_font = pygame.font.SysFont(None, 36)
-
-# --- Title Display Setup ---
-title_font = pygame.font.SysFont(None, 40)
-title_surface = title_font.render(config.TITLE, True, "white")
-
-# --- Game Board and Scorebar ---
-game_board = board_module.Board(config.BOARD_WIDTH, config.BOARD_HEIGHT)
-game_scorebar = scorebar_module.ScoreBar(config.SCOREBAR_POS_X, config.SCOREBAR_POS_Y, screen)
+import core.renderer as renderer_module
+from core.controller_worker import ControllerWorker, PendingMoves
+from core.scheduler import TickScheduler
+from core.clock import TickClock
+from core.shared_board import SharedBoard
+from core.match import VALID_DIRECTIONS, is_logged_error
+from core import events
+from core import replay
+from core import replay_archive
+from core import resources
 
 # --- Controller Modules ---
 player1_controller_module = "controllers.player1_controller"
 player2_controller_module = "controllers.player2_controller"
 
-# --- Players Initialization ---
-player1 = player.Player(1, game_board, player1_controller_module)
-player2 = player.Player(2, game_board, player2_controller_module)
-
-# --- Game State ---
-state = game_state.GameState(game_board, player1, player2)
-
-# --- Game Over Screen ---
-game_over_screen = game_over_screen.GameOverScreen()
-
-# --- AI Timing Setup ---
-last_ai_update_time = pygame.time.get_ticks()
-
-# --- AI Thread Communication Queues ---
-p1_result_queue = queue.Queue()
-p2_result_queue = queue.Queue()
 
-
-def ai_worker(player_obj, board_state_data, player_state_data, opponent_state_data, result_queue):
-    """
-    Thread worker for executing a player's AI move logic.
-    Puts result (direction) into result_queue.
+class Game:
     """
-    try:
-        direction = player_obj.controller.get_next_move(board_state_data, player_state_data, opponent_state_data)
-        if direction in ["left", "right", "up", "down"]:
-            result_queue.put(direction)
-        else:
-            result_queue.put(None)
-    except Exception as e:
-        print(f"Error in {player_obj.name}'s controller: {e}")
-        traceback.print_exc()
-        result_queue.put(None)
-
-
-def get_player_state(player_obj):
-    """
-    Returns a dictionary snapshot of the given player's state.
-    """
-    return {
-        "id": player_obj.id,
-        "head_position": player_obj.snake.head_position.copy(),
-        "body": [{"row": seg.position["row"], "col": seg.position["col"]} for seg in player_obj.snake.body],
-        "direction": player_obj.snake.direction,
-        "score": player_obj.score,
-        "length": len(player_obj.snake.body)
-    }
-
-
-def restart_game():
+    Owns the pygame window, the game state and the controller worker processes, and runs the main loop.
     """
-    Resets the game by reinitializing players, game state, and timers.
-    """
-    global player1, player2, state, game_start_time, last_ai_update_time
-    player1 = player.Player(1, game_board, player1_controller_module)
-    player2 = player.Player(2, game_board, player2_controller_module)
-    state = game_state.GameState(game_board, player1, player2)
-    game_start_time = pygame.time.get_ticks()
-    last_ai_update_time = pygame.time.get_ticks()
-
-
-# --- Main Game Loop ---
-running = True
-while running:
+    def __init__(self):
+        # --- Pygame Initialization ---
+        pygame.init()
+
+        # --- Screen Setup ---
+        self.screen_width = config.SCREEN_WIDTH
+        self.screen_height = config.SCREEN_HEIGHT
+        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        pygame.display.set_caption(config.TITLE)
+
+        # --- Timing Setup ---
+        self.clock = pygame.time.Clock()
+        self.timer_text = "00:00"
+        self.timer_color = "White"
+
+        # --- Title Display Setup ---
+        self.title_surface = resources.cache.text(config.TITLE, 40, "white")
+
+        # --- Game Board and Renderer ---
+        self.game_board = board_module.Board(config.BOARD_WIDTH, config.BOARD_HEIGHT)
+        self.renderer = renderer_module.Renderer(self.screen, self.game_board)
+
+        # --- Game Over Screen ---
+        self.game_over_screen = game_over_screen.GameOverScreen()
+
+        # --- Controller Worker Processes ---
+        self.start_controllers()
+
+        # --- Simulation Scheduler ---
+        # Game time is counted in ticks, so it runs at whatever playback speed the scheduler is set to;
+        # ticks that fell due while a frame was drawn are caught up in the next one
+        self.game_clock = TickClock(config.AI_UPDATE_INTERVAL_MS)
+        self.scheduler = TickScheduler(config.AI_UPDATE_INTERVAL_MS, pygame.time.get_ticks, max_lag_ms=1000 / config.FPS)
+        self.paused = False
+        self.step_requested = False
+
+        # --- Players and Game State ---
+        self.restart_game()
+
+    def start_controllers(self):
+        """
+        Starts the controller worker processes and the shared board snapshot for opted-in controllers.
+        Workers outlive restarts so each controller is imported only once.
+        """
+        self.p1_worker = ControllerWorker(player1_controller_module)
+        self.p2_worker = ControllerWorker(player2_controller_module)
+        # Errors reported by each player's controller, so repeats are only printed now and then
+        self.controller_errors = {1: 0, 2: 0}
+        self.shared_board = SharedBoard(self.game_board.rows, self.game_board.cols)
+
+    def close(self):
+        """
+        Stops the controller worker processes and releases the shared board.
+        """
+        self.p1_worker.stop()
+        self.p2_worker.stop()
+        self.shared_board.close()
+
+    def restart_game(self):
+        """
+        Resets the game by reinitializing players, game state, and timers.
+        """
+        self.player1 = player.Player(1, self.game_board, player1_controller_module)
+        self.player2 = player.Player(2, self.game_board, player2_controller_module)
+        self.game_clock.reset()
+        self.state = game_state.GameState(self.game_board, self.player1, self.player2, clock=self.game_clock)
+        self.scheduler.reset()
+        self.pending_moves = None
+        self.game_over_drawn = False
+        self.replay_saved = False
+
+    def handle_events(self):
+        """
+        Processes window events. Returns False when the window is closed.
+        Keys 1-4 pick a playback speed, space pauses and resumes, and N plays a single tick while paused.
+        """
+        running = True
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            else:
+                self.handle_event(event)
 
-    # --- Event Handling ---
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+        return running
 
+    def handle_event(self, event):
+        """
+        Handles one window event other than closing the window.
+        """
         # Restart game on mouse click over button or 'R' key press
         if event.type == pygame.MOUSEBUTTONDOWN:
             mouse_pos = pygame.mouse.get_pos()
-            width = game_over_screen.restart_button.width
-            height = game_over_screen.restart_button.height
+            width = self.game_over_screen.restart_button.width
+            height = self.game_over_screen.restart_button.height
 
-            if state.game_over:
+            if self.state.game_over:
                 if config.RESTART_BUTTON_X <= mouse_pos[0] <= config.RESTART_BUTTON_Y + width and config.RESTART_BUTTON_Y <= mouse_pos[1] <= config.RESTART_BUTTON_Y + height:
-                    restart_game()
+                    self.restart_game()
 
         if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_r and state.game_over:
-                restart_game()
-
-    # --- Game Logic ---
-    if not state.game_over:
-        current_loop_time = pygame.time.get_ticks()
-        elapsed_game_time = current_loop_time - game_start_time
-
-        # Activate pre-sudden-death if time limit reached
-        if not state.sudden_death_active and not state.pre_sudden_death_active and elapsed_game_time >= max_game_duration:
-            if player1.score == player2.score:
-                state.start_pre_sudden_death()
-            else:
-                state.calculate_winner(player1, player2)
-
-        # Transition to sudden death after pre-message delay
-        if state.pre_sudden_death_active:
-            if current_loop_time - state.pre_sudden_death_start_time >= config.PRE_SUDDEN_DEATH_MESSAGE_DURATION:
-                state.start_sudden_death()
-        else:
-            # AI Update Interval
-            if current_loop_time - last_ai_update_time >= config.AI_UPDATE_INTERVAL_MS:
-                last_ai_update_time = current_loop_time
-
-                # Build board state snapshot for controllers
-                board_snapshot = {
-                    "width": game_board.width,
-                    "height": game_board.height,
-                    "rows": game_board.rows,
-                    "cols": game_board.cols,
-                    "food_locations": [(food.grid_row, food.grid_col) for food in state.food_locations],
-                    "obstacle_locations": list(chain.from_iterable(obs.get_occupied_positions() for obs in state.obstacle_locations))
-                }
-
-                # Capture current player states
-                p1_state = get_player_state(player1)
-                p2_state = get_player_state(player2)
-
-                # Clear any leftover AI results
-                while not p1_result_queue.empty():
-                    p1_result_queue.get_nowait()
-                while not p2_result_queue.empty():
-                    p2_result_queue.get_nowait()
-
-                # Start AI threads
-                p1_thread = threading.Thread(target=ai_worker, args=(player1, board_snapshot, p1_state, p2_state, p1_result_queue), daemon=True)
-                p2_thread = threading.Thread(target=ai_worker, args=(player2, board_snapshot, p2_state, p1_state, p2_result_queue), daemon=True)
-                p1_thread.start()
-                p2_thread.start()
-
-                # Retrieve AI move decisions with timeout
-                p1_thread.join(timeout=config.CONTROLLER_TIMEOUT_SECONDS)
-                p2_thread.join(timeout=config.CONTROLLER_TIMEOUT_SECONDS)
-                
-                try:
-                    p1_direction = p1_result_queue.get_nowait()
-                    
-                    if p1_direction is None:
-                        print("Player 1 controller failed to return a valid result. Using current direction.")
-                        p1_direction = player1.snake.direction
-                        
-                except queue.Empty:
-                    print("Player 1 controller timed out. Using current direction.")
-                    p1_direction = player1.snake.direction
-
-                try:
-                    p2_direction = p2_result_queue.get_nowait()
-                    
-                    if p2_direction is None:
-                        print("Player 2 controller failed to return a valid result. Using current direction.")
-                        p2_direction = player2.snake.direction
-                        
-                except queue.Empty:
-                    print("Player 2 controller timed out. Using current direction.")
-                    p2_direction = player2.snake.direction
-                    
-                # Apply directions and move snakes
-                player1.snake.direction = p1_direction
-                player2.snake.direction = p2_direction
-                player1.snake.move()
-                player2.snake.move()
-
-                # Handle collisions, food, growth, deaths, etc.
-                state.resolve_collisions()
+            if event.key == pygame.K_r and self.state.game_over:
+                self.restart_game()
+
+            speed_keys = (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4)
+            if event.key in speed_keys:
+                self.scheduler.set_speed(config.PLAYBACK_SPEEDS[speed_keys.index(event.key)])
+            elif event.key == pygame.K_SPACE:
+                self.paused = not self.paused
+                self.scheduler.hold()
+            elif event.key == pygame.K_n and self.paused:
+                self.step_requested = True
+
+    def request_directions(self):
+        """
+        Sends the current snapshot to both controller workers under one shared deadline.
+        Returns the pending moves, which are collected without blocking.
+        """
+        # Build board and player snapshots for controllers
+        p1_snapshot, p2_snapshot = self.state.get_snapshots(self.shared_board, in_process=False, tick=self.game_clock.tick)
+
+        deadline = time.perf_counter() + config.CONTROLLER_TIMEOUT_SECONDS
+        requests = [
+            (self.p1_worker, self.p1_worker.request_move(*p1_snapshot)),
+            (self.p2_worker, self.p2_worker.request_move(*p2_snapshot))
+        ]
+        return PendingMoves(requests, deadline)
+
+    def resolve_directions(self, pending_moves):
+        """
+        Turns collected controller results into directions.
+        A player whose controller fails, times out or is still busy keeps its current direction,
+        and its next state update (for controllers using state deltas) is a full one.
+        """
+        directions = []
+        for (worker, request_id), (direction, error), player_obj in zip(pending_moves.requests, pending_moves.results, (self.player1, self.player2)):
+            if request_id is None:
+                print(f"Player {player_obj.id} controller is still busy. Using current direction.")
+                self.state.resync_controller(player_obj)
+            elif error is not None:
+                self.controller_errors[player_obj.id] += 1
+                count = self.controller_errors[player_obj.id]
+                if count == 1:
+                    print(f"Error in {player_obj.name}'s controller:\n{error}")
+                elif is_logged_error(count):
+                    print(f"Error in {player_obj.name}'s controller ({count} errors so far):\n{error.strip().splitlines()[-1]}")
+                self.state.resync_controller(player_obj)
+            elif direction is None and worker.pending_since is not None:
+                print(f"Player {player_obj.id} controller timed out. Using current direction.")
+            elif direction not in VALID_DIRECTIONS:
+                print(f"Player {player_obj.id} controller failed to return a valid result. Using current direction.")
+
+            directions.append(direction if direction in VALID_DIRECTIONS else player_obj.snake.direction)
+
+        return directions
+
+    def print_events(self):
+        """
+        Prints the collision and warning events recorded by the game state during the last tick.
+        """
+        names = {self.player1.id: self.player1.name, self.player2.id: self.player2.name}
+        for event in self.state.drain_events():
+            if event.kind != events.FOOD:
+                print(event.describe(names))
+
+    def update(self):
+        """
+        Advances the game logic for at most one frame. A tick starts when the scheduler says it is due
+        (or when a single step was asked for while paused) and is applied once both controllers have answered
+        or their shared deadline has passed, so at higher speeds several ticks run per frame.
+        Game time advances one AI_UPDATE_INTERVAL_MS per tick, whatever the playback speed.
+        Returns False if the game ended during this update.
+        """
+        if self.state.game_over:
+            return True
+
+        frame_end = time.perf_counter() + 1.0 / config.FPS
+        while not self.state.game_over and time.perf_counter() < frame_end:
+            if self.pending_moves is None:
+                if self.paused and not self.step_requested:
+                    break
+                if not self.paused and not self.scheduler.tick_due():
+                    break
+                self.step_requested = False
+                self.game_clock.advance()
+
+                # Time-up, pre-sudden-death message and sudden death transitions; the tick passes without moves
+                if not self.state.update_phase(self.game_clock()):
+                    self.scheduler.complete_tick()
+                    continue
+
+                self.pending_moves = self.request_directions()
+
+            # Waits for the controllers until the end of the frame at most, then renders
+            if self.pending_moves.wait(until=frame_end) is None:
+                break
+
+            # Apply directions, move snakes and handle collisions, food, growth, deaths, etc.
+            p1_direction, p2_direction = self.resolve_directions(self.pending_moves)
+            self.pending_moves = None
+            self.state.apply_moves(p1_direction, p2_direction)
+            self.print_events()
+            self.scheduler.complete_tick()
+
+        if self.state.game_over:
+            self.save_replay()
 
         # Skip rendering updates after game ends
+        return not self.state.game_over
+
+    def save_replay(self):
+        """
+        Saves the finished game's replay to REPLAY_DIRECTORY, once per game.
+        """
+        if self.replay_saved:
+            return
+        self.replay_saved = True
+
+        os.makedirs(config.REPLAY_DIRECTORY, exist_ok=True)
+        path = os.path.join(config.REPLAY_DIRECTORY, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.state.seed:016x}.replay")
+        replay.save(path, replay.encode(self.state, self.game_clock.tick))
+        print(f"Replay saved to {path}")
+
+    def update_timer(self):
+        """
+        Updates the timer text and colour from the elapsed game or sudden death time,
+        followed by the playback speed when it is not real time.
+        """
+        if self.state.sudden_death_active:
+            elapsed_sd_time_ms = self.game_clock() - self.state.sudden_death_start_time
+            elapsed_sd_seconds = elapsed_sd_time_ms // 1000
+            minutes = elapsed_sd_seconds // 60
+            seconds = elapsed_sd_seconds % 60
+            self.timer_text = f"Sudden Death - {minutes:02}:{seconds:02}"
+            self.timer_color = "White"
+        else:
+            elapsed_game_time_display = self.game_clock()
+            minutes = elapsed_game_time_display // 60000
+            seconds = (elapsed_game_time_display % 60000) // 1000
+            self.timer_text = f"{minutes:02}:{seconds:02}"
+            self.timer_color = "Red" if elapsed_game_time_display > config.GAME_DURATION - 10000 else "White"
+
+        if self.paused:
+            self.timer_text += "  (paused)"
+        elif self.scheduler.speed is None:
+            self.timer_text += "  (uncapped)"
+        elif self.scheduler.speed != 1:
+            self.timer_text += f"  ({self.scheduler.speed}x)"
+
+    def render(self):
+        """
+        Draws the current frame, pushing only the changed rectangles to the display during play.
+        """
+        screen = self.screen
+        state = self.state
+
+        # Sudden Death Message Screen
+        if state.pre_sudden_death_active:
+            screen.fill(colors.background_color)
+            message_surface = resources.cache.text("SUDDEN DEATH", 80, "Red", bold=True)
+            message_rect = message_surface.get_rect(center=(self.screen_width / 2, self.screen_height / 2))
+            screen.blit(message_surface, message_rect)
+
+            remaining_message_time_ms = max(0, config.PRE_SUDDEN_DEATH_MESSAGE_DURATION - (self.game_clock() - state.pre_sudden_death_start_time))
+            seconds_left = (remaining_message_time_ms // 1000) + 1
+            countdown_surface = resources.cache.text(str(seconds_left), 60, "White")
+            countdown_rect = countdown_surface.get_rect(center=(self.screen_width / 2, self.screen_height / 2 + 80))
+            screen.blit(countdown_surface, countdown_rect)
+
+            # Render Title, Timer & Scores
+            screen.blit(self.title_surface, (config.TITLE_POS_X, config.TITLE_POS_Y))
+            self.renderer.draw_hud(state, self.timer_text, self.timer_color, force=True)
+
+            # The board has to be drawn in full once play resumes
+            self.renderer.invalidate()
+            pygame.display.flip()
+            return
+
+        # Game Over Overlay, drawn once; the display keeps it until restart
         if state.game_over:
-            continue
-
-    # --- Rendering ---
-    screen.fill(colors.background_color)
+            if not self.game_over_drawn:
+                self.renderer.draw_frame(state, self.timer_text, self.timer_color)
+                self.game_over_screen.draw(screen, state.winner)
+                self.renderer.invalidate()
+                pygame.display.flip()
+                self.game_over_drawn = True
+            return
+
+        # Board, Timer & Scores
+        self.update_timer()
+        dirty_rects = self.renderer.draw_frame(state, self.timer_text, self.timer_color, self.interpolation())
+
+        # --- Display Update ---
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+
+    def interpolation(self):
+        """
+        Returns how far the heads are drawn between their previous and current cells.
+        """
+        return self.scheduler.alpha()
+
+    def run(self):
+        """
+        Runs the main game loop until the window is closed.
+        """
+        running = True
+        while running:
+            running = self.handle_events()
+
+            if self.update():
+                self.render()
+                self.clock.tick(config.FPS)
+
+        # --- Clean Exit ---
+        self.close()
+        pygame.quit()
+
+
+class ArchiveViewer(Game):
+    """
+    Plays back archived matches (see core.replay_archive) through the same window and render path, without
+    controllers. Every position is a seek into the archive, so playback runs either way at any speed.
 
-    # Sudden Death Message Screen
-    if state.pre_sudden_death_active:
-        message_font = pygame.font.SysFont(None, 80, bold=True)
-        message_surface = message_font.render("SUDDEN DEATH", True, "Red")
-        message_rect = message_surface.get_rect(center=(screen_width / 2, screen_height / 2))
-        screen.blit(message_surface, message_rect)
+    Keys 1-4 pick the speed and Space pauses as in a game. B plays backwards (rewind) and forwards again,
+    N steps one tick in the playing direction while paused, Left and Right jump 10 seconds, Home goes back to
+    the start and Page Up / Page Down open the previous / next match.
+    """
+    # Game time skipped by the Left and Right keys
+    JUMP_MS = 10000
+
+    def __init__(self, path, match_id=None, tick=0):
+        self.archive = replay_archive.ReplayArchive(path)
+        self.match_ids = self.archive.match_ids()
+        if match_id is not None and match_id not in self.match_ids:
+            raise SystemExit(f"No match {match_id} in {path}")
+        if not self.match_ids:
+            raise SystemExit(f"{path} holds no matches")
+        self.match_index = self.match_ids.index(match_id) if match_id is not None else 0
+        self.start_tick = tick
+        self.reverse = False
+        super().__init__()
+
+    def start_controllers(self):
+        pass
+
+    def close(self):
+        self.archive.close()
+
+    def restart_game(self):
+        """
+        Opens the current match at the start tick (the --tick option for the first match, then tick 0).
+        """
+        self.playback = self.archive.open(self.match_ids[self.match_index])
+        self.state = self.playback.state
+        self.player1, self.player2 = self.state.player1, self.state.player2
+        self.scheduler.reset()
+        self.game_over_drawn = False
+        self.reverse = False
+        self.seek(self.start_tick)
+        self.start_tick = 0
+
+        info = self.playback.info
+        print(f"Match {info['match_id']}: {info['names'][0]} vs {info['names'][1]}, {info['ticks']} ticks")
+
+    def seek(self, tick):
+        """
+        Moves the playback to a tick and the game clock with it.
+        """
+        was_over = self.state.game_over
+        self.playback.seek(tick)
+        self.game_clock.tick = self.playback.tick
+
+        # Leaving the game over overlay needs a full redraw
+        if was_over and not self.state.game_over:
+            self.game_over_drawn = False
+            self.renderer.invalidate()
+
+    def open_match(self, step):
+        self.match_index = (self.match_index + step) % len(self.match_ids)
+        self.restart_game()
+
+    def handle_event(self, event):
+        """
+        Handles the playback keys; the speed, pause, step and restart keys work as in a game.
+        """
+        if event.type == pygame.KEYDOWN:
+            tick_ms = config.AI_UPDATE_INTERVAL_MS
+            if event.key == pygame.K_b:
+                self.reverse = not self.reverse
+                self.scheduler.hold()
+            elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                jump = self.JUMP_MS // tick_ms
+                self.seek(self.playback.tick + (jump if event.key == pygame.K_RIGHT else -jump))
+            elif event.key == pygame.K_HOME:
+                self.seek(0)
+            elif event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                self.open_match(-1 if event.key == pygame.K_PAGEUP else 1)
+                return
+        super().handle_event(event)
+
+    def update(self):
+        """
+        Moves the playback on by the ticks that fell due during this frame, in the playing direction.
+        Always returns True, since the position can still change after the end of the match.
+        """
+        frame_end = time.perf_counter() + 1.0 / config.FPS
+        step = -1 if self.reverse else 1
+        while time.perf_counter() < frame_end:
+            if self.paused and not self.step_requested:
+                break
+            if not self.paused and not self.scheduler.tick_due():
+                break
+            self.step_requested = False
+
+            tick = self.playback.tick + step
+            if not 0 <= tick <= self.playback.ticks:
+                break
+            self.seek(tick)
+            self.scheduler.complete_tick()
+        return True
+
+    def update_timer(self):
+        super().update_timer()
+        if self.reverse:
+            self.timer_text += "  (rewind)"
+
+    def interpolation(self):
+        # Heads are only interpolated towards their next cell when playing forwards
+        return 1.0 if self.reverse else super().interpolation()
+
+
+def parse_args():
+    """
+    Parses the command line options.
+    """
+    parser = argparse.ArgumentParser(description="Play Battle of the Algorithms, or watch archived matches.")
+    parser.add_argument("--archive", help="Play back matches from a replay archive, e.g. results/replays.archive")
+    parser.add_argument("--match", type=int, default=None, help="Match id to open first (default: the first one)")
+    parser.add_argument("--tick", type=int, default=0, help="Tick to open the first match at")
+    return parser.parse_args()
 
-        remaining_message_time_ms = max(0, config.PRE_SUDDEN_DEATH_MESSAGE_DURATION - (pygame.time.get_ticks() - state.pre_sudden_death_start_time))
-        seconds_left = (remaining_message_time_ms // 1000) + 1
-        countdown_font = pygame.font.SysFont(None, 60)
-        countdown_surface = countdown_font.render(str(seconds_left), True, "White")
-        countdown_rect = countdown_surface.get_rect(center=(screen_width / 2, screen_height / 2 + 80))
-        screen.blit(countdown_surface, countdown_rect)
 
+if __name__ == "__main__":
+    args = parse_args()
+    if args.archive:
+        ArchiveViewer(args.archive, args.match, args.tick).run()
     else:
-        # Render Board
-        game_board.draw(screen)
-
-        # Update game timer
-        if not state.game_over:
-            if state.sudden_death_active:
-                elapsed_sd_time_ms = pygame.time.get_ticks() - state.sudden_death_start_time
-                elapsed_sd_seconds = elapsed_sd_time_ms // 1000
-                minutes = elapsed_sd_seconds // 60
-                seconds = elapsed_sd_seconds % 60
-                timer_text = f"Sudden Death - {minutes:02}:{seconds:02}"
-                timer_color = "White"
-            else:
-                elapsed_game_time_display = pygame.time.get_ticks() - game_start_time
-                minutes = elapsed_game_time_display // 60000
-                seconds = (elapsed_game_time_display % 60000) // 1000
-                timer_text = f"{minutes:02}:{seconds:02}"
-                timer_color = "Red" if elapsed_game_time_display > config.GAME_DURATION - 10000 else "White"
-    
-    # Render Title & Timer
-    screen.blit(title_surface, (config.TITLE_POS_X, config.TITLE_POS_Y))
-    timer_surface = timer_font.render(timer_text, True, timer_color)
-    screen.blit(timer_surface, (config.TIMER_POS_X, config.TIMER_POS_Y))
-
-    # Render Scores
-    player1.draw_score(screen, {"x": config.PLAYER1_SCORE_POS_X, "y": config.PLAYER1_SCORE_POS_Y})
-    player2.draw_score(screen, {"x": config.PLAYER2_SCORE_POS_X, "y": config.PLAYER2_SCORE_POS_Y})
-
-    # Render Apples
-    for apple in state.food_locations:
-        apple.draw(game_board)
-
-    # Render Obstacles
-    for obstacle in state.obstacle_locations:
-        obstacle.draw(game_board)
-
-    # Render Snakes
-    player1.snake.draw(game_board.board)
-    player2.snake.draw(game_board.board)
-
-    # Render Scorebar
-    game_scorebar.draw(screen, player1, player2)
-
-    # Game Over Overlay
-    if state.game_over:
-        game_over_screen.draw(screen, state.winner)
-
-    # --- Display Update ---
-    pygame.display.flip()
-    clock.tick(config.FPS)
-
-# --- Clean Exit ---
-pygame.quit()
\ No newline at end of file
+        Game().run()
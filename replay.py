@@ -0,0 +1,41 @@
+# --- Python Standard Libraries ---
+import argparse
+import time
+
+# --- Project Modules ---
+from core import replay
+from core import replay_archive
+
+
+def parse_args():
+    """
+    Parses the replay command line options.
+    """
+    parser = argparse.ArgumentParser(description="Re-simulate recorded Battle of the Algorithms games headlessly and check their results.")
+    parser.add_argument("paths", nargs="+", help="Replay files, e.g. results/replays/match_0001.replay")
+    parser.add_argument("--archive", help="Also write the verified replays to this archive, numbered in the order given, for `python -m main --archive`")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    verified = []
+    for path in args.paths:
+        data = replay.load(path)
+        start = time.perf_counter()
+        try:
+            state = replay.simulate(data)
+        except replay.ReplayError as e:
+            print(f"{path}: {e}")
+            continue
+
+        header, moves, trailer = replay.decode(data)
+        winner = f"player {trailer['winner']}" if trailer["winner"] else "draw"
+        print(f"{path}: seed {header['seed']}, {trailer['ticks']} ticks, {len(data)} bytes, "
+              f"scores {state.player1.score}-{state.player2.score}, {winner}, "
+              f"re-simulated in {time.perf_counter() - start:.2f}s")
+        verified.append((len(verified) + 1, data, None))
+
+    if args.archive:
+        replay_archive.write(args.archive, verified)
+        print(f"{len(verified)} replays archived to {args.archive}")
@@ -0,0 +1,19 @@
+import pytest
+from core.match import Match
+
+CONTROLLERS = ("controllers.player1_controller", "controllers.player2_controller")
+
+# Tick limit of the recorded matches; the bundled controllers survive this long on these seeds
+REPLAY_TICKS = 400
+
+@pytest.fixture(scope="session")
+def replays():
+    """
+    (match id, replay, player names) of a few short matches between the bundled controllers.
+    """
+    result = []
+    for seed in range(3):
+        match = Match(*CONTROLLERS, max_ticks=REPLAY_TICKS, seed=seed)
+        match.run()
+        result.append((seed, match.get_replay(), (match.player1.name, match.player2.name)))
+    return result
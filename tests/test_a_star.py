@@ -0,0 +1,69 @@
+import random
+from collections import deque
+import pytest
+from controllers.a_star import a_star, get_neighbours
+
+def bfs_distance(start, goal, grid):
+    """
+    Reference search: number of steps on the shortest path, or None. The start cell may be blocked.
+    """
+    distances = {tuple(start): 0}
+    queue = deque([tuple(start)])
+    while queue:
+        cell = queue.popleft()
+        if cell == tuple(goal):
+            return distances[cell]
+        for neighbour in get_neighbours(cell, grid):
+            if neighbour not in distances:
+                distances[neighbour] = distances[cell] + 1
+                queue.append(neighbour)
+    return None
+
+def random_grid(rng, rows, cols, blocked):
+    # 0 and 2 both block, as obstacles and snake bodies do in the controllers' grids
+    return [[rng.choice((0, 2)) if rng.random() < blocked else 1 for _ in range(cols)] for _ in range(rows)]
+
+def assert_valid_path(path, start, goal, grid):
+    assert path[0] == tuple(start) and path[-1] == tuple(goal)
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        assert abs(row - next_row) + abs(col - next_col) == 1
+        assert grid[next_row][next_col] == 1
+
+@pytest.mark.parametrize("jump_points", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_path_length_matches_bfs(seed, jump_points):
+    rng = random.Random(seed)
+    for _ in range(150):
+        rows, cols = rng.choice(((1, 1), (1, 9), (7, 1), (rng.randint(2, 12), rng.randint(2, 15)), (33, 66)))
+        grid = random_grid(rng, rows, cols, rng.choice((0.0, 0.2, 0.4)))
+        start = (rng.randrange(rows), rng.randrange(cols))
+        goal = (rng.randrange(rows), rng.randrange(cols))
+
+        path = a_star(start, goal, grid, jump_points=jump_points)
+        expected = bfs_distance(start, goal, grid)
+        if expected is None:
+            assert path is None
+        else:
+            assert_valid_path(path, start, goal, grid)
+            assert len(path) - 1 == expected
+
+def test_unreachable_and_outside_goals():
+    grid = [[1, 0, 1],
+            [1, 0, 1],
+            [1, 0, 1]]
+    assert a_star((0, 0), (2, 2), grid) is None
+    assert a_star((0, 0), (2, 2), grid, jump_points=True) is None
+    # A blocked goal, and goals off the board
+    assert a_star((0, 0), (0, 1), grid) is None
+    assert a_star((0, 0), (3, 0), grid) is None
+    assert a_star((0, 0), (0, -1), grid) is None
+    assert a_star((1, 0), (1, 0), grid) == [(1, 0)]
+
+def test_buffers_are_reused_across_board_sizes():
+    rng = random.Random(7)
+    for rows, cols in ((5, 5), (9, 4), (5, 5)):
+        grid = random_grid(rng, rows, cols, 0.1)
+        grid[0][0] = grid[rows - 1][cols - 1] = 1
+        path = a_star((0, 0), (rows - 1, cols - 1), grid)
+        expected = bfs_distance((0, 0), (rows - 1, cols - 1), grid)
+        assert (len(path) - 1 if path is not None else None) == expected
@@ -0,0 +1,114 @@
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+from core.batch_env import BatchEnv, DIRECTIONS, RUNNING, DRAW
+from core.match import Match
+from core.obstacle import MIN_LENGTH, MAX_LENGTH
+from core.occupancy import FOOD, OBSTACLE, SNAKE1, SNAKE2
+from core.snake import DIRECTION_DELTAS
+
+OPPOSITES = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+# Ticks played per game in the parity test, and the tick at which odd seeds start sudden death
+PARITY_TICKS = 600
+SUDDEN_DEATH_TICK = 80
+
+def random_move(rng, state, player):
+    """
+    Returns a random direction for the player that does not reverse its snake: usually a safe one towards
+    the nearest food, so snakes eat and grow, otherwise any, with an occasional blunder.
+    """
+    snake = player.snake
+    moves = [move for move in DIRECTIONS if move != OPPOSITES[snake.direction]]
+    head = snake.body[0]
+
+    def target(move):
+        return head[0] + DIRECTION_DELTAS[move][0], head[1] + DIRECTION_DELTAS[move][1]
+
+    safe = [move for move in moves if state.occupancy.in_bounds(*target(move)) and not state.occupancy.get(*target(move)) & ~FOOD]
+    if not safe or rng.random() < 0.01:
+        return rng.choice(moves)
+    if state.food_map and rng.random() < 0.7:
+        food = min(state.food_map, key=lambda cell: abs(cell[0] - head[0]) + abs(cell[1] - head[1]))
+        return min(safe, key=lambda move: abs(target(move)[0] - food[0]) + abs(target(move)[1] - food[1]))
+    return rng.choice(safe)
+
+def sync_food(env, state):
+    """
+    Puts the state's food in game 0 of the environment, since each spawns food from its own generator.
+    """
+    cells = env.cells[0]
+    cells &= ~np.uint8(FOOD)
+    for row, col in state.food_map:
+        cells[row * state.cols + col] |= FOOD
+
+@pytest.mark.parametrize("seed", range(12))
+def test_batch_env_matches_game_state(seed):
+    """
+    Playing the same moves in a one-game BatchEnv and a GameState gives the same board, snakes, scores
+    and result, with sudden death on odd seeds.
+    """
+    rng = random.Random(seed)
+    state = Match(None, None, seed=seed).state
+    env = BatchEnv(1, auto_reset=False, seed=seed)
+    assert (env.rows, env.cols) == (state.rows, state.cols)
+    # Start from the state's food and obstacles; the snakes start in the same cells
+    env.cells[0] = np.frombuffer(bytes(state.occupancy.cells), dtype=np.uint8)
+
+    for tick in range(PARITY_TICKS):
+        if state.game_over:
+            break
+        if seed % 2 and tick == SUDDEN_DEATH_TICK:
+            state.start_sudden_death()
+            env.sudden_death[0] = True
+            sync_food(env, state)
+
+        moves = (random_move(rng, state, state.player1), random_move(rng, state, state.player2))
+        state.apply_moves(*moves)
+        _, rewards, dones, winners = env.step(np.array([[DIRECTIONS.index(move) for move in moves]]))
+
+        expected = np.frombuffer(bytes(state.occupancy.cells), dtype=np.uint8)
+        assert np.array_equal(env.cells[0] & ~np.uint8(FOOD), expected & ~np.uint8(FOOD)), tick
+        if not state.game_over:
+            # A GameState leaves the winning sudden death food on the board; the batch removes it
+            assert np.count_nonzero(env.cells[0] & FOOD) == len(state.food_map)
+        assert env.scores[0].tolist() == [state.player1.score, state.player2.score]
+        assert env.lengths[0].tolist() == [len(state.player1.snake.body), len(state.player2.snake.body)]
+        for player in (state.player1, state.player2):
+            assert (env.head_rows[0, player.id - 1], env.head_cols[0, player.id - 1]) == player.snake.body[0]
+        assert bool(dones[0]) == state.game_over
+        if state.game_over:
+            assert winners[0] == (state.winner.id if state.winner is not None else DRAW)
+        else:
+            assert winners[0] == RUNNING
+        sync_food(env, state)
+
+    assert state.game_over or tick == PARITY_TICKS - 1
+
+def test_finished_games_reset():
+    """
+    Random play across many games keeps every board consistent, reports each result once and restarts
+    finished games at once with `auto_reset`.
+    """
+    rng = np.random.default_rng(3)
+    env = BatchEnv(64, seed=3, max_ticks=300)
+    finished = 0
+    for _ in range(400):
+        observations, rewards, dones, winners = env.step(rng.integers(0, 4, (64, 2)))
+        finished += int(dones.sum())
+        assert not env.dones.any()
+        assert np.all(winners[dones] != RUNNING) and np.all(winners[~dones] == RUNNING)
+        # Decisive results are worth the same to both players with opposite signs
+        decided = dones & (winners != DRAW)
+        assert np.all(np.sign(rewards[decided, 0]) == -np.sign(rewards[decided, 1]))
+
+        assert observations.shape == (64, env.rows, env.cols)
+        for player, tag in enumerate((SNAKE1, SNAKE2)):
+            assert np.all(np.count_nonzero(env.cells & tag, axis=1) <= env.lengths[:, player])
+        running = ~env.sudden_death
+        assert np.all(np.count_nonzero(env.cells[running] & FOOD, axis=1) == env.num_food)
+        # Fresh and reset boards alike hold num_obstacles obstacles that do not overlap
+        obstacles = np.count_nonzero(env.cells & OBSTACLE, axis=1)
+        assert np.all((obstacles >= env.num_obstacles * MIN_LENGTH) & (obstacles <= env.num_obstacles * MAX_LENGTH))
+    assert finished > 64
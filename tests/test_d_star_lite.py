@@ -0,0 +1,98 @@
+import random
+from collections import deque
+import pytest
+from controllers.a_star import a_star, get_neighbours
+from controllers.d_star_lite import DStarLite
+
+def bfs_distance(start, goal, grid):
+    """
+    Reference search: number of steps on the shortest path, or None. The start cell may be blocked.
+    """
+    distances = {tuple(start): 0}
+    queue = deque([tuple(start)])
+    while queue:
+        cell = queue.popleft()
+        if cell == tuple(goal):
+            return distances[cell]
+        for neighbour in get_neighbours(cell, grid):
+            if neighbour not in distances:
+                distances[neighbour] = distances[cell] + 1
+                queue.append(neighbour)
+    return None
+
+def path_length(path, start, goal, grid):
+    """
+    Checks that the path is a walkable route from start to goal and returns its number of steps, or None.
+    """
+    if path is None:
+        return None
+    assert path[0] == tuple(start) and path[-1] == tuple(goal)
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        assert abs(row - next_row) + abs(col - next_col) == 1
+        assert grid[next_row][next_col] == 1
+    return len(path) - 1
+
+@pytest.mark.parametrize("seed", range(6))
+def test_replanning_matches_bfs(seed):
+    """
+    Moves a start cell around a board whose cells are blocked and freed a few at a time, keeping the goal
+    for a while before picking another, and compares every plan with a fresh BFS.
+    """
+    rng = random.Random(seed)
+    rows, cols = rng.choice(((8, 8), (12, 20), (33, 66)))
+    grid = [[0 if rng.random() < 0.2 else 1 for _ in range(cols)] for _ in range(rows)]
+    planner = DStarLite()
+    start = (rng.randrange(rows), rng.randrange(cols))
+    goal = (rng.randrange(rows), rng.randrange(cols))
+    repaired = 0
+
+    for step in range(200):
+        if rng.random() < 0.05:
+            goal = (rng.randrange(rows), rng.randrange(cols))
+        for _ in range(rng.randint(0, 4)):
+            row, col = rng.randrange(rows), rng.randrange(cols)
+            grid[row][col] = 1 - grid[row][col]
+        # The start moves one step, as a snake's head does, and the cell it leaves is blocked behind it
+        moves = get_neighbours(start, grid)
+        if moves:
+            grid[start[0]][start[1]] = 0
+            start = rng.choice(moves)
+
+        expected = bfs_distance(start, goal, grid)
+        assert path_length(planner.plan(start, goal, grid), start, goal, grid) == expected
+        if planner.goal == goal and step > 0:
+            repaired += 1
+
+    assert repaired > 100
+
+def test_matches_a_star_on_new_goals():
+    rng = random.Random(3)
+    grid = [[0 if rng.random() < 0.3 else 1 for _ in range(15)] for _ in range(10)]
+    planner = DStarLite()
+    for _ in range(100):
+        start = (rng.randrange(10), rng.randrange(15))
+        goal = (rng.randrange(10), rng.randrange(15))
+        expected = a_star(start, goal, grid)
+        path = planner.plan(start, goal, grid)
+        assert path_length(path, start, goal, grid) == (len(expected) - 1 if expected is not None else None)
+
+def test_goal_blocked_and_freed():
+    grid = [[1, 1, 1, 1],
+            [1, 0, 0, 1],
+            [1, 1, 1, 1]]
+    planner = DStarLite()
+    assert len(planner.plan((1, 0), (1, 3), grid)) - 1 == 5
+
+    grid[1][3] = 0
+    assert planner.plan((1, 0), (1, 3), grid) is None
+
+    # Freeing the goal and walling off the top row leaves the way round the bottom
+    grid[1][3] = 1
+    grid[0][1] = grid[0][2] = 0
+    assert planner.plan((1, 0), (1, 3), grid) == [(1, 0), (2, 0), (2, 1), (2, 2), (2, 3), (1, 3)]
+
+    grid[2][2] = 0
+    assert planner.plan((1, 0), (1, 3), grid) is None
+
+    # A new board size starts over
+    assert len(planner.plan((0, 0), (1, 1), [[1, 1], [1, 1]])) - 1 == 2
@@ -0,0 +1,88 @@
+import random
+from collections import deque
+import pytest
+from controllers import distance_field
+from controllers.distance_field import UNREACHABLE, walkable_array, distance_fields, closest_food, food_distances
+
+def reference_field(grid, sources):
+    """
+    Plain BFS from all sources at once: sources are at 0, every other cell on a path must be walkable.
+    """
+    rows, cols = len(grid), len(grid[0])
+    field = [[UNREACHABLE] * cols for _ in range(rows)]
+    queue = deque()
+    for row, col in sources:
+        if 0 <= row < rows and 0 <= col < cols and field[row][col] == UNREACHABLE:
+            field[row][col] = 0
+            queue.append((row, col))
+    while queue:
+        row, col = queue.popleft()
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= r < rows and 0 <= c < cols and grid[r][c] == 1 and field[r][c] == UNREACHABLE:
+                field[r][c] = field[row][col] + 1
+                queue.append((r, c))
+    return field
+
+def random_case(rng):
+    rows, cols = rng.choice(((1, 1), (1, 12), (9, 1), (rng.randint(2, 15), rng.randint(2, 20)), (33, 66)))
+    blocked = rng.choice((0.0, 0.25, 0.45))
+    grid = [[0 if rng.random() < blocked else 1 for _ in range(cols)] for _ in range(rows)]
+    groups = []
+    for _ in range(rng.randint(1, 4)):
+        # Sources may be blocked cells, repeated, or off the board
+        groups.append([(rng.randint(-1, rows), rng.randint(-1, cols)) for _ in range(rng.randint(0, 3))])
+    return grid, groups
+
+def as_lists(field):
+    return [[int(value) for value in row] for row in field]
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        if distance_field.np is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setattr(distance_field, "np", None)
+    return request.param
+
+@pytest.mark.parametrize("seed", range(4))
+def test_fields_match_reference_bfs(seed, backend):
+    rng = random.Random(seed)
+    for _ in range(60):
+        grid, groups = random_case(rng)
+        fields = distance_fields(walkable_array(grid), groups)
+        assert len(fields) == len(groups)
+        for field, sources in zip(fields, groups):
+            assert as_lists(field) == reference_field(grid, sources)
+
+def test_numpy_and_python_fields_agree(monkeypatch):
+    if distance_field.np is None:
+        pytest.skip("NumPy is not installed")
+    rng = random.Random(9)
+    for _ in range(40):
+        grid, groups = random_case(rng)
+        vectorized = [as_lists(field) for field in distance_fields(walkable_array(grid), groups)]
+        with monkeypatch.context() as patched:
+            patched.setattr(distance_field, "np", None)
+            plain = [as_lists(field) for field in distance_fields(walkable_array(grid), groups)]
+        assert vectorized == plain
+
+def test_closest_food_prefers_uncontested_food(backend):
+    grid = [[1] * 9 for _ in range(3)]
+    grid[1][4] = 0
+    walkable = walkable_array(grid)
+    head, opponent_head = (0, 0), (2, 8)
+    # (0, 3) is nearer for us, (2, 6) is nearer for the opponent, (5, 5) is off the board
+    food = [(2, 6), (0, 3), (5, 5)]
+    assert food_distances(walkable, head, opponent_head, food) == [
+        ((2, 6), 8, 2), ((0, 3), 3, 7), ((5, 5), UNREACHABLE, UNREACHABLE)]
+    assert closest_food(walkable, head, opponent_head, food) == (0, 3)
+    # With only contested food left, the nearest is still chosen
+    assert closest_food(walkable, head, opponent_head, [(2, 6), (2, 7)]) == (2, 6)
+
+def test_unreachable_food_is_skipped(backend):
+    grid = [[1, 0, 1],
+            [1, 0, 1]]
+    walkable = walkable_array(grid)
+    assert closest_food(walkable, (0, 0), (0, 2), [(1, 2)]) is None
+    assert closest_food(walkable, (0, 0), (0, 2), [(1, 2), (1, 0)]) == (1, 0)
@@ -0,0 +1,97 @@
+import random
+import pytest
+from core.forward_model import ForwardModel
+from core.match import Match, VALID_DIRECTIONS
+
+OPPOSITES = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+# Ticks played per game in the ForwardModel parity test, and the tick at which odd seeds start sudden death
+PARITY_TICKS = 500
+SUDDEN_DEATH_TICK = 50
+
+def random_move(rng, model, player):
+    """
+    Returns a random direction for the player that does not reverse its snake: usually the free cell closest
+    to some food, so snakes eat and grow, otherwise any free cell, with an occasional blunder.
+    """
+    moves = [move for move in VALID_DIRECTIONS if move != OPPOSITES[model.directions[player]]]
+    head = model.bodies[player][0]
+    safe = [move for move in moves if model.is_free(head + model.deltas[move])]
+    if not safe or rng.random() < 0.01:
+        return rng.choice(moves)
+    if model.food and rng.random() < 0.7:
+        def distance(move):
+            row, col = model.cell(head + model.deltas[move])
+            return min(abs(row - food_row) + abs(col - food_col) for food_row, food_col in map(model.cell, model.food))
+        return min(safe, key=distance)
+    return rng.choice(safe)
+
+def model_position(model):
+    bodies = tuple(tuple(model.cell(index) for index in model.bodies[player]) for player in (1, 2))
+    return bodies, tuple(model.directions[1:]), tuple(model.scores[1:]), model.game_over, model.winner
+
+def state_position(state):
+    bodies = tuple(tuple(player.snake.body) for player in (state.player1, state.player2))
+    directions = (state.player1.snake.direction, state.player2.snake.direction)
+    scores = (state.player1.score, state.player2.score)
+    return bodies, directions, scores, state.game_over, state.winner.id if state.winner is not None else None
+
+@pytest.mark.parametrize("seed", range(20))
+def test_forward_model_matches_game_state(seed):
+    """
+    Stepping a model of the position gives the same snakes, scores and result as GameState.apply_moves,
+    and undoing the step restores the model's hash.
+    """
+    rng = random.Random(seed)
+    state = Match(None, None, seed=seed).state
+    for tick in range(PARITY_TICKS):
+        if state.game_over:
+            break
+        if seed % 2 and tick == SUDDEN_DEATH_TICK:
+            state.start_sudden_death()
+        model = ForwardModel.from_game_state(state)
+        assert model.get_hash() == state.get_hash()
+        before = model.get_hash()
+
+        move1, move2 = random_move(rng, model, 1), random_move(rng, model, 2)
+        undo = model.step(move1, move2)
+        scores = (state.player1.score, state.player2.score)
+        state.apply_moves(move1, move2)
+        assert model_position(model) == state_position(state)
+        if (state.player1.score, state.player2.score) == scores:
+            # Food eaten by the engine is replaced from its own generator, which the model does not share
+            assert model.get_hash() == state.get_hash()
+
+        model.undo(undo)
+        assert model.get_hash() == before
+
+@pytest.mark.parametrize("seed", range(5))
+def test_snapshot_model_matches_game_state_model(seed):
+    """
+    A model built from a controller's snapshot equals one built from the GameState, in sudden death too.
+    """
+    rng = random.Random(seed)
+    state = Match(None, None, seed=seed).state
+    for tick in range(200):
+        if state.game_over:
+            break
+        if tick == 100:
+            state.start_sudden_death()
+        expected = ForwardModel.from_game_state(state)
+        board_state = state.get_board_state()
+        for player, opponent in ((state.player1, state.player2), (state.player2, state.player1)):
+            model = ForwardModel.from_snapshot(board_state, state.get_player_state(player), state.get_player_state(opponent))
+            assert model_position(model) == model_position(expected)
+            assert (model.food, model.sudden_death, model.sudden_death_food) == (expected.food, expected.sudden_death, expected.sudden_death_food)
+            assert model.get_hash() == board_state["zobrist_hash"]
+        state.apply_moves(random_move(rng, expected, 1), random_move(rng, expected, 2))
+
+def test_clone_is_independent():
+    state = Match(None, None, seed=1).state
+    model = ForwardModel.from_game_state(state)
+    before = model_position(model), model.get_hash()
+    clone = model.clone()
+    rng = random.Random(1)
+    for _ in range(20):
+        clone.step(random_move(rng, clone, 1), random_move(rng, clone, 2))
+    assert (model_position(model), model.get_hash()) == before
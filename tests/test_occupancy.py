@@ -0,0 +1,146 @@
+import random
+from collections import Counter
+import pytest
+from core.match import Match
+from core.obstacle import MIN_LENGTH, MAX_LENGTH
+from core.occupancy import OccupancyGrid, EMPTY, FOOD, OBSTACLE
+
+CONTROLLERS = ("controllers.player1_controller", "controllers.player2_controller")
+
+def assert_free_index_consistent(grid):
+    """
+    The free-cell index holds exactly the empty cells, and each cell's slot points back at it.
+    """
+    empty = [index for index, tag in enumerate(grid.cells) if tag == EMPTY]
+    assert sorted(grid.free_cells) == empty
+    assert grid.free_count() == len(empty)
+    for slot, index in enumerate(grid.free_cells):
+        assert grid.free_slots[index] == slot
+    for index, tag in enumerate(grid.cells):
+        if tag != EMPTY:
+            assert grid.free_slots[index] == -1
+
+def expected_cells(state):
+    """
+    Rebuilds the occupancy grid's tags from the food, obstacles and snakes of the state.
+    """
+    grid = OccupancyGrid(state.rows, state.cols)
+    for row, col in state.food_map:
+        grid.add(FOOD, row, col)
+    for obstacle in state.obstacle_locations:
+        for row, col in obstacle.get_occupied_positions():
+            grid.add(OBSTACLE, row, col)
+    for player in (state.player1, state.player2):
+        for row, col in player.snake.body:
+            grid.add_body(player.id, row, col)
+    return grid.cells
+
+def test_free_index_follows_random_updates():
+    rng = random.Random(5)
+    grid = OccupancyGrid(6, 9)
+    tags = []
+    for _ in range(3000):
+        row, col = rng.randrange(-1, 7), rng.randrange(-1, 10)
+        if tags and rng.random() < 0.45:
+            kind, owner, row, col = tags.pop(rng.randrange(len(tags)))
+            if kind == "body":
+                grid.remove_body(owner, row, col)
+            else:
+                grid.remove(kind, row, col)
+        elif rng.random() < 0.5:
+            owner = rng.choice((1, 2))
+            grid.add_body(owner, row, col)
+            tags.append(("body", owner, row, col))
+        else:
+            kind = rng.choice((FOOD, OBSTACLE))
+            if not grid.get(row, col) & kind:
+                grid.add(kind, row, col)
+                tags.append((kind, None, row, col))
+        assert_free_index_consistent(grid)
+
+    # A full board has no free cell to draw
+    for row in range(grid.rows):
+        for col in range(grid.cols):
+            grid.add(OBSTACLE, row, col)
+    assert grid.free_count() == 0
+    assert grid.random_free_cell(rng) is None
+
+def test_random_free_cell_is_uniform():
+    rng = random.Random(11)
+    grid = OccupancyGrid(4, 5)
+    occupied = {(0, 0), (1, 2), (2, 2), (3, 4)}
+    for row, col in occupied:
+        grid.add(OBSTACLE, row, col)
+    # Shuffle the index order so uniformity does not rely on the initial layout
+    grid.remove(OBSTACLE, 1, 2)
+    grid.add(FOOD, 1, 2)
+
+    draws = 16000
+    counts = Counter(grid.random_free_cell(rng) for _ in range(draws))
+    free = {(row, col) for row in range(4) for col in range(5)} - occupied
+    assert set(counts) == free
+    expected = draws / len(free)
+    for cell in free:
+        assert abs(counts[cell] - expected) < 0.15 * expected
+
+@pytest.mark.parametrize("seed", range(2))
+def test_occupancy_matches_game_state(seed):
+    """
+    The incrementally updated grid always equals one rebuilt from scratch, through eating, growing,
+    collisions and the switch to sudden death food.
+    """
+    match = Match(*CONTROLLERS, seed=seed)
+    while not match.state.game_over and match.tick < 300:
+        if match.tick == 150:
+            match.state.start_sudden_death()
+        match.step()
+        assert match.state.occupancy.cells == expected_cells(match.state)
+        assert_free_index_consistent(match.state.occupancy)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_initial_placement_is_legal(seed):
+    state = Match(None, None, seed=seed).state
+    cells = [cell for obstacle in state.obstacle_locations for cell in obstacle.get_occupied_positions()]
+    cells += list(state.food_map)
+    cells += [cell for player in (state.player1, state.player2) for cell in player.snake.body]
+    assert len(cells) == len(set(cells))
+    assert all(0 <= row < state.rows and 0 <= col < state.cols for row, col in cells)
+    assert all(MIN_LENGTH <= obstacle.length <= MAX_LENGTH for obstacle in state.obstacle_locations)
+
+@pytest.mark.parametrize("isolated_cells, draws", [(0, 3000), (300, 1200)])
+def test_obstacle_placement_is_uniform(isolated_cells, draws):
+    """
+    Fills the board except a 1x7 strip, so only horizontal obstacles fit, and checks every legal placement
+    is picked about equally often. Isolated free cells make most anchor draws fail, which exercises
+    the enumeration used on crowded boards.
+    """
+    state = Match(None, None, seed=1).state
+    grid = state.occupancy
+    strip_row = next(row for row in range(state.rows) if all(grid.is_free(row, col) for col in range(7)))
+    keep = {(strip_row, col) for col in range(7)}
+    isolated = [(row, col) for row in range(0, state.rows, 2) for col in range(10, state.cols, 2)
+                if abs(row - strip_row) > 1 and grid.is_free(row, col)]
+    keep.update(isolated[:isolated_cells])
+    for index in list(grid.free_cells):
+        if divmod(index, grid.cols) not in keep:
+            grid.add(OBSTACLE, *divmod(index, grid.cols))
+
+    counts = Counter()
+    placed = 0
+    while placed < draws:
+        if not state._place_obstacle():
+            continue
+        placed += 1
+        obstacle = state.obstacle_locations.pop()
+        positions = obstacle.get_occupied_positions()
+        assert all(cell in keep for cell in positions)
+        for row, col in positions:
+            grid.remove(OBSTACLE, row, col)
+        counts[obstacle.length, positions[0]] += 1
+
+    for length in range(MIN_LENGTH, MAX_LENGTH + 1):
+        anchors = {(strip_row, col) for col in range(8 - length)}
+        assert {anchor for (other, anchor) in counts if other == length} == anchors
+        expected = sum(counts[length, anchor] for anchor in anchors) / len(anchors)
+        for anchor in anchors:
+            assert abs(counts[length, anchor] - expected) < 0.3 * expected
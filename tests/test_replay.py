@@ -0,0 +1,43 @@
+import pytest
+from core.match import Match
+from core import replay
+
+CONTROLLERS = ("controllers.player1_controller", "controllers.player2_controller")
+
+def test_replay_is_deterministic(replays):
+    for seed, data, _ in replays:
+        match = Match(*CONTROLLERS, max_ticks=replay.decode(data)[0]["max_ticks"], seed=seed)
+        match.run()
+        assert match.get_replay() == data
+        state = replay.simulate(data)
+        assert (state.player1.score, state.player2.score) == replay.decode(data)[2]["scores"]
+
+def test_replay_plays_every_tick_of_the_limit(replays):
+    for seed, data, _ in replays:
+        header, moves, trailer = replay.decode(data)
+        assert header["seed"] == seed
+        assert header["max_ticks"] == trailer["ticks"] == len(moves)
+        ticks = [tick for _, tick, _ in replay.play(data)]
+        assert ticks == list(range(header["max_ticks"] + 1))
+
+def test_tampered_replay_is_rejected(replays):
+    _, data, _ = replays[0]
+    tampered = bytearray(data)
+    tampered[replay.HEADER.size + 5] ^= 1
+    with pytest.raises(replay.ReplayError):
+        replay.simulate(bytes(tampered))
+
+    with pytest.raises(replay.ReplayError):
+        replay.simulate(data[:-1])
+
+def test_forfeit_is_replayed():
+    # A zero time limit forfeits the match after its first tick
+    match = Match(*CONTROLLERS, seed=7, time_limit=0)
+    result = match.run()
+    assert result["ticks"] == 1
+    forfeited = match.state.forfeited
+    assert forfeited is not None and result["winner"] != forfeited.id
+
+    state = replay.simulate(match.get_replay())
+    assert state.forfeited.id == forfeited.id
+    assert state.winner.id == result["winner"]
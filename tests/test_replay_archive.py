@@ -0,0 +1,71 @@
+import pytest
+from core.match import Match
+from core import replay
+from core import replay_archive
+from core.replay_archive import ReplayArchive
+
+def playback_position(state):
+    """
+    Returns what a re-played GameState and an archive PlaybackState both show at a tick.
+    """
+    return (tuple(state.player1.snake.body), tuple(state.player2.snake.body),
+            state.player1.snake.direction, state.player2.snake.direction,
+            state.player1.score, state.player2.score,
+            sorted((food.grid_row, food.grid_col) for food in state.food_locations),
+            state.pre_sudden_death_active, state.sudden_death_active,
+            state.game_over, state.winner.id if state.winner is not None else None)
+
+def assert_seeks_match_replay(archive, match_id, data):
+    expected = [playback_position(state) for state, _, _ in replay.play(data)]
+    playback = archive.open(match_id)
+    assert playback.ticks == len(expected) - 1
+
+    # Every tick forwards, then backwards across keyframes, then jumps
+    order = list(range(len(expected))) + list(range(len(expected) - 1, -1, -1))
+    order += [(tick * 7919) % len(expected) for tick in range(len(expected))]
+    for tick in order:
+        playback.seek(tick)
+        assert playback_position(playback.state) == expected[tick], tick
+
+def circling_game(seed):
+    """
+    Returns a replay of a game in which both snakes circle in place until time is up and sudden death starts,
+    then player 1 breaks away.
+    """
+    match = Match(None, None, seed=seed)
+    cycle1, cycle2 = ("down", "right", "up", "left"), ("up", "left", "down", "right")
+    moves = 0
+    while not match.state.game_over:
+        if match.state.sudden_death_active and moves % 40 == 39:
+            match.step("left", cycle2[moves % 4])
+        elif match.step(cycle1[moves % 4], cycle2[moves % 4]):
+            moves += 1
+    return match.get_replay()
+
+@pytest.mark.parametrize("interval", [replay_archive.KEYFRAME_INTERVAL, 5])
+def test_archive_seek_matches_replay(replays, tmp_path, interval):
+    path = tmp_path / "replays.archive"
+    replay_archive.write(str(path), replays, interval=interval)
+    with ReplayArchive(str(path)) as archive:
+        assert archive.match_ids() == [match_id for match_id, _, _ in replays]
+        for match_id, data, names in replays:
+            _, _, trailer = replay.decode(data)
+            info = archive.match_info(match_id)
+            assert info["names"] == names
+            assert (info["ticks"], info["scores"], info["winner"]) == (trailer["ticks"], trailer["scores"], trailer["winner"])
+            assert_seeks_match_replay(archive, match_id, data)
+
+def test_archive_seek_through_sudden_death(tmp_path):
+    data = circling_game(seed=3)
+    path = tmp_path / "sudden_death.archive"
+    replay_archive.write(str(path), [(1, data, None)])
+    with ReplayArchive(str(path)) as archive:
+        info = archive.match_info(1)
+        assert info["pre_sudden_death_tick"] is not None and info["sudden_death_tick"] is not None
+        assert_seeks_match_replay(archive, 1, data)
+
+def test_archive_rejects_other_files(tmp_path, replays):
+    path = tmp_path / "match.replay"
+    replay.save(str(path), replays[0][1])
+    with pytest.raises(replay.ReplayError):
+        ReplayArchive(str(path))
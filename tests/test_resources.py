@@ -0,0 +1,55 @@
+import os
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from core import resources
+from core.resources import ResourceCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def cache():
+    pygame.init()
+    yield ResourceCache(text_cache_size=3)
+    pygame.quit()
+
+def test_images_are_loaded_once_per_size(cache):
+    path = os.path.join(ROOT, resources.SPIKE_IMAGE)
+    small = cache.image(path, (15, 15))
+    assert cache.image(path, (15, 15)) is small
+    assert small.get_size() == (15, 15)
+
+    large = cache.image(path, (30, 30))
+    assert large is not small and large.get_size() == (30, 30)
+    assert len(cache.images) == 2
+
+def test_images_are_converted_once_a_display_exists(cache):
+    path = os.path.join(ROOT, resources.CROWN_IMAGE)
+    headless = cache.image(path, (20, 20))
+    cache.clear()
+
+    pygame.display.set_mode((40, 40))
+    converted = cache.image(path, (20, 20))
+    assert converted is not headless
+    assert converted.get_flags() & pygame.SRCALPHA
+
+def test_fonts_are_shared(cache):
+    font = cache.font(20)
+    assert cache.font(20) is font
+    assert cache.font(20, bold=True) is not font
+    assert len(cache.fonts) == 2
+
+def test_text_cache_evicts_least_recently_used(cache):
+    white = (255, 255, 255)
+    first = cache.text("first", 20, white)
+    cache.text("second", 20, white)
+    cache.text("third", 20, white)
+    # A hit keeps the surface and makes it the most recently used
+    assert cache.text("first", 20, white) is first
+
+    cache.text("fourth", 20, white)
+    assert len(cache.texts) == 3
+    assert [key[3] for key in cache.texts] == ["third", "first", "fourth"]
+    # Text differing only in colour is rendered separately
+    assert cache.text("first", 20, (0, 0, 0)) is not first
@@ -0,0 +1,143 @@
+import random
+import pytest
+from core.match import Match
+from core.state_delta import DeltaTracker, StateView, StateDeltaError, FULL_UPDATE, DELTA_UPDATE
+
+CONTROLLERS = ("controllers.player1_controller", "controllers.player2_controller")
+
+# Board keys a StateView keeps up to date from deltas
+MIRRORED_KEYS = ("rows", "cols", "phase", "sudden_death_food", "zobrist_hash")
+
+def view_matches_snapshot(view, state, player, opponent):
+    """
+    Asserts that the view's controller arguments equal the full snapshot of the state.
+    """
+    board_state, player_state, opponent_state = view.board_state, view.states[player.id], view.states[opponent.id]
+    expected = state.get_board_state()
+    for key in MIRRORED_KEYS:
+        assert board_state[key] == expected[key], key
+    assert sorted(board_state["food_locations"]) == sorted(expected["food_locations"])
+
+    for mirrored, snapshot in ((player_state, state.get_player_state(player)), (opponent_state, state.get_player_state(opponent))):
+        mirrored = dict(mirrored, body=list(mirrored["body"]))
+        assert mirrored == snapshot
+
+def play(seed, ticks, on_tick):
+    """
+    Plays a game between the bundled controllers, starting sudden death half way, and calls
+    `on_tick(state, tick)` after every tick the snakes moved.
+    """
+    match = Match(*CONTROLLERS, seed=seed)
+    while not match.state.game_over and match.tick < ticks:
+        if match.tick == ticks // 2:
+            match.state.start_sudden_death()
+        if match.step():
+            on_tick(match.state, match.tick)
+    return match.state
+
+@pytest.mark.parametrize("seed", range(3))
+def test_view_mirrors_full_snapshots(seed):
+    """
+    A view fed deltas, some of them covering several ticks, always equals the full snapshot.
+    """
+    rng = random.Random(seed)
+    trackers = {1: DeltaTracker(), 2: DeltaTracker()}
+    views = {1: StateView(), 2: StateView()}
+    kinds = []
+
+    def on_tick(state, tick):
+        for player, opponent in ((state.player1, state.player2), (state.player2, state.player1)):
+            # Leave out some updates, as for a controller that was busy
+            if rng.random() < 0.3:
+                continue
+            update = trackers[player.id].build(state, player, opponent, tick)
+            kinds.append(update["update"])
+            views[player.id].apply(update)
+            view_matches_snapshot(views[player.id], state, player, opponent)
+            assert views[player.id].board_state["delta"]["tick"] == tick
+
+    state = play(seed, 300, on_tick)
+    assert state.sudden_death_active or state.game_over
+    assert kinds.count(FULL_UPDATE) == 2
+    assert kinds.count(DELTA_UPDATE) > 100
+
+def test_delta_describes_changes():
+    match = Match(*CONTROLLERS, seed=4)
+    state = match.state
+    tracker, view = DeltaTracker(), StateView()
+    view.apply(tracker.build(state, state.player1, state.player2))
+    tail = state.player1.snake.body[-1]
+
+    match.step()
+    update = tracker.build(state, state.player1, state.player2, match.tick)
+    assert update["update"] == DELTA_UPDATE
+    board_state, _, _ = view.apply(update)
+    delta = board_state["delta"]
+    assert not delta["full"]
+    assert delta["added"][1] == [state.player1.snake.body[0]]
+    if len(state.player1.snake.body) == 1:
+        assert delta["removed"][1] == [tail]
+
+def test_resync_after_reset():
+    view = StateView()
+
+    def on_tick(state, tick):
+        tracker = state.delta_trackers.setdefault(state.player1.id, DeltaTracker())
+        if tick % 40 == 0:
+            state.resync_controller(state.player1)
+        update = tracker.build(state, state.player1, state.player2, tick)
+        assert (update["update"] == FULL_UPDATE) == (tick % 40 == 0 or tick == 1)
+        view.apply(update)
+        view_matches_snapshot(view, state, state.player1, state.player2)
+
+    play(5, 200, on_tick)
+
+def test_missed_update_is_detected_and_resynced():
+    """
+    A delta built but never applied leaves the view behind; the next one fails validation,
+    and after the engine resets the tracker a full update brings the view back in sync.
+    """
+    tracker, view = DeltaTracker(), StateView()
+    errors = []
+
+    def on_tick(state, tick):
+        update = tracker.build(state, state.player1, state.player2, tick)
+        if tick == 20:
+            return
+        try:
+            view.apply(update)
+        except StateDeltaError as e:
+            errors.append((tick, e))
+            assert view.board_state is None
+            tracker.reset()
+            return
+        view_matches_snapshot(view, state, state.player1, state.player2)
+
+    play(6, 60, on_tick)
+    assert [tick for tick, _ in errors] == [21]
+
+def test_delta_before_full_update_is_rejected():
+    match = Match(*CONTROLLERS, seed=7)
+    state = match.state
+    tracker = DeltaTracker()
+    tracker.build(state, state.player1, state.player2)
+    match.step()
+    with pytest.raises(StateDeltaError):
+        StateView().apply(tracker.build(state, state.player1, state.player2, match.tick))
+
+def test_malformed_update_is_rejected():
+    state = Match(*CONTROLLERS, seed=8).state
+    view = StateView()
+    update = DeltaTracker().build(state, state.player1, state.player2)
+    del update["player_state"]
+    with pytest.raises(StateDeltaError):
+        view.apply(update)
+    assert view.board_state is None
+
+def test_validate_detects_wrong_food_count():
+    state = Match(*CONTROLLERS, seed=9).state
+    view = StateView()
+    update = DeltaTracker().build(state, state.player1, state.player2)
+    update["check"]["food"] += 1
+    with pytest.raises(StateDeltaError, match="food"):
+        view.apply(update)
@@ -0,0 +1,196 @@
+import json
+import sys
+import time
+import pytest
+from config import config
+from core.match import Match
+from core.tournament import Tournament, discover_controllers, play_match, seeding_order
+
+CONTROLLERS = ("controllers.player1_controller", "controllers.player2_controller")
+
+BASE_CONTROLLER = """
+from controllers import player2_controller as base
+
+def set_player_name():
+    return "{name}"
+
+def get_next_move(board_state, player_state, opponent_state):
+    return base.get_next_move(board_state, player_state, opponent_state)
+"""
+
+HANGING_CONTROLLER = """
+import time
+
+def set_player_name():
+    return "Hang"
+
+def get_next_move(board_state, player_state, opponent_state):
+    while True:
+        time.sleep(1)
+"""
+
+SLOW_CONTROLLER = """
+import time
+from controllers import player2_controller as base
+
+def set_player_name():
+    return "Slow"
+
+def get_next_move(board_state, player_state, opponent_state):
+    time.sleep(0.02)
+    return base.get_next_move(board_state, player_state, opponent_state)
+"""
+
+class ScriptedPool:
+    """
+    Stands in for the process pool: answers each job from `outcome(controller1, controller2, attempt)`,
+    where `attempt` counts earlier matches between the same two controllers, and records the jobs.
+    """
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.jobs = []
+
+    def map(self, function, jobs):
+        results = []
+        for job in jobs:
+            match_id, stage, controller1, controller2, _, _ = job
+            attempt = sum(1 for other in self.jobs if {other[2], other[3]} == {controller1, controller2})
+            self.jobs.append(job)
+            results.append({"match_id": match_id, "stage": stage, "controller1": controller1, "controller2": controller2,
+                            "winner": self.outcome(controller1, controller2, attempt)})
+        return results
+
+def make_tournament(tmp_path, entrants, **kwargs):
+    t = Tournament(str(tmp_path), **kwargs)
+    t.entrants = list(entrants)
+    t.standings = {name: {"controller": name, "wins": 0, "draws": 0, "losses": 0, "food_for": 0, "food_against": 0} for name in entrants}
+    return t
+
+def write_controllers(directory, sources):
+    directory.mkdir()
+    for name, source in sources.items():
+        (directory / f"{name}.py").write_text(source)
+    return directory
+
+@pytest.mark.parametrize("size", [1, 2, 4, 8, 16, 32])
+def test_seeding_order_keeps_top_seeds_apart(size):
+    order = seeding_order(size)
+    assert sorted(order) == list(range(1, size + 1))
+    # First round pairs the strongest seed with the weakest, and the top n seeds each lead
+    # their own n-th of the bracket, so seeds 1 and 2 can only meet in the final
+    for i in range(0, size - 1, 2):
+        assert order[i] + order[i + 1] == size + 1
+    section = size
+    while section > 1:
+        for start in range(0, size, section):
+            top = [seed for seed in order[start:start + section] if seed <= size // section]
+            assert len(top) == 1
+        section //= 2
+
+def test_elimination_favours_the_higher_seed(tmp_path):
+    seeds = [f"bot{i}" for i in range(1, 6)]
+    # The lower-numbered bot wins every match it plays
+    pool = ScriptedPool(lambda a, b, attempt: 1 if a < b else 2)
+    t = make_tournament(tmp_path, seeds)
+    assert t.run_elimination(pool, seeds) == "bot1"
+    assert t.placements["bot1"] == "champion"
+    assert t.placements["bot2"] == "round 3"
+    # Seeds 1, 2 and 3 get byes into round 2 of an 8-player bracket
+    first_round = [job for job in pool.jobs if job[1] == "round 1"]
+    assert [{job[2], job[3]} for job in first_round] == [{"bot4", "bot5"}]
+
+def test_drawn_matches_are_replayed_with_sides_swapped(tmp_path):
+    seeds = ["bot1", "bot2"]
+    # Drawn until the third attempt, which bot2 wins
+    pool = ScriptedPool(lambda a, b, attempt: None if attempt < 2 else (1 if a == "bot2" else 2))
+    t = make_tournament(tmp_path, seeds, max_replays=2)
+    assert t.run_elimination(pool, seeds) == "bot2"
+    assert [(job[2], job[3]) for job in pool.jobs] == [("bot1", "bot2"), ("bot2", "bot1"), ("bot1", "bot2")]
+
+def test_higher_seed_advances_after_drawn_replays(tmp_path):
+    seeds = ["bot2", "bot1"]
+    pool = ScriptedPool(lambda a, b, attempt: None)
+    t = make_tournament(tmp_path, seeds, max_replays=1)
+    assert t.run_elimination(pool, seeds) == "bot2"
+    assert len(pool.jobs) == 2
+    assert t.placements["bot1"] == "round 1"
+
+def test_seeding_ranks_by_points_then_food(tmp_path):
+    seeds = ["a", "b", "c"]
+    t = make_tournament(tmp_path, seeds)
+    outcomes = {("a", "b"): None, ("a", "c"): 2, ("b", "c"): 1}
+    pool = ScriptedPool(lambda a, b, attempt: outcomes[(a, b)])
+    assert t.run_seeding(pool) == ["b", "c", "a"]
+    assert t.standings["a"]["draws"] == 1 and t.standings["a"]["losses"] == 1
+
+def test_discover_controllers_skips_broken_modules(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    directory = write_controllers(tmp_path / "discover_entrants", {
+        "good": BASE_CONTROLLER.format(name="Good"),
+        "broken": "raise RuntimeError('does not load')\n",
+        "helper": "def distance(a, b):\n    return 0\n",
+        "_private": BASE_CONTROLLER.format(name="Private"),
+    })
+    search_path, names = discover_controllers(str(directory))
+    assert search_path == str(tmp_path)
+    assert names == ["discover_entrants.good"]
+
+def test_match_plays_max_ticks():
+    match = Match(*CONTROLLERS, max_ticks=120, seed=3)
+    result = match.run()
+    assert result["ticks"] == 120
+    assert match.state.game_over
+
+def test_hung_controller_does_not_stall_the_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    directory = write_controllers(tmp_path / "hung_entrants", {
+        "good": BASE_CONTROLLER.format(name="Good"),
+        "hang": HANGING_CONTROLLER,
+    })
+    discover_controllers(str(directory))
+    start = time.perf_counter()
+    result = play_match((1, "test", "hung_entrants.hang", "hung_entrants.good", None, 5))
+    assert time.perf_counter() - start < 10
+    assert "error" not in result
+    assert result["winner"] == 2
+    # Every tick the hung controller is still busy costs it the whole deadline
+    assert result["controller_seconds"][0] >= result["ticks"] * config.CONTROLLER_TIMEOUT_SECONDS * 0.9
+
+def test_slower_controller_forfeits_at_time_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    directory = write_controllers(tmp_path / "slow_entrants", {
+        "good": BASE_CONTROLLER.format(name="Good"),
+        "slow": SLOW_CONTROLLER,
+    })
+    discover_controllers(str(directory))
+    match = Match("slow_entrants.good", "slow_entrants.slow", seed=2, isolated=True, time_limit=0.3)
+    try:
+        result = match.run()
+    finally:
+        match.close()
+    assert result["winner"] == 1
+    assert result["events"][-1] == "Slow forfeited the match."
+    assert result["controller_seconds"][1] > result["controller_seconds"][0]
+
+def test_tournament_writes_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    directory = write_controllers(tmp_path / "small_entrants", {
+        "first": BASE_CONTROLLER.format(name="First"),
+        "second": BASE_CONTROLLER.format(name="Second"),
+        "third": BASE_CONTROLLER.format(name="Third"),
+    })
+    t = Tournament(str(directory), workers=1, max_ticks=60, max_replays=0)
+    champion = t.run()
+    assert champion in t.entrants
+
+    output = tmp_path / "results"
+    t.write_results(str(output))
+    standings = json.loads((output / "standings.json").read_text())
+    assert sorted(entry["seed"] for entry in standings) == [1, 2, 3]
+    assert [entry["placement"] for entry in standings].count("champion") == 1
+    matches = json.loads((output / "matches.json").read_text())
+    # Three seeding matches, then one semi-final against the bye and the final
+    assert len(matches) == 5
+    assert all(match["ticks"] <= 60 for match in matches)
+    assert len(list((output / "replays").iterdir())) == len(matches)
+    assert (output / "replays.archive").exists()
@@ -0,0 +1,97 @@
+import random
+import pytest
+from core.match import Match
+from core.zobrist import ZobristKeys, TranspositionTable, keys_for, EXACT, LOWER_BOUND, UPPER_BOUND
+
+CONTROLLERS = ("controllers.player1_controller", "controllers.player2_controller")
+
+def full_hash(state):
+    """
+    Recomputes a position's Zobrist hash from scratch.
+    """
+    keys = keys_for(state.rows, state.cols)
+    position_hash = 0
+    for row, col in state.food_map:
+        position_hash ^= keys.food[row * state.cols + col]
+    for obstacle in state.obstacle_locations:
+        for row, col in obstacle.get_occupied_positions():
+            position_hash ^= keys.obstacle[row * state.cols + col]
+    for player in (state.player1, state.player2):
+        snake = player.snake
+        for row, col in snake.body:
+            if 0 <= row < state.rows and 0 <= col < state.cols:
+                position_hash ^= keys.body[player.id][row * state.cols + col]
+        position_hash ^= keys.snake_key(player.id, snake.body[0], snake.body[-1], snake.direction, player.score)
+    if state.sudden_death_active:
+        position_hash ^= keys.sudden_death
+    return position_hash
+
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_hash_matches_full_hash(seed):
+    """
+    Through eating, growing, sudden death and the final collision, the hash kept up to date
+    move by move equals one recomputed from the position.
+    """
+    rng = random.Random(seed)
+    match = Match(*CONTROLLERS, seed=seed)
+    sudden_death_tick = rng.randint(50, 250)
+    hashes = set()
+    while not match.state.game_over:
+        if match.tick == sudden_death_tick:
+            match.state.start_sudden_death()
+        # Now and then a random move, so games also end in walls and bodies
+        directions = [rng.choice(("left", "right", "up", "down")) if rng.random() < 0.02 else None for _ in range(2)]
+        match.step(*directions)
+        assert match.state.get_hash() == full_hash(match.state)
+        hashes.add(match.state.get_hash())
+    # Positions differ every tick, and so do their hashes
+    assert len(hashes) > match.tick * 0.9
+
+def test_keys_are_the_same_in_every_process():
+    first, second = ZobristKeys(5, 7), ZobristKeys(5, 7)
+    assert first.body == second.body and first.food == second.food and first.head == second.head
+    # A score's key does not depend on which scores were asked for before
+    first.score(1, 2)
+    assert first.score(1, 6) == second.score(1, 6)
+    assert first.score(2, 6) != first.score(1, 6)
+    assert keys_for(5, 7) is keys_for(5, 7)
+
+def test_off_board_heads_share_one_key():
+    keys = ZobristKeys(3, 4)
+    assert keys.cell_index(-1, 0) == keys.cell_index(3, 2) == 12
+    assert keys.cell_index(2, 3) == 11
+
+def test_store_and_lookup():
+    table = TranspositionTable(size_bits=4)
+    assert table.lookup(0x1234) is None
+    assert table.store(0x1234, 5, depth=3, flag=LOWER_BOUND, move="up")
+    assert table.lookup(0x1234) == (5, 3, LOWER_BOUND, "up")
+    # Same slot, different position
+    assert table.lookup(0x1234 + 16) is None
+    assert (table.stored, table.hits) == (1, 1)
+
+    table.clear()
+    assert table.lookup(0x1234) is None
+    assert table.stored == 0
+
+def test_replacement_rules():
+    table = TranspositionTable(size_bits=4)
+    position, other = 0x20, 0x30
+    assert table.store(position, 1, depth=5)
+
+    # The same position is always updated, even by a shallower search
+    assert table.store(position, 2, depth=1, flag=UPPER_BOUND)
+    assert table.lookup(position) == (2, 1, UPPER_BOUND, None)
+
+    # Another position in the slot needs at least the stored depth
+    assert table.store(position, 3, depth=4)
+    assert not table.store(other, 4, depth=3)
+    assert table.lookup(position) == (3, 4, EXACT, None)
+    assert table.store(other, 4, depth=4)
+    assert table.lookup(position) is None
+
+    # Entries from an earlier search give way to any new one
+    table.new_search()
+    assert table.store(position, 5, depth=0)
+    assert table.lookup(position) == (5, 0, EXACT, None)
+    assert table.stored == 1
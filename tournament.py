@@ -0,0 +1,33 @@
+# --- Python Standard Libraries ---
+import argparse
+
+# --- Project Modules ---
+from core.tournament import Tournament, DEFAULT_MAX_TICKS, DEFAULT_TIME_LIMIT
+
+
+def parse_args():
+    """
+    Parses the tournament command line options.
+    """
+    parser = argparse.ArgumentParser(description="Run a headless Battle of the Algorithms tournament.")
+    parser.add_argument("directory", help="Directory of controller modules, e.g. controllers")
+    parser.add_argument("--output", default="results", help="Directory for standings.json, matches.json and the replays")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: all cores)")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS, help="Tick limit per match")
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT, help="Seconds a match may take before the slower controller forfeits (0 for no limit)")
+    parser.add_argument("--max-replays", type=int, default=2, help="Replays of a drawn elimination match")
+    parser.add_argument("--no-seeding", action="store_true", help="Skip the round-robin stage and seed by file name")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    tournament = Tournament(args.directory, workers=args.workers, max_ticks=args.max_ticks, max_replays=args.max_replays, seeding=not args.no_seeding, time_limit=args.time_limit or None)
+
+    print(f"Entrants: {len(tournament.entrants)}")
+    if not tournament.entrants:
+        raise SystemExit(f"No controllers found in {args.directory}")
+    champion = tournament.run()
+    tournament.write_results(args.output)
+    print(f"Champion: {champion}")
+    print(f"Results written to {args.output}")